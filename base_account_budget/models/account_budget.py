@@ -112,21 +112,33 @@ class BudgetLines(models.Model):
                                  string='Company', store=True, readonly=True)
 
     def _compute_practical_amount(self):
+        # all analytic budget lines are computed with one grouped query
+        lines = self.filtered(lambda line: line.id and line.analytic_account_id)
+        amounts = {}
+        if lines:
+            date_to = self.env.context.get('wizard_date_to')
+            date_from = self.env.context.get('wizard_date_from')
+            self.env['account.analytic.line'].flush_model(['account_id', 'general_account_id', 'date', 'amount'])
+            self.env['account.budget.post'].flush_model(['account_ids'])
+            self.env.cr.execute("""
+                SELECT bl.line_id, SUM(aal.amount)
+                FROM unnest(%s::int[], %s::int[], %s::int[], %s::date[], %s::date[])
+                    AS bl(line_id, analytic_id, post_id, date_from, date_to)
+                    JOIN account_analytic_line aal
+                        ON aal.account_id = bl.analytic_id
+                        AND aal.date BETWEEN bl.date_from AND bl.date_to
+                    JOIN account_budget_rel r
+                        ON r.budget_id = bl.post_id
+                        AND r.account_id = aal.general_account_id
+                GROUP BY bl.line_id""",
+                                (lines.ids,
+                                 [line.analytic_account_id.id for line in lines],
+                                 [line.general_budget_id.id for line in lines],
+                                 [date_from or line.date_from for line in lines],
+                                 [date_to or line.date_to for line in lines],))
+            amounts = dict(self.env.cr.fetchall())
         for line in self:
-            result = 0.0
-            acc_ids = line.general_budget_id.account_ids.ids
-            date_to = self.env.context.get('wizard_date_to') or line.date_to
-            date_from = self.env.context.get('wizard_date_from') or line.date_from
-            if line.analytic_account_id.id:
-                self.env.cr.execute("""
-                    SELECT SUM(amount)
-                    FROM account_analytic_line
-                    WHERE account_id=%s
-                        AND date between %s AND %s
-                        AND general_account_id=ANY(%s)""",
-                                    (line.analytic_account_id.id, date_from, date_to, acc_ids,))
-                result = self.env.cr.fetchone()[0] or 0.0
-            line.practical_amount = result
+            line.practical_amount = amounts.get(line.id) or 0.0
 
     def _compute_theoretical_amount(self):
         today = fields.Datetime.now()
@@ -22,7 +22,7 @@
 
 {
     'name': 'Odoo 16 Full Accounting Kit',
-    'version': '16.0.2.0.0',
+    'version': '16.0.2.0.2',
     'category': 'Accounting',
     'live_test_url': 'https://www.youtube.com/watch?v=peAp2Tx_XIs',
     'summary': """ Asset and Budget Management,
@@ -59,6 +59,7 @@
         'data/followup_levels.xml',
         'data/multiple_invoice_data.xml',
         'data/recurring_entry_cron.xml',
+        'data/followup_cron.xml',
         'views/assets.xml',
         'views/dashboard_views.xml',
         'views/reports_config_view.xml',
@@ -21,6 +21,8 @@
 #############################################################################
 
 import calendar
+import logging
+import time
 from datetime import date, datetime
 
 from dateutil.relativedelta import relativedelta
@@ -29,7 +31,12 @@ from odoo import api, fields, models, _
 from odoo.addons.base.models.decimal_precision import dp
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT as DF
-from odoo.tools import float_compare, float_is_zero
+from odoo.tools import float_compare, float_is_zero, split_every
+
+_logger = logging.getLogger(__name__)
+
+# Number of depreciation moves created, posted and committed together in bulk mode
+DEPRECIATION_BATCH_SIZE = 500
 
 
 class AccountAssetCategory(models.Model):
@@ -246,13 +253,15 @@ class AccountAssetAsset(models.Model):
 
     # @api.model
     # def _cron_generate_entries(self):
-    #     self.compute_generated_entries(datetime.today())
+    #     self.compute_generated_entries(datetime.today(), bulk=True)
     @api.onchange('category_id')
     def gross_value(self):
         self.value=self.category_id.price
     @api.model
-    def compute_generated_entries(self, date, asset_type=None):
+    def compute_generated_entries(self, date, asset_type=None, bulk=False):
         # Entries generated : one by grouped category and one by asset from ungrouped category
+        # bulk=True creates, posts and commits the ungrouped entries in chunks
+        # (see create_move_bulk); an interrupted run resumes with the unlinked lines.
         created_move_ids = []
         type_domain = []
         if asset_type:
@@ -261,8 +270,11 @@ class AccountAssetAsset(models.Model):
         ungrouped_assets = self.env['account.asset.asset'].search(
             type_domain + [('state', '=', 'open'),
                            ('category_id.group_entries', '=', False)])
-        created_move_ids += ungrouped_assets._compute_entries(date,
-                                                              group_entries=False)
+        if bulk:
+            created_move_ids += ungrouped_assets._compute_entries_bulk(date)
+        else:
+            created_move_ids += ungrouped_assets._compute_entries(
+                date, group_entries=False)
 
         for grouped_category in self.env['account.asset.category'].search(
                 type_domain + [('group_entries', '=', True)]):
@@ -600,6 +612,13 @@ class AccountAssetAsset(models.Model):
             return depreciation_ids.create_grouped_move()
         return depreciation_ids.create_move()
 
+    def _compute_entries_bulk(self, date, batch_size=None):
+        depreciation_ids = self.env['account.asset.depreciation.line'].search([
+            ('asset_id', 'in', self.ids), ('depreciation_date', '<=', date),
+            ('move_check', '=', False)], order='asset_id, sequence')
+        return depreciation_ids.create_move_bulk(batch_size=batch_size,
+                                                 commit=True)
+
     @api.model
     def create(self, vals):
         asset = super(AccountAssetAsset,
@@ -664,64 +683,13 @@ class AccountAssetDepreciationLine(models.Model):
 
     def create_move(self, post_move=True):
         created_moves = self.env['account.move']
-        prec = self.env['decimal.precision'].precision_get('Account')
         if self.mapped('move_id'):
             raise UserError(_(
                 'This depreciation is already linked to a journal entry! Please post or delete it.'))
         for line in self:
-            category_id = line.asset_id.category_id
-            depreciation_date = self.env.context.get(
-                'depreciation_date') or line.depreciation_date or fields.Date.context_today(
-                self)
-            company_currency = line.asset_id.company_id.currency_id
-            current_currency = line.asset_id.currency_id
-            amount = current_currency.with_context(
-                date=depreciation_date).compute(line.amount, company_currency)
-            asset_name = line.asset_id.name + ' (%s/%s)' % (
-            line.sequence, len(line.asset_id.depreciation_line_ids))
-            partner = self.env['res.partner']._find_accounting_partner(
-                line.asset_id.partner_id)
-            move_line_1 = {
-                'name': asset_name,
-                'account_id': category_id.account_depreciation_id.id,
-                'debit': 0.0 if float_compare(amount, 0.0,
-                                              precision_digits=prec) > 0 else -amount,
-                'credit': amount if float_compare(amount, 0.0,
-                                                  precision_digits=prec) > 0 else 0.0,
-                'journal_id': category_id.journal_id.id,
-                'partner_id': partner.id,
-                # 'analytic_account_id': category_id.account_analytic_id.id if category_id.type == 'sale' else False,
-                'currency_id': company_currency != current_currency and current_currency.id or company_currency.id,
-                'amount_currency': company_currency != current_currency and - 1.0 * line.amount or 0.0,
-            }
-            move_line_2 = {
-                'name': asset_name,
-                'account_id': category_id.account_depreciation_expense_id.id,
-                'credit': 0.0 if float_compare(amount, 0.0,
-                                               precision_digits=prec) > 0 else -amount,
-                'debit': amount if float_compare(amount, 0.0,
-                                                 precision_digits=prec) > 0 else 0.0,
-                'journal_id': category_id.journal_id.id,
-                'partner_id': partner.id,
-                # 'analytic_account_id': category_id.account_analytic_id.id if category_id.type == 'purchase' else False,
-                'currency_id': company_currency != current_currency and current_currency.id or company_currency.id,
-                'amount_currency': company_currency != current_currency and line.amount or 0.0,
-            }
-            move_vals = {
-                'ref': line.asset_id.code,
-                'date': depreciation_date or False,
-                'journal_id': category_id.journal_id.id,
-                'line_ids': [(0, 0, move_line_1), (0, 0, move_line_2)],
-            }
+            move_vals = self._prepare_move(line)
             move = self.env['account.move'].create(move_vals)
-            for move_line in move.line_ids:
-                if move_line.account_id.id == move_line_1['account_id']:
-                    move_line.debit = move_line_1['debit']
-                    move_line.credit = move_line_1['credit']
-                elif move_line.account_id.id == move_line_2['account_id']:
-                    move_line.write({'debit': move_line_2['debit'], 'credit': move_line_2['credit']})
-            if move.line_ids.filtered(lambda x:x.name == 'Automatic Balancing Line'):
-                move.line_ids.filtered(lambda x:x.name == 'Automatic Balancing Line').unlink()
+            self._fix_move_amounts(move, move_vals)
             line.write({'move_id': move.id, 'move_check': True})
             created_moves |= move
 
@@ -731,6 +699,130 @@ class AccountAssetDepreciationLine(models.Model):
                     'asset_id.category_id.open_asset'))).post()
         return [x.id for x in created_moves]
 
+    def _prepare_move(self, line):
+        prec = self.env['decimal.precision'].precision_get('Account')
+        category_id = line.asset_id.category_id
+        depreciation_date = self.env.context.get(
+            'depreciation_date') or line.depreciation_date or fields.Date.context_today(
+            self)
+        company_currency = line.asset_id.company_id.currency_id
+        current_currency = line.asset_id.currency_id
+        amount = current_currency.with_context(
+            date=depreciation_date).compute(line.amount, company_currency)
+        asset_name = line.asset_id.name + ' (%s/%s)' % (
+        line.sequence, len(line.asset_id.depreciation_line_ids))
+        partner = self.env['res.partner']._find_accounting_partner(
+            line.asset_id.partner_id)
+        move_line_1 = {
+            'name': asset_name,
+            'account_id': category_id.account_depreciation_id.id,
+            'debit': 0.0 if float_compare(amount, 0.0,
+                                          precision_digits=prec) > 0 else -amount,
+            'credit': amount if float_compare(amount, 0.0,
+                                              precision_digits=prec) > 0 else 0.0,
+            'journal_id': category_id.journal_id.id,
+            'partner_id': partner.id,
+            # 'analytic_account_id': category_id.account_analytic_id.id if category_id.type == 'sale' else False,
+            'currency_id': company_currency != current_currency and current_currency.id or company_currency.id,
+            'amount_currency': company_currency != current_currency and - 1.0 * line.amount or 0.0,
+        }
+        move_line_2 = {
+            'name': asset_name,
+            'account_id': category_id.account_depreciation_expense_id.id,
+            'credit': 0.0 if float_compare(amount, 0.0,
+                                           precision_digits=prec) > 0 else -amount,
+            'debit': amount if float_compare(amount, 0.0,
+                                             precision_digits=prec) > 0 else 0.0,
+            'journal_id': category_id.journal_id.id,
+            'partner_id': partner.id,
+            # 'analytic_account_id': category_id.account_analytic_id.id if category_id.type == 'purchase' else False,
+            'currency_id': company_currency != current_currency and current_currency.id or company_currency.id,
+            'amount_currency': company_currency != current_currency and line.amount or 0.0,
+        }
+        move_vals = {
+            'ref': line.asset_id.code,
+            'date': depreciation_date or False,
+            'journal_id': category_id.journal_id.id,
+            'line_ids': [(0, 0, move_line_1), (0, 0, move_line_2)],
+        }
+        return move_vals
+
+    def _fix_move_amounts(self, move, move_vals):
+        """Restore the debit/credit of the depreciation lines and drop the
+        automatic balancing line added on create."""
+        move_line_1 = move_vals['line_ids'][0][2]
+        move_line_2 = move_vals['line_ids'][1][2]
+        for move_line in move.line_ids:
+            if move_line.account_id.id == move_line_1['account_id']:
+                move_line.debit = move_line_1['debit']
+                move_line.credit = move_line_1['credit']
+            elif move_line.account_id.id == move_line_2['account_id']:
+                move_line.write({'debit': move_line_2['debit'], 'credit': move_line_2['credit']})
+        if move.line_ids.filtered(lambda x:x.name == 'Automatic Balancing Line'):
+            move.line_ids.filtered(lambda x:x.name == 'Automatic Balancing Line').unlink()
+
+    @api.model
+    def _get_depreciation_batch_size(self):
+        batch_size = self.env['ir.config_parameter'].sudo().get_param(
+            'base_accounting_kit.depreciation_batch_size', DEPRECIATION_BATCH_SIZE)
+        try:
+            return max(int(batch_size), 1)
+        except (TypeError, ValueError):
+            return DEPRECIATION_BATCH_SIZE
+
+    def _create_move_batch(self, post_move=True):
+        """Create the moves of the depreciation lines in self with one
+        create() call, link them and post the auto-posted categories."""
+        lines = self.filtered(lambda l: not l.move_id)
+        if not lines:
+            return self.env['account.move']
+        vals_list = [self._prepare_move(line) for line in lines]
+        moves = self.env['account.move'].create(vals_list)
+        for line, move, move_vals in zip(lines, moves, vals_list):
+            self._fix_move_amounts(move, move_vals)
+            line.move_id = move
+        if post_move:
+            to_post = self.env['account.move'].concat(*(
+                move for line, move in zip(lines, moves)
+                if line.asset_id.category_id.open_asset))
+            to_post.post()
+        return moves
+
+    def create_move_bulk(self, post_move=True, batch_size=None, commit=False):
+        """Bulk version of create_move() for large month-end runs.
+
+        Lines are processed in chunks of batch_size (by default the
+        'base_accounting_kit.depreciation_batch_size' parameter): the move
+        values of a chunk are built in memory, created with one multi-create,
+        posted together and, with commit, committed before the next chunk.
+        Lines already linked to a move are skipped, so a run interrupted by
+        a crash resumes with the remaining lines.
+        """
+        batch_size = batch_size or self._get_depreciation_batch_size()
+        commit = commit and not self.env.registry.in_test_mode()
+        created_move_ids = []
+        start = time.time()
+        for line_ids in split_every(batch_size, self.ids):
+            chunk_start = time.time()
+            moves = self.browse(line_ids)._create_move_batch(post_move=post_move)
+            created_move_ids += moves.ids
+            if commit:
+                self.env.cr.commit()
+            # the committed records are no longer needed in the cache
+            self.env.invalidate_all()
+            elapsed = time.time() - chunk_start
+            _logger.info(
+                "Depreciation entries: %d moves in %.2fs (%.1f moves/s), %d/%d lines done",
+                len(moves), elapsed, len(moves) / elapsed if elapsed else 0.0,
+                len(created_move_ids), len(self))
+        elapsed = time.time() - start
+        if created_move_ids:
+            _logger.info(
+                "Depreciation entries done: %d moves in %.2fs (%.1f moves/s)",
+                len(created_move_ids), elapsed,
+                len(created_move_ids) / elapsed if elapsed else 0.0)
+        return created_move_ids
+
     def create_grouped_move(self, post_move=True):
         if not self.exists():
             return []
@@ -1,18 +1,277 @@
 # -*- coding: utf-8 -*-
 
 import calendar
+import copy
 import datetime
+import threading
+import time
 from datetime import datetime
 
 from dateutil.relativedelta import relativedelta
 
-from odoo import models, api
+from odoo import models, api, fields
 from odoo.http import request
+from odoo.tools import date_utils
+
+# Seconds a dashboard snapshot is served from memory. Posting a move drops the
+# snapshots of its company in this worker; other workers catch up after the TTL.
+DASHBOARD_CACHE_TTL = 60
+DASHBOARD_PERIODS = ('this_month', 'this_year', 'last_month', 'last_year')
+
+# {(dbname, company_ids, period, posted_only, today): (expires_at, snapshot)}
+_dashboard_cache = {}
+_dashboard_cache_lock = threading.Lock()
 
 
 class DashBoard(models.Model):
     _inherit = 'account.move'
 
+    # dashboard snapshot: every tile and chart of a period in three grouped queries
+
+    def _post(self, soft=True):
+        posted = super()._post(soft=soft)
+        posted._invalidate_dashboard_cache()
+        return posted
+
+    def button_draft(self):
+        res = super().button_draft()
+        self._invalidate_dashboard_cache()
+        return res
+
+    def _invalidate_dashboard_cache(self):
+        company_ids = set(self.company_id.ids)
+        if not company_ids:
+            return
+        dbname = self.env.cr.dbname
+
+        def invalidate():
+            with _dashboard_cache_lock:
+                for key in list(_dashboard_cache):
+                    if key[0] == dbname and company_ids.intersection(key[1]):
+                        del _dashboard_cache[key]
+
+        invalidate()
+        # a snapshot computed by a concurrent request before this commit is stale too
+        self.env.cr.postcommit.add(invalidate)
+
+    @api.model
+    def _get_dashboard_cache_ttl(self):
+        ttl = self.env['ir.config_parameter'].sudo().get_param(
+            'base_accounting_kit.dashboard_cache_ttl', DASHBOARD_CACHE_TTL)
+        try:
+            return max(int(ttl), 0)
+        except (TypeError, ValueError):
+            return DASHBOARD_CACHE_TTL
+
+    @api.model
+    def _get_dashboard_period(self, period):
+        today = fields.Date.context_today(self)
+        if period not in DASHBOARD_PERIODS:
+            period = 'this_month'
+        granularity = 'month' if period.endswith('month') else 'year'
+        if period.startswith('last'):
+            today -= relativedelta(**{granularity + 's': 1})
+        return date_utils.start_of(today, granularity), date_utils.end_of(today, granularity)
+
+    @api.model
+    def get_dashboard_snapshot(self, company_ids=None, period='this_month', *post):
+        """ All tiles and charts of the dashboard for a period, served from a short
+            lived per-company cache. ``post`` follows the other dashboard methods:
+            ('posted',) restricts the figures to posted entries. """
+        allowed_ids = self.env.user.company_ids.ids
+        if company_ids:
+            company_ids = [company_id for company_id in company_ids if company_id in allowed_ids]
+        elif request:
+            company_ids = [company_id for company_id in self.get_current_company_value() if company_id]
+        else:
+            company_ids = self.env.companies.ids
+        company_ids = tuple(sorted(company_ids or self.env.company.ids))
+        posted_only = post == ('posted',)
+        key = (self.env.cr.dbname, company_ids, period, posted_only, fields.Date.context_today(self))
+        now = time.monotonic()
+        with _dashboard_cache_lock:
+            cached = _dashboard_cache.get(key)
+        if cached and cached[0] > now:
+            return copy.deepcopy(cached[1])
+        snapshot = self._compute_dashboard_snapshot(company_ids, period, posted_only)
+        with _dashboard_cache_lock:
+            for stale_key in [k for k, v in _dashboard_cache.items() if v[0] <= now]:
+                del _dashboard_cache[stale_key]
+            _dashboard_cache[key] = (now + self._get_dashboard_cache_ttl(), snapshot)
+        return copy.deepcopy(snapshot)
+
+    @api.model
+    def _compute_dashboard_snapshot(self, company_ids, period, posted_only):
+        date_from, date_to = self._get_dashboard_period(period)
+        states = ('posted',) if posted_only else ('posted', 'draft')
+        snapshot = {
+            'company_ids': list(company_ids),
+            'period': period,
+            'date_from': fields.Date.to_string(date_from),
+            'date_to': fields.Date.to_string(date_to),
+            'currency': self._get_dashboard_currency(company_ids[0]),
+        }
+        self.env['account.move.line'].flush_model(
+            ['account_id', 'balance', 'company_id', 'date', 'full_reconcile_id', 'parent_state'])
+        self.env['account.move'].flush_model(
+            ['amount_residual_signed', 'amount_total', 'amount_total_signed', 'commercial_partner_id',
+             'company_id', 'date', 'invoice_date', 'invoice_date_due', 'move_type', 'payment_state', 'state'])
+        snapshot.update(self._dashboard_line_figures(company_ids, states, date_from, date_to, period))
+        snapshot.update(self._dashboard_invoice_figures(company_ids, states, date_from, date_to))
+        snapshot['banks'] = self._dashboard_bank_balances(company_ids, states)
+        return snapshot
+
+    @api.model
+    def _dashboard_line_figures(self, company_ids, states, date_from, date_to, period):
+        """ Income, expense, profit, unreconciled count and the income/expense chart of the
+            period: per day for a month, per month for a year. """
+        granularity = 'day' if period.endswith('month') else 'month'
+        self._cr.execute("""
+            SELECT account.internal_group,
+                   date_trunc(%s, line.date)::date AS bucket,
+                   COALESCE(SUM(line.balance), 0) AS balance,
+                   COUNT(*) FILTER (WHERE account.reconcile AND line.full_reconcile_id IS NULL
+                                    AND line.balance != 0) AS unreconciled
+              FROM account_move_line line
+              JOIN account_account account ON account.id = line.account_id
+             WHERE line.company_id IN %s
+               AND line.parent_state IN %s
+               AND line.date BETWEEN %s AND %s
+          GROUP BY account.internal_group, bucket
+        """, (granularity, company_ids, states, date_from, date_to))
+        if granularity == 'day':
+            buckets = [date_from + relativedelta(days=day) for day in range((date_to - date_from).days + 1)]
+            labels = [bucket.day for bucket in buckets]
+        else:
+            buckets = [date_from + relativedelta(months=month) for month in range(12)]
+            labels = [format(bucket, '%B') for bucket in buckets]
+        income = dict.fromkeys(buckets, 0.0)
+        expense = dict.fromkeys(buckets, 0.0)
+        unreconciled = 0
+        for internal_group, bucket, balance, count in self._cr.fetchall():
+            if internal_group == 'income':
+                income[bucket] -= balance
+            elif internal_group == 'expense':
+                expense[bucket] += balance
+            unreconciled += count
+        total_income = sum(income.values())
+        total_expense = sum(expense.values())
+        return {
+            'income': total_income,
+            'expense': total_expense,
+            'profit': total_income - total_expense,
+            'unreconciled_count': unreconciled,
+            'chart': {
+                'labels': labels,
+                'income': [income[bucket] for bucket in buckets],
+                'expense': [expense[bucket] for bucket in buckets],
+                'profit': [income[bucket] - expense[bucket] for bucket in buckets],
+            },
+        }
+
+    @api.model
+    def _dashboard_invoice_figures(self, company_ids, states, date_from, date_to):
+        """ Invoice and bill totals with their paid part (by accounting date), unpaid invoices
+            and bills due in the period and net sales per customer (by invoice date). """
+        self._cr.execute("""
+            SELECT move.move_type,
+                   partner.id AS partner_id,
+                   partner.name AS partner_name,
+                   COALESCE(SUM(move.amount_total_signed) FILTER (
+                       WHERE move.date BETWEEN %(date_from)s AND %(date_to)s), 0) AS total,
+                   COALESCE(SUM(move.amount_total_signed - move.amount_residual_signed) FILTER (
+                       WHERE move.date BETWEEN %(date_from)s AND %(date_to)s
+                         AND move.payment_state = 'paid'), 0) AS paid,
+                   COALESCE(SUM(move.amount_total) FILTER (
+                       WHERE move.payment_state = 'not_paid'
+                         AND move.invoice_date_due BETWEEN %(date_from)s AND %(date_to)s), 0) AS due,
+                   COALESCE(SUM(move.amount_total) FILTER (
+                       WHERE move.invoice_date BETWEEN %(date_from)s AND %(date_to)s), 0) AS invoiced
+              FROM account_move move
+         LEFT JOIN res_partner partner ON partner.id = move.commercial_partner_id
+             WHERE move.company_id IN %(company_ids)s
+               AND move.state IN %(states)s
+               AND move.move_type IN ('out_invoice', 'out_refund', 'in_invoice')
+               AND (move.date BETWEEN %(date_from)s AND %(date_to)s
+                    OR move.invoice_date_due BETWEEN %(date_from)s AND %(date_to)s
+                    OR move.invoice_date BETWEEN %(date_from)s AND %(date_to)s)
+          GROUP BY move.move_type, partner.id, partner.name
+        """, {'company_ids': company_ids, 'states': states, 'date_from': date_from, 'date_to': date_to})
+        invoices = {
+            'customer_invoice': 0.0,
+            'customer_invoice_paid': 0.0,
+            'supplier_invoice': 0.0,
+            'supplier_invoice_paid': 0.0,
+        }
+        overdues = {}
+        late_bills = {}
+        sales = {}
+        names = {}
+        for row in self._cr.dictfetchall():
+            partner_id = row['partner_id']
+            names[partner_id] = row['partner_name']
+            if row['move_type'] == 'out_invoice':
+                invoices['customer_invoice'] += row['total']
+                invoices['customer_invoice_paid'] += row['paid']
+                overdues[partner_id] = overdues.get(partner_id, 0.0) + row['due']
+                sales[partner_id] = sales.get(partner_id, 0.0) + row['invoiced']
+            elif row['move_type'] == 'out_refund':
+                sales[partner_id] = sales.get(partner_id, 0.0) - row['invoiced']
+            else:
+                # vendor bills are signed negatively
+                invoices['supplier_invoice'] -= row['total']
+                invoices['supplier_invoice_paid'] -= row['paid']
+                late_bills[partner_id] = late_bills.get(partner_id, 0.0) + row['due']
+        customers = sorted((partner_id for partner_id, amount in sales.items() if partner_id and amount),
+                           key=lambda partner_id: sales[partner_id], reverse=True)
+        return {
+            'invoices': invoices,
+            'overdues': self._dashboard_top_partners(overdues, names, 'due_partner', 'due_amount'),
+            'late_bills': self._dashboard_top_partners(late_bills, names, 'bill_partner', 'bill_amount'),
+            'top_customers': [{
+                'customers': names[partner_id],
+                'amount': sales[partner_id],
+                'parent': partner_id,
+            } for partner_id in customers[:10]],
+        }
+
+    @api.model
+    def _dashboard_top_partners(self, amounts, names, partner_label, amount_label):
+        """ Nine largest partner amounts plus an "Others" total, as the doughnut charts expect. """
+        partner_ids = sorted((partner_id for partner_id, amount in amounts.items() if partner_id and amount),
+                             key=lambda partner_id: amounts[partner_id], reverse=True)
+        others = sum(amounts[partner_id] for partner_id in partner_ids[9:])
+        return {
+            partner_label: [names[partner_id] for partner_id in partner_ids[:9]] + ["Others"],
+            amount_label: [amounts[partner_id] for partner_id in partner_ids[:9]] + [others],
+        }
+
+    @api.model
+    def _dashboard_bank_balances(self, company_ids, states):
+        """ Current balance of every cash and bank account, all dates included. """
+        self._cr.execute("""
+            SELECT account.name, COALESCE(SUM(line.balance), 0), MIN(account.id)
+              FROM account_move_line line
+              JOIN account_account account ON account.id = line.account_id
+             WHERE account.account_type = 'asset_cash'
+               AND line.company_id IN %s
+               AND line.parent_state IN %s
+          GROUP BY account.name
+        """, (company_ids, states))
+        banks = self._cr.fetchall()
+        return {
+            'banks': [name for name, balance, account_id in banks],
+            'banking': [balance for name, balance, account_id in banks],
+            'bank_ids': [account_id for name, balance, account_id in banks],
+        }
+
+    @api.model
+    def _get_dashboard_currency(self, company_id):
+        company = self.env['res.company'].browse(company_id)
+        currency = company.currency_id or self.env.ref('base.main_company').currency_id
+        lang = (self.env.user.lang or 'en_US').replace("_", '-')
+        return {'position': currency.position, 'symbol': currency.symbol, 'language': lang}
+
     # function to getting expenses
 
     # function to getting income of this year
@@ -20,9 +20,15 @@
 #
 #############################################################################
 
-from datetime import date, timedelta
+import logging
+from datetime import timedelta
 
-from odoo import fields, models
+from odoo import api, fields, models
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+FOLLOWUP_BATCH_SIZE = 1000
 
 
 class ResPartner(models.Model):
@@ -34,44 +40,50 @@ class ResPartner(models.Model):
                                    domain=(
                                    [('payment_state', '=', 'not_paid'),
                                     ('move_type', '=', 'out_invoice')]))
-    total_due = fields.Monetary(compute='_compute_for_followup', store=False,
+    total_due = fields.Monetary(compute='_compute_for_followup', store=True,
                                 readonly=True)
     next_reminder_date = fields.Date(compute='_compute_for_followup',
-                                     store=False, readonly=True)
+                                     store=True, readonly=True, index=True)
     total_overdue = fields.Monetary(compute='_compute_for_followup',
-                                    store=False, readonly=True)
+                                    store=True, readonly=True, index=True)
     followup_status = fields.Selection(
         [('in_need_of_action', 'In need of action'),
          ('with_overdue_invoices', 'With overdue invoices'),
          ('no_action_needed', 'No action needed')],
-        string='Followup status',
+        string='Followup status', compute='_compute_for_followup',
+        store=True, readonly=True, index=True,
         )
 
+    @api.depends('invoice_list.state', 'invoice_list.payment_state',
+                 'invoice_list.company_id', 'invoice_list.amount_residual',
+                 'invoice_list.invoice_date_due', 'invoice_list.date')
     def _compute_for_followup(self):
         """
         Compute the fields 'total_due', 'total_overdue' , 'next_reminder_date' and 'followup_status'
+        for all the partners of self with one grouped query over their open invoices.
+        The stored values must not depend on the user triggering the recompute: amounts
+        are summed over the open invoices of all companies (as listed in invoice_list)
+        and the reminder date is the earliest one of these companies.
+        Overdue amounts depend on the date: _cron_compute_followup refreshes them every night.
         """
+        today = fields.Date.today()
+        invoices = self._get_followup_invoice_data(today)
+        delays = self._get_followup_delays()
         for record in self:
-            total_due = 0
-            total_overdue = 0
-            today = fields.Date.today()
-            for am in record.invoice_list:
-                if am.company_id == self.env.company:
-                    amount = am.amount_residual
-                    total_due += amount
-
-                    is_overdue = today > am.invoice_date_due if am.invoice_date_due else today > am.date
-                    if is_overdue:
-                        total_overdue += amount or 0
-            min_date = record.get_min_date()
-            action = record.action_after()
-            if min_date:
-                date_reminder = min_date + timedelta(days=action)
-                if date_reminder:
-                    record.next_reminder_date = date_reminder
+            total_due = total_overdue = 0.0
+            due_dates = {}
+            for company_id, amount, overdue, date_due in invoices.get(record.id, []):
+                total_due += amount
+                total_overdue += overdue
+                dates = due_dates.setdefault(company_id, [])
+                if date_due:
+                    dates.append(date_due)
+            if total_due or total_overdue:
+                date_reminder = min(
+                    min(dates, default=today) + timedelta(days=delays.get(company_id, 0))
+                    for company_id, dates in due_dates.items())
             else:
-                date_reminder = today
-                record.next_reminder_date = date_reminder
+                date_reminder = False
             if total_overdue > 0 and date_reminder > today:
                 followup_status = "with_overdue_invoices"
             elif total_due > 0 and date_reminder <= today:
@@ -80,34 +92,72 @@ class ResPartner(models.Model):
                 followup_status = "no_action_needed"
             record.total_due = total_due
             record.total_overdue = total_overdue
+            record.next_reminder_date = date_reminder
             record.followup_status = followup_status
 
-    def get_min_date(self):
-        today = date.today()
-        for this in self:
-            if this.invoice_list:
-                min_list = this.invoice_list.mapped('invoice_date_due')
-                while False in min_list:
-                    min_list.remove(False)
-                return min(min_list)
-            else:
-                return today
-
-    def get_delay(self):
-        delay = """select id,delay from followup_line where followup_id =
-        (select id from account_followup where company_id = %s)
-         order by delay limit 1"""
-        self._cr.execute(delay, [self.env.company.id])
-        record = self._cr.dictfetchall()
-
-        return record
-
+    def _get_followup_invoice_data(self, today):
+        """ {partner_id: [(company_id, residual, overdue residual, due date)]} of the open
+            posted customer invoices of the partners, per company and due date. """
+        result = {}
+        partner_ids = [partner_id for partner_id in self.ids if partner_id]
+        if not partner_ids:
+            return result
+        self.env['account.move'].flush_model([
+            'partner_id', 'company_id', 'move_type', 'state', 'payment_state',
+            'amount_residual', 'invoice_date_due', 'date'])
+        self._cr.execute("""
+            SELECT partner_id, company_id, invoice_date_due,
+                   SUM(amount_residual),
+                   COALESCE(SUM(amount_residual) FILTER (
+                       WHERE COALESCE(invoice_date_due, date) < %s), 0)
+              FROM account_move
+             WHERE partner_id IN %s
+               AND move_type = 'out_invoice'
+               AND state = 'posted'
+               AND payment_state = 'not_paid'
+          GROUP BY partner_id, company_id, invoice_date_due
+        """, [today, tuple(partner_ids)])
+        for partner_id, company_id, date_due, amount, overdue in self._cr.fetchall():
+            result.setdefault(partner_id, []).append((company_id, amount, overdue, date_due))
+        return result
 
-    def action_after(self):
-        lines = self.env['followup.line'].search([(
-            'followup_id.company_id', '=', self.env.company.id)])
+    @api.model
+    def _get_followup_delays(self):
+        """ Delay of the first follow-up level of every company. """
+        self.env['followup.line'].flush_model(['followup_id', 'delay'])
+        self.env['account.followup'].flush_model(['company_id'])
+        self._cr.execute("""
+            SELECT followup.company_id, MIN(line.delay)
+              FROM followup_line line
+              JOIN account_followup followup ON followup.id = line.followup_id
+          GROUP BY followup.company_id
+        """)
+        return dict(self._cr.fetchall())
 
-        if lines:
-            record = self.get_delay()
-            for i in record:
-                return i['delay']
+    @api.model
+    def _cron_compute_followup(self, batch_size=FOLLOWUP_BATCH_SIZE):
+        """ Nightly sweep: invoices become overdue and reminders fall due without any
+            write on the moves, so recompute every partner having open invoices or
+            stored follow-up amounts, batch by batch. """
+        self._cr.execute("""
+            SELECT DISTINCT partner_id FROM account_move
+             WHERE move_type = 'out_invoice' AND state = 'posted'
+               AND payment_state = 'not_paid' AND partner_id IS NOT NULL
+             UNION
+            SELECT id FROM res_partner
+             WHERE total_due != 0 OR total_overdue != 0
+                OR followup_status != 'no_action_needed'
+        """)
+        partner_ids = sorted(row[0] for row in self._cr.fetchall())
+        fields_to_compute = [self._fields[name] for name in (
+            'total_due', 'total_overdue', 'next_reminder_date', 'followup_status')]
+        for ids in split_every(batch_size, partner_ids):
+            partners = self.browse(ids)
+            for field in fields_to_compute:
+                self.env.add_to_compute(field, partners)
+            partners.flush_recordset(['total_due', 'total_overdue',
+                                      'next_reminder_date', 'followup_status'])
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()
+            self.env.invalidate_all()
+        _logger.info("Follow-up metrics recomputed for %s partners", len(partner_ids))
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import test_partner_followup
+from . import test_account_dashboard
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.base_accounting_kit.models.account_dashboard import _dashboard_cache
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestAccountDashboard(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.company = cls.company_data['company']
+        journal = cls.company_data['default_journal_misc']
+        receivable = cls.company_data['default_account_receivable']
+        today = fields.Date.context_today(cls.env['account.move'])
+        revenue = cls.company_data['default_account_revenue']
+        expense = cls.company_data['default_account_expense']
+        cls.income_move, cls.expense_move = cls.env['account.move'].create([{
+            'move_type': 'entry',
+            'date': today,
+            'journal_id': journal.id,
+            'line_ids': [
+                (0, 0, {'account_id': debit_account.id, 'partner_id': cls.partner_a.id,
+                        'debit': amount, 'credit': 0.0}),
+                (0, 0, {'account_id': credit_account.id, 'partner_id': cls.partner_a.id,
+                        'debit': 0.0, 'credit': amount}),
+            ],
+        } for debit_account, credit_account, amount in ((receivable, revenue, 300.0),
+                                                        (expense, receivable, 120.0))])
+        cls.income_move.action_post()
+        cls.invoices = cls.env['account.move']
+        for move_type, partner, amount in (('out_invoice', cls.partner_a, 500.0),
+                                           ('out_invoice', cls.partner_b, 200.0),
+                                           ('in_invoice', cls.partner_b, 80.0)):
+            cls.invoices += cls.init_invoice(move_type, partner=partner, invoice_date=today,
+                                             amounts=[amount], taxes=[], post=True)
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(
+            type(self.env['account.move']), 'get_current_company_value',
+            lambda _self: [self.company.id, 0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # snapshots are kept across transactions: start from an empty cache
+        _dashboard_cache.clear()
+
+    def _legacy(self, suffix, post):
+        AccountMove = self.env['account.move']
+        income = getattr(AccountMove, 'month_income_' + suffix)(*post)[0]
+        expense = getattr(AccountMove, 'month_expense_' + suffix)(*post)[0]
+        profits = getattr(AccountMove, 'profit_income_' + suffix)(*post)
+        unreconciled = getattr(AccountMove, 'unreconcile_items_' + suffix)(*post)[0]['count']
+        return {
+            'income': -((income['debit'] or 0.0) - (income['credit'] or 0.0)),
+            'expense': (expense['debit'] or 0.0) - (expense['credit'] or 0.0),
+            'profit': -sum(profit or 0.0 for profit in profits),
+            'unreconciled_count': unreconciled,
+        }
+
+    def test_snapshot_matches_legacy_tiles(self):
+        AccountMove = self.env['account.move']
+        for post in ((), ('posted',)):
+            for suffix in ('this_month', 'this_year'):
+                snapshot = AccountMove.get_dashboard_snapshot([self.company.id], suffix, *post)
+                legacy = self._legacy(suffix, post)
+                for key, value in legacy.items():
+                    self.assertAlmostEqual(snapshot[key], value, msg="%s %s %s" % (suffix, post, key))
+
+    def test_snapshot_cache_invalidated_on_post(self):
+        AccountMove = self.env['account.move']
+        before = AccountMove.get_dashboard_snapshot([self.company.id], 'this_month', 'posted')
+        self.expense_move.action_post()
+        after = AccountMove.get_dashboard_snapshot([self.company.id], 'this_month', 'posted')
+        self.assertAlmostEqual(after['expense'], before['expense'] + 120.0)
+
+    def test_cache_ttl_tolerates_invalid_parameter(self):
+        self.env['ir.config_parameter'].sudo().set_param('base_accounting_kit.dashboard_cache_ttl', 'abc')
+        self.assertEqual(self.env['account.move']._get_dashboard_cache_ttl(), 60)
+
+    def test_snapshot_matches_legacy_widgets(self):
+        AccountMove = self.env['account.move']
+        for posted in (False, 'posted'):
+            for period, current in (('this_month', 'current_month'), ('this_year', 'current_year')):
+                msg = "%s %s" % (period, posted)
+                snapshot = AccountMove.get_dashboard_snapshot([self.company.id], period, posted)
+                totals = getattr(AccountMove, 'get_total_invoice_' + current)(posted)
+                self.assertAlmostEqual(snapshot['invoices']['customer_invoice'], totals[0][0] or 0.0, msg=msg)
+                self.assertAlmostEqual(snapshot['invoices']['supplier_invoice'], totals[2][0] or 0.0, msg=msg)
+                self.assertAlmostEqual(snapshot['invoices']['customer_invoice_paid'], totals[4][0] or 0.0, msg=msg)
+                self.assertAlmostEqual(snapshot['invoices']['supplier_invoice_paid'], totals[5][0] or 0.0, msg=msg)
+                overdues = AccountMove.get_overdues_this_month_and_year(posted, period)
+                self.assertEqual(snapshot['overdues']['due_partner'], overdues['due_partner'], msg)
+                self.assertEqual(snapshot['overdues']['due_amount'], overdues['due_amount'], msg)
+                late_bills = AccountMove.get_latebillss(posted, period)
+                self.assertEqual(snapshot['late_bills']['bill_partner'], late_bills['bill_partner'], msg)
+                self.assertEqual(snapshot['late_bills']['bill_amount'], late_bills['bill_amount'], msg)
+            snapshot = AccountMove.get_dashboard_snapshot([self.company.id], 'this_month', posted)
+            self.assertEqual(snapshot['top_customers'], AccountMove.get_top_10_customers_month(posted, 'this_month'))
+            chart = AccountMove.get_income_this_month(posted)
+            self.assertEqual(snapshot['chart']['labels'], chart['date'])
+            for key in ('income', 'expense', 'profit'):
+                for value, legacy in zip(snapshot['chart'][key], chart[key]):
+                    self.assertAlmostEqual(value, legacy, msg="chart %s %s" % (posted, key))
+        # the legacy bank_balance filters on posted entries unless 'posted' is passed
+        snapshot = AccountMove.get_dashboard_snapshot([self.company.id], 'this_month', 'posted')
+        self.assertEqual(snapshot['banks'], AccountMove.bank_balance(False))
+
+    def test_snapshot_top_customers_net_of_refunds(self):
+        AccountMove = self.env['account.move']
+        today = fields.Date.context_today(AccountMove)
+        self.init_invoice('out_refund', partner=self.partner_a, invoice_date=today,
+                          amounts=[450.0], taxes=[], post=True)
+        snapshot = AccountMove.get_dashboard_snapshot([self.company.id], 'this_month', 'posted')
+        self.assertEqual([(customer['parent'], customer['amount']) for customer in snapshot['top_customers']],
+                         [(self.partner_b.id, 200.0), (self.partner_a.id, 50.0)])
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from datetime import date, timedelta
+
+from freezegun import freeze_time
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPartnerFollowup(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.company_1 = cls.company_data['company']
+        cls.company_2 = cls.company_data_2['company']
+        cls.partner = cls.env['res.partner'].create({'name': 'Follow-up Partner'})
+
+    def _create_invoice(self, company, invoice_date, amount):
+        invoice = self.env['account.move'].with_company(company).create({
+            'move_type': 'out_invoice',
+            'partner_id': self.partner.id,
+            'invoice_date': invoice_date,
+            'invoice_line_ids': [(0, 0, {
+                'name': 'Follow-up line',
+                'quantity': 1,
+                'price_unit': amount,
+                'tax_ids': [],
+            })],
+        })
+        invoice.action_post()
+        return invoice
+
+    def _reminder_date(self, company, date_due):
+        delays = self.env['res.partner']._get_followup_delays()
+        return date_due + timedelta(days=delays.get(company.id, 0))
+
+    def _metrics(self, company):
+        partner = self.partner.with_company(company)
+        partner.invalidate_recordset()
+        return (partner.total_due, partner.total_overdue,
+                partner.next_reminder_date, partner.followup_status)
+
+    @freeze_time('2024-06-15')
+    def test_metrics_independent_of_current_company(self):
+        invoice_1 = self._create_invoice(self.company_1, date(2024, 5, 1), 100.0)
+        self._create_invoice(self.company_2, date(2024, 7, 1), 40.0)
+
+        metrics = self._metrics(self.company_1)
+        self.assertEqual(metrics, self._metrics(self.company_2))
+        self.assertAlmostEqual(metrics[0], 140.0)
+        self.assertAlmostEqual(metrics[1], 100.0)
+        self.assertEqual(metrics[2], self._reminder_date(self.company_1, date(2024, 5, 1)))
+        self.assertEqual(metrics[3], 'in_need_of_action')
+
+        # Triggered by the invoice state, whatever the company of the user
+        invoice_1.with_company(self.company_2).button_draft()
+        self.assertEqual(self._metrics(self.company_1)[:2], (40.0, 0.0))
+        self.assertEqual(self._metrics(self.company_1)[3], 'no_action_needed')
+
+    def test_cron_refreshes_overdue_amounts(self):
+        with freeze_time('2024-06-15'):
+            self._create_invoice(self.company_2, date(2024, 7, 1), 40.0)
+            self.assertAlmostEqual(self._metrics(self.company_1)[1], 0.0)
+        with freeze_time('2024-07-10'):
+            self.env['res.partner'].with_company(self.company_1)._cron_compute_followup()
+            total_due, total_overdue, date_reminder, status = self._metrics(self.company_1)
+        self.assertAlmostEqual(total_due, 40.0)
+        self.assertAlmostEqual(total_overdue, 40.0)
+        self.assertEqual(date_reminder, self._reminder_date(self.company_2, date(2024, 7, 1)))
+        self.assertEqual(status, 'in_need_of_action')
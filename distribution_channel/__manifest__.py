@@ -1,6 +1,6 @@
 {
     'name': 'Distribution Channel',
-    'version': '16.0.1.1.12',
+    'version': '16.0.1.1.13',
     'category': 'Inventory',
     'summary': 'Multi-company distribution channel management',
     'description': """
@@ -4,6 +4,9 @@ import logging
 
 _logger = logging.getLogger(__name__)  # add logger
 
+# Jumlah PO per batch (create + confirm + commit) pada cron DC SO
+DC_SO_BATCH_SIZE = 50
+
 
 class PurchaseOrder(models.Model):
     _inherit = 'purchase.order'
@@ -40,6 +43,14 @@ class PurchaseOrder(models.Model):
         string='Monitor',
         readonly=True
     )
+
+    dc_so_evaluated_date = fields.Datetime(
+        string='DC SO Evaluated On',
+        readonly=True,
+        copy=False,
+        index=True,
+        help='Last time the DC SO cron found no suitable orderpoint for this PO'
+    )
     
     @api.model
     def create(self, vals):
@@ -73,113 +84,198 @@ class PurchaseOrder(models.Model):
         }
     
     @api.model
-    def _cron_create_dc_sales_orders(self):
-        """Cron: Auto-create DC SO from PO - DIRECT APPROACH"""
-        self = self.sudo().with_context(active_test=False)
-        
-        # Cari PO yang:
-        # 1. Belum punya DC SO
-        # 2. State = purchase (confirmed)
-        # 3. Ada product yang punya reordering rule dengan DC
-        pos = self.search([
+    def _get_dc_so_batch_size(self):
+        batch_size = self.env['ir.config_parameter'].sudo().get_param(
+            'distribution_channel.dc_so_batch_size')
+        try:
+            return max(int(batch_size), 1) if batch_size else DC_SO_BATCH_SIZE
+        except ValueError:
+            return DC_SO_BATCH_SIZE
+
+    @api.model
+    def _get_dc_orderpoint_high_water_mark(self):
+        """Waktu perubahan terakhir orderpoint DC; PO yang dievaluasi sebelum ini dicek ulang"""
+        self.env['stock.warehouse.orderpoint'].flush_model(['write_date'])
+        self.env.cr.execute("""
+            SELECT MAX(write_date) FROM stock_warehouse_orderpoint
+             WHERE auto_create_dc_so = TRUE
+        """)
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_dc_so_candidates(self):
+        """PO confirmed tanpa DC SO yang belum dievaluasi sejak orderpoint DC terakhir berubah"""
+        domain = [
             ('dc_sales_order_id', '=', False),
             ('state', '=', 'purchase'),  # hanya confirmed PO
+        ]
+        high_water_mark = self._get_dc_orderpoint_high_water_mark()
+        if not high_water_mark:
+            # belum ada orderpoint DC sama sekali
+            return self.browse()
+        domain += ['|', ('dc_so_evaluated_date', '=', False),
+                   ('dc_so_evaluated_date', '<', high_water_mark)]
+        return self.search(domain, order='id')
+
+    @api.model
+    def _prefetch_dc_orderpoints(self, pos):
+        """
+        Satu search orderpoint untuk semua PO kandidat.
+        Return: {po_id: orderpoint} dengan orderpoint pertama (urutan _order)
+        yang cocok dengan product & warehouse PO, sama seperti search limit=1.
+        """
+        warehouses = pos.picking_type_id.warehouse_id
+        products = pos.order_line.product_id
+        if not warehouses or not products:
+            return {}
+        orderpoints = self.env['stock.warehouse.orderpoint'].sudo().search([
+            ('product_id', 'in', products.ids),
+            ('warehouse_id', 'in', warehouses.ids),
+            ('auto_create_dc_so', '=', True),
+            ('dc_company_id', '!=', False),
+            ('dc_warehouse_id', '!=', False),
         ])
-        
-        _logger.info("CRON: Scanning %d PO for DC SO creation", len(pos))
-        
-        ok = fail = 0
+        orderpoints_by_warehouse = {}
+        for orderpoint in orderpoints:
+            orderpoints_by_warehouse.setdefault(orderpoint.warehouse_id.id, []).append(orderpoint)
+
+        result = {}
         for po in pos:
-            # Cari orderpoint dari product di PO
-            products = po.order_line.product_id
-            warehouse = po.picking_type_id.warehouse_id if po.picking_type_id else None
-            
+            warehouse = po.picking_type_id.warehouse_id
             if not warehouse:
-                _logger.warning("PO %s: no warehouse found", po.name)
-                continue
-            
-            # Cari orderpoint punya DC config
-            orderpoint = self.env['stock.warehouse.orderpoint'].sudo().search([
-                ('product_id', 'in', products.ids),
-                ('warehouse_id', '=', warehouse.id),
-                ('auto_create_dc_so', '=', True),
-                ('dc_company_id', '!=', False),
-                ('dc_warehouse_id', '!=', False),
-            ], limit=1)
-            
-            if not orderpoint:
-                _logger.info("Skip PO %s: no suitable orderpoint found", po.name)
                 continue
-            
-            try:
-                so = po._create_dc_so_from_po(po, orderpoint)
-                if so:
-                    po.write({
-                        'dc_sales_order_id': so.id,
-                        'dc_company_id': orderpoint.dc_company_id.id,
-                        'orderpoint_id': orderpoint.id,  # set sekarang
-                    })
-                    _logger.info("✓ Created DC SO %s for PO %s", so.name, po.name)
-                    ok += 1
-            except Exception as e:
-                fail += 1
-                _logger.exception("✗ Failed PO %s: %s", po.name, str(e))
-        
-        _logger.info("CRON DONE: %d success, %d failed", ok, fail)
-    
+            product_ids = set(po.order_line.product_id.ids)
+            for orderpoint in orderpoints_by_warehouse.get(warehouse.id, []):
+                if orderpoint.product_id.id in product_ids:
+                    result[po.id] = orderpoint
+                    break
+        return result
+
     @api.model
-    def _create_dc_so_from_po(self, po, orderpoint):
-        """Helper: Create SO in DC company"""
-        dc_company = orderpoint.dc_company_id
+    def _prepare_dc_so_vals(self, po, orderpoint):
+        """Vals SO DC (termasuk order_line) dari satu PO, atau False jika tidak bisa dibuat"""
         retailer_partner = po.company_id.partner_id
-        
         if not retailer_partner:
             _logger.warning("PO %s: retailer partner not found", po.name)
             return False
-        
-        SO = self.env['sale.order'].sudo().with_company(dc_company.id)
-        
-        so_vals = {
+        return {
             'partner_id': retailer_partner.id,
-            'company_id': dc_company.id,
+            'company_id': orderpoint.dc_company_id.id,
             'warehouse_id': orderpoint.dc_warehouse_id.id if orderpoint.dc_warehouse_id else False,
             'origin': f"Auto from {po.name}",
             'client_order_ref': po.name,
-        }
-        
-        so = SO.create(so_vals)
-        
-        # Copy lines
-        for po_line in po.order_line:
-            if not po_line.product_id:
-                continue
-            
-            self.env['sale.order.line'].sudo().with_company(dc_company.id).create({
-                'order_id': so.id,
+            'order_line': [(0, 0, {
                 'product_id': po_line.product_id.id,
                 'product_uom_qty': po_line.product_qty,
                 'product_uom': po_line.product_uom.id,
                 'price_unit': po_line.price_unit or 0,
-            })
-        
-        # Auto-confirm DC SO
-        so.action_confirm()
-        _logger.info("DC SO %s auto-confirmed", so.name)
-        
-        # AUTO: Create monitor
-        monitor = self.env['dc.order.monitor'].sudo().create({
-            'retailer_company_id': po.company_id.id,
-            'dc_company_id': dc_company.id,
-            'retailer_po_id': po.id,
-            'dc_sales_order_id': so.id,
-            'orderpoint_id': orderpoint.id,
-            'state': 'dc_so_created',
-            'notes': f"Auto-created from PO {po.name}",
-        })
-        
-        _logger.info("✓ Monitor %s created for SO %s", monitor.name, so.name)
-        
-        return so
+            }) for po_line in po.order_line if po_line.product_id],
+        }
+
+    @api.model
+    def _create_dc_sales_orders_batch(self, pos, orderpoints):
+        """
+        Buat, confirm dan monitor SO DC untuk satu batch PO.
+        SO dibuat per DC company dengan create(vals_list) lalu di-confirm sekaligus.
+        Return: jumlah SO yang dibuat
+        """
+        pos_by_company = {}
+        for po in pos:
+            orderpoint = orderpoints[po.id]
+            pos_by_company.setdefault(orderpoint.dc_company_id, []).append(po)
+
+        created = 0
+        for dc_company, company_pos in pos_by_company.items():
+            todo = []
+            for po in company_pos:
+                vals = self._prepare_dc_so_vals(po, orderpoints[po.id])
+                if vals:
+                    todo.append((po, vals))
+            if not todo:
+                continue
+
+            SO = self.env['sale.order'].sudo().with_company(dc_company.id)
+            sales_orders = SO.create([vals for __, vals in todo])
+            # Auto-confirm DC SO
+            sales_orders.action_confirm()
+
+            # AUTO: Create monitor
+            self.env['dc.order.monitor'].sudo().create([{
+                'retailer_company_id': po.company_id.id,
+                'dc_company_id': dc_company.id,
+                'retailer_po_id': po.id,
+                'dc_sales_order_id': so.id,
+                'orderpoint_id': orderpoints[po.id].id,
+                'state': 'dc_so_created',
+                'notes': f"Auto-created from PO {po.name}",
+            } for (po, __), so in zip(todo, sales_orders)])
+
+            for (po, __), so in zip(todo, sales_orders):
+                orderpoint = orderpoints[po.id]
+                po.write({
+                    'dc_sales_order_id': so.id,
+                    'dc_company_id': orderpoint.dc_company_id.id,
+                    'orderpoint_id': orderpoint.id,  # set sekarang
+                })
+                _logger.info("✓ Created DC SO %s for PO %s", so.name, po.name)
+            created += len(sales_orders)
+        return created
+
+    def _commit_dc_so_batch(self):
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+
+    @api.model
+    def _cron_create_dc_sales_orders(self, batch_size=None):
+        """
+        Cron: Auto-create DC SO dari PO secara batch.
+
+        - orderpoint semua PO kandidat di-prefetch dengan satu search
+        - SO dibuat dengan create(vals_list) dan di-confirm per batch,
+          commit setiap batch (batch_size PO)
+        - PO tanpa orderpoint ditandai dc_so_evaluated_date sehingga tidak
+          di-scan lagi sampai ada orderpoint DC yang berubah (high-water mark)
+        """
+        self = self.sudo().with_context(active_test=False)
+        batch_size = batch_size or self._get_dc_so_batch_size()
+
+        pos = self._get_dc_so_candidates()
+        _logger.info("CRON: Scanning %d PO for DC SO creation", len(pos))
+        if not pos:
+            return
+
+        orderpoints = self._prefetch_dc_orderpoints(pos)
+        skipped = pos.filtered(lambda po: po.id not in orderpoints)
+        if skipped:
+            for po in skipped:
+                if not po.picking_type_id.warehouse_id:
+                    _logger.warning("PO %s: no warehouse found", po.name)
+            skipped.write({'dc_so_evaluated_date': fields.Datetime.now()})
+            _logger.info("Skip %d PO: no suitable orderpoint found", len(skipped))
+            self._commit_dc_so_batch()
+
+        todo = pos - skipped
+        ok = fail = 0
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start + batch_size]
+            try:
+                with self.env.cr.savepoint():
+                    ok += self._create_dc_sales_orders_batch(batch, orderpoints)
+            except Exception:
+                _logger.exception("✗ DC SO batch failed, retrying %d PO one by one", len(batch))
+                self.env.invalidate_all()
+                # Isolasi PO yang gagal agar PO lain di batch tetap diproses
+                for po in batch:
+                    try:
+                        with self.env.cr.savepoint():
+                            ok += self._create_dc_sales_orders_batch(po, orderpoints)
+                    except Exception as e:
+                        fail += 1
+                        self.env.invalidate_all()
+                        _logger.exception("✗ Failed PO %s: %s", po.name, str(e))
+            self._commit_dc_so_batch()
+
+        _logger.info("CRON DONE: %d success, %d failed, %d skipped", ok, fail, len(skipped))
 
     def action_create_dc_monitor(self):
         """Create DC Monitor dari PO ini"""
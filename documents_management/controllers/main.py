@@ -1,28 +1,69 @@
 import json
-import base64
 import logging
-import werkzeug
+import zipfile
 
 from odoo import http
-from odoo.http import request
+from odoo.http import request, content_disposition
 from odoo.tools import html_escape
 
+_logger = logging.getLogger(__name__)
+
+# Bytes read from the filestore per step while the ZIP is streamed
+ZIP_READ_SIZE = 1024 * 1024
+
+
+class _ZipOutput(object):
+    """ Write-only, non seekable file object collecting what zipfile writes, so that the
+        archive can be sent to the client piece by piece. """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _stream_zip(entries):
+    """ Generate the ZIP archive of `entries`, a list of (name, date_time, size, path, data):
+        filestore files are copied by chunks, database stored contents are written as is. """
+    output = _ZipOutput()
+    with zipfile.ZipFile(output, mode='w') as archive:
+        for name, date_time, size, path, data in entries:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.file_size = size
+            with archive.open(info, mode='w') as dest:
+                if path:
+                    with open(path, 'rb') as source:
+                        for chunk in iter(lambda: source.read(ZIP_READ_SIZE), b''):
+                            dest.write(chunk)
+                            yield output.pop()
+                else:
+                    dest.write(data)
+            yield output.pop()
+    yield output.pop()
+
+
 class IrAttachemntsShareController(http.Controller):
     
     @http.route('/web/get_attachments/token/<string:token>', type='http', auth="none")
     def get_attachments(self, token , **kwargs):
         try:
             ir_attachment_env = request.env['ir.attachment']
-            ir_attachment = ir_attachment_env.sudo().search([('access_token', '=', token)])
+            ir_attachment = ir_attachment_env.sudo().search([('access_token', '=', token)], limit=1)
             if ir_attachment:
-                for attachment in ir_attachment:                    
-                    content = base64.b64decode(attachment.datas)
-                    disposition = 'attachment; filename=%s' % werkzeug.urls.url_quote(attachment.name)                    
-                    return request.make_response(
-                        content,
-                        [('Content-Length', len(content)),
-                         ('Content-Type', attachment.mimetype),
-                         ('Content-Disposition', disposition)])
+                # served from the filestore by werkzeug: Content-Length, ETag (checksum)
+                # and Range / conditional requests are handled without loading the file
+                stream = request.env['ir.binary']._get_stream_from(ir_attachment)
+                return stream.get_response(as_attachment=True)
             else:
                 error = {
                     'code': 200,
@@ -31,9 +72,28 @@ class IrAttachemntsShareController(http.Controller):
             return request.make_response(html_escape(json.dumps(error)))
             
         except Exception as e:
-            se = http.serialize_exception(e)
+            _logger.exception("Shared attachment download failed")
             error = {
                 'code': 200,
                 'message': "Error - Odoo Server Error",
             }
             return request.make_response(html_escape(json.dumps(error)))
+
+    @http.route('/web/get_attachments/zip/<int:export_id>', type='http', auth="user")
+    def get_attachments_zip(self, export_id, **kwargs):
+        export = request.env['ir.attachment.export'].browse(export_id).exists()
+        if not export:
+            return request.not_found()
+        ir_binary = request.env['ir.binary']
+        entries = []
+        for attachment in export.attachment_ids:
+            if attachment.type != 'binary':
+                continue
+            stream = ir_binary._record_to_stream(attachment, 'raw')
+            date_time = (attachment.write_date or attachment.create_date).timetuple()[:6]
+            entries.append((attachment.name, date_time, stream.size, stream.path, stream.data))
+        # the generator only reads the filestore: it runs after the cursor is released
+        return request.make_response(_stream_zip(entries), [
+            ('Content-Type', 'application/zip'),
+            ('Content-Disposition', content_disposition(export.name)),
+        ])
@@ -1,6 +1,13 @@
-from odoo import models, fields, api, _
+import logging
+
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import UserError, ValidationError
 
+_logger = logging.getLogger(__name__)
+
+# Attachments moved into a model folder per UPDATE statement
+FOLDER_ASSIGN_CHUNK = 50000
+
 class DocumentFolder(models.Model):
     _name = 'documents.folder'
     _description = 'Directory'
@@ -53,10 +60,10 @@ class DocumentFolder(models.Model):
        
     @api.constrains('model_id')
     def _check_model(self):
-        self.ensure_one()
-        model = self.env['documents.folder'].sudo().search([('model_id.model', '=', self.model_id.model)])
-        if len(model) > 1:
-            raise ValidationError(_('This models directory has already been established.!'))
+        for folder in self:
+            model = self.env['documents.folder'].sudo().search([('model_id.model', '=', folder.model_id.model)])
+            if len(model) > 1:
+                raise ValidationError(_('This models directory has already been established.!'))
             
     def action_see_attachments(self):
         domain = [('folder_id', '=', self.id)]
@@ -71,16 +78,57 @@ class DocumentFolder(models.Model):
         }
         return res
 
-    @api.model
-    def create(self,vals):
-        result = super(DocumentFolder, self).create(vals)        
-        attachments = self.env['ir.attachment'].sudo().search([])
-        model_id = vals.get('model_id' ,False)
-        if model_id:
-            for attachment in attachments:
-                model = self.env['ir.model'].sudo().search([('id', '=', model_id)], limit=1)            
-                if model and attachment.res_model == model.model:
-                    attachment.sudo().write({
-                        'folder_id': result.id
-                    })
+    @api.model_create_multi
+    def create(self, vals_list):
+        result = super(DocumentFolder, self).create(vals_list)
+        self.clear_caches()
+        result.filtered('model_id')._assign_model_attachments()
         return result
+
+    def write(self, vals):
+        res = super(DocumentFolder, self).write(vals)
+        if 'model_id' in vals:
+            self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super(DocumentFolder, self).unlink()
+        self.clear_caches()
+        return res
+
+    @api.model
+    @tools.ormcache()
+    def _get_model_folder_map(self):
+        """ {res_model: folder_id} of the model directories, used on every attachment creation. """
+        folders = self.sudo().search_read([('model_id', '!=', False)], ['model_id'], order='id desc')
+        ir_models = self.env['ir.model'].sudo().browse([folder['model_id'][0] for folder in folders])
+        model_names = dict(zip(ir_models.ids, ir_models.mapped('model')))
+        return {model_names[folder['model_id'][0]]: folder['id'] for folder in folders}
+
+    def _assign_model_attachments(self, chunk_size=FOLDER_ASSIGN_CHUNK):
+        """ Move the existing attachments of the folder model into the folder, with chunked
+            UPDATE statements instead of browsing every attachment. """
+        self.env['ir.attachment'].flush_model(['res_model', 'folder_id'])
+        for folder in self:
+            model = folder.sudo().model_id.model
+            total = 0
+            while True:
+                self._cr.execute("""
+                    UPDATE ir_attachment
+                       SET folder_id = %(folder_id)s,
+                           write_uid = %(uid)s,
+                           write_date = (now() at time zone 'UTC')
+                     WHERE id IN (SELECT id FROM ir_attachment
+                                   WHERE res_model = %(model)s
+                                     AND folder_id IS DISTINCT FROM %(folder_id)s
+                                   ORDER BY id
+                                   LIMIT %(limit)s)
+                """, {'folder_id': folder.id, 'uid': self.env.uid, 'model': model, 'limit': chunk_size})
+                total += self._cr.rowcount
+                if self._cr.rowcount < chunk_size:
+                    break
+                _logger.info("Directory %s: %s attachments of %s assigned so far", folder.id, total, model)
+            if total:
+                _logger.info("Directory %s: %s attachments of %s assigned", folder.id, total, model)
+        self.env['ir.attachment'].invalidate_model(['folder_id', 'write_uid', 'write_date'])
+        self.invalidate_recordset(['attachment_ids'])
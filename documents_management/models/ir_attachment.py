@@ -23,38 +23,101 @@ class IrAttachment(models.Model):
             self.sudo().write({'access_token': str(uuid.uuid4())})
         return self.access_token
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        vals_list = [dict(vals) for vals in vals_list]
+        folder_map = self.env['documents.folder']._get_model_folder_map()
+        for vals in vals_list:
+            folder_id = vals.get('res_model') and folder_map.get(vals['res_model'])
+            if folder_id:
+                vals.update({
+                    'folder_id': folder_id
+                })
+
+        self._set_next_versions(vals_list)
+
+        codes = self._reserve_codes(len(vals_list))
+        for vals, code in zip(vals_list, codes):
+            if code:
+                vals.update({
+                    'code': code,
+                })
+        return super(IrAttachment, self).create(vals_list)
+
+    @api.model
+    def _set_next_versions(self, vals_list):
+        """ Version of each new named attachment: one more than the highest version of the
+            attachments with the same name on the same record, read with one grouped query
+            per batch. Attachments of the same batch are numbered in order. """
+        keys = {(vals['name'], vals.get('res_model') or '', vals.get('res_id') or 0)
+                for vals in vals_list if vals.get('name')}
+        if not keys:
+            return
+        self.flush_model(['name', 'res_model', 'res_id', 'res_field', 'version'])
+        last_versions = {}
+        with_model = [key for key in keys if key[1]]
+        if with_model:
+            # plain equality on res_model / res_id keeps the (res_model, res_id) index usable
+            self._cr.execute("""
+                SELECT attachment.name, attachment.res_model, attachment.res_id, MAX(attachment.version)
+                  FROM ir_attachment attachment
+                  JOIN unnest(%s::varchar[], %s::varchar[], %s::int[]) AS new(name, res_model, res_id)
+                    ON attachment.res_model = new.res_model
+                   AND attachment.res_id = new.res_id
+                   AND attachment.name = new.name
+                 WHERE attachment.res_field IS NULL
+              GROUP BY attachment.name, attachment.res_model, attachment.res_id
+            """, [[key[0] for key in with_model], [key[1] for key in with_model], [key[2] for key in with_model]])
+            for name, res_model, res_id, version in self._cr.fetchall():
+                last_versions[(name, res_model, res_id)] = version or 0
+        without_model = [key for key in keys if not key[1]]
+        if without_model:
+            self._cr.execute("""
+                SELECT attachment.name, COALESCE(attachment.res_id, 0), MAX(attachment.version)
+                  FROM ir_attachment attachment
+                 WHERE attachment.res_model IS NULL
+                   AND attachment.res_field IS NULL
+                   AND attachment.name IN %s
+              GROUP BY attachment.name, COALESCE(attachment.res_id, 0)
+            """, [tuple({key[0] for key in without_model})])
+            for name, res_id, version in self._cr.fetchall():
+                last_versions[(name, '', res_id)] = version or 0
+        for vals in vals_list:
+            if vals.get('name'):
+                key = (vals['name'], vals.get('res_model') or '', vals.get('res_id') or 0)
+                # highest existing version + 1, or 1 for a new document
+                version = last_versions.get(key, 0) + 1
+                last_versions[key] = version
+                vals.update({
+                    'version': version
+                })
+
     @api.model
-    def create(self,vals):
-
-        model = vals.get('res_model',False)
-        name = vals.get('name',False)
-        res_id = vals.get('res_id',False)
-
-        folder = self.env['documents.folder'].sudo().search([('model_id.model', '=', model)])
-        if folder:
-            vals.update({
-                'folder_id': folder.id
-            })
-
-        if name:
-            attachments = self.env['ir.attachment'].search([('name', '=', name),('res_model','=',model),('res_id','=',res_id)], order="id desc")
-            version =  False
-            if attachments:
-                last_attachment = self.env['ir.attachment'].browse(max(attachments.ids))
-                version = last_attachment.version + 1
-            else:
-                version = 1
-
-            vals.update({
-                'version': version
-            })
-
-        code = self.env['ir.sequence'].next_by_code('ir.attachment.code')
-        if code:
-            vals.update({
-                'code' : code,
-            })
-        return super(IrAttachment, self).create(vals)
+    def _reserve_codes(self, count):
+        """ Reserve `count` numbers of the attachment code sequence at once, as
+            next_by_code('ir.attachment.code') would return them one by one. """
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'ir.attachment.code'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return [False] * count
+        if count == 1 or sequence.use_date_range:
+            return [sequence._next() for dummy in range(count)]
+        if sequence.implementation == 'standard':
+            self._cr.execute("SELECT nextval(%s) FROM generate_series(1, %s)",
+                             ['ir_sequence_%03d' % sequence.id, count])
+            numbers = [row[0] for row in self._cr.fetchall()]
+        else:
+            # no gap: lock the sequence row once and move it forward by the whole batch
+            self._cr.execute("SELECT number_next FROM ir_sequence WHERE id = %s FOR UPDATE NOWAIT",
+                             [sequence.id])
+            number_next = self._cr.fetchone()[0]
+            self._cr.execute("UPDATE ir_sequence SET number_next = number_next + %s WHERE id = %s",
+                             [sequence.number_increment * count, sequence.id])
+            sequence.invalidate_recordset(['number_next'])
+            numbers = [number_next + sequence.number_increment * index for index in range(count)]
+        return [sequence.get_next_char(number) for number in numbers]
 
     def _find_mail_template(self):
         template_id = False
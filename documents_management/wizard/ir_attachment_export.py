@@ -1,8 +1,4 @@
 from datetime import datetime
-import base64
-import time
-import io
-import zipfile
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
@@ -17,24 +13,18 @@ class IrAttachmentExport(models.TransientModel):
             _("attachment_export"), datetime.now().strftime('%Y%m%d%H%M')  +'.zip')
 
     name = fields.Char('Filename', default=_default_name, required=True, readonly= True)
-    zip_data = fields.Binary("Zip File")
+    attachment_ids = fields.Many2many('ir.attachment', string='Attachments')
 
     def action_export_zip(self):
-        active_ids = self.env.context['active_ids']
-        attachments = self.env[self.env.context['active_model']].browse(active_ids)        
-
-        fp = io.BytesIO()
-        zf = zipfile.ZipFile(fp, mode="w")
-        for att in attachments:
-            zf.writestr(att.name, base64.b64decode(att.datas))
-
-        zf.close()
-        self.write({'zip_data':base64.b64encode(fp.getvalue())})
+        self.ensure_one()
+        active_ids = self.env.context.get('active_ids', [])
+        self.attachment_ids = [(6, 0, active_ids)]
         name = self.name
+        # the archive is streamed by the controller, file by file from the filestore
         action = {
             'name': name,
             'type': 'ir.actions.act_url',
-            'url': "/web/content/?model="+self._name+"&id=" + str(self.id) + "&field=zip_data&download=true&filename="+ name,
+            'url': "/web/get_attachments/zip/%s" % self.id,
             'target': 'self',
             }
         
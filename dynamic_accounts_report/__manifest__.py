@@ -52,6 +52,7 @@
         'report/daybook.xml',
         'security/ir.model.access.csv',
         'views/consolidation_views.xml',
+        'data/account_balance_snapshot_data.xml',
     ],
     'assets': {
         'web.assets_backend': [
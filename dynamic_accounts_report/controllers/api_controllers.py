@@ -1,12 +1,24 @@
 # -*- coding: utf-8 -*-
-from odoo import http
-from odoo.http import request
+from odoo import api, http
+from odoo.exceptions import AccessError
+from odoo.http import content_disposition, request, Response
+import csv
+import io
 import json
 import logging
 
 _logger = logging.getLogger(__name__)
 
 class FinancialReportsAPIController(http.Controller):
+
+    def _detail_options(self, kwargs):
+        """Opsi detail transaksi untuk endpoint detail group (default: tanpa detail)."""
+        options = {'include_transactions': bool(kwargs.get('include_transactions'))}
+        if kwargs.get('transaction_limit') is not None:
+            options['transaction_limit'] = int(kwargs['transaction_limit'])
+        if kwargs.get('transaction_offset') is not None:
+            options['transaction_offset'] = int(kwargs['transaction_offset'])
+        return options
     
     # ============== BALANCE SHEET ENDPOINTS ==============
     
@@ -48,7 +60,9 @@ class FinancialReportsAPIController(http.Controller):
             report_obj = request.env['account.balance.sheet.report']
             data = report_obj.get_all_companies_balance_sheet(
                 date_from=kwargs.get('date_from'),
-                date_to=kwargs.get('date_to')
+                date_to=kwargs.get('date_to'),
+                parallel=bool(kwargs.get('parallel')),
+                max_workers=kwargs.get('max_workers')
             )
             
             return data
@@ -181,6 +195,69 @@ class FinancialReportsAPIController(http.Controller):
             _logger.error(f"Error: {str(e)}", exc_info=True)
             return {'status': 'error', 'message': str(e)}
 
+    @http.route('/api/export/all_move_lines/stream', type='http', auth='user', methods=['GET', 'POST'], csrf=False)
+    def export_all_move_lines_stream(self, **kwargs):
+        """
+        Export semua move lines secara streaming (chunked), format NDJSON (default) atau CSV.
+        Query/form params: date_from, date_to, company_id, account_type (dipisah koma), format=ndjson|csv
+        """
+        export_format = (kwargs.get('format') or 'ndjson').lower()
+        if export_format not in ('ndjson', 'csv'):
+            return request.make_json_response(
+                {'status': 'error', 'message': 'format must be ndjson or csv'}, status=400)
+        account_type = kwargs.get('account_type')
+        if account_type:
+            account_type = [t.strip() for t in account_type.split(',') if t.strip()]
+        options = {
+            'date_from': kwargs.get('date_from') or False,
+            'date_to': kwargs.get('date_to') or False,
+            'company_id': int(kwargs['company_id']) if kwargs.get('company_id') else False,
+            'account_type': account_type or False,
+        }
+
+        # Cek hak akses sebelum response dimulai, error di tengah stream tidak bisa dilaporkan
+        try:
+            request.env['account.balance.sheet.report']._get_export_company(options['company_id'])
+        except AccessError as e:
+            return request.make_json_response({'status': 'error', 'message': str(e)}, status=403)
+
+        # Response di-iterasi setelah request selesai, jadi generator memakai cursor sendiri
+        registry = request.env.registry
+        uid = request.env.uid
+        context = dict(request.env.context)
+
+        def generate():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                report_obj = env['account.balance.sheet.report']
+                header_written = False
+                for batch in report_obj.iter_move_line_export_batches(**options):
+                    if export_format == 'csv':
+                        buffer = io.StringIO()
+                        writer = csv.DictWriter(buffer, fieldnames=list(batch[0]))
+                        if not header_written:
+                            writer.writeheader()
+                            header_written = True
+                        for row in batch:
+                            writer.writerow(dict(row, analytic_distribution=json.dumps(row['analytic_distribution'])))
+                        yield buffer.getvalue().encode('utf-8')
+                    else:
+                        yield ''.join(json.dumps(row, default=str) + '\n' for row in batch).encode('utf-8')
+
+        if export_format == 'csv':
+            mimetype, filename = 'text/csv', 'move_lines.csv'
+        else:
+            mimetype, filename = 'application/x-ndjson', 'move_lines.ndjson'
+        return Response(
+            generate(),
+            headers=[
+                ('Content-Type', '%s; charset=utf-8' % mimetype),
+                ('Content-Disposition', content_disposition(filename)),
+                ('Cache-Control', 'no-store'),
+            ],
+            direct_passthrough=True,
+        )
+
     @http.route('/api/export/aggregated_by_account', type='json', auth='user', methods=['POST'], csrf=False)
     def export_aggregated_by_account(self, **kwargs):
         """Export move lines agregat per account"""
@@ -221,7 +298,8 @@ class FinancialReportsAPIController(http.Controller):
             data = report_obj.asset_detail_group(
                 date_from=kwargs.get('date_from'),
                 date_to=kwargs.get('date_to'),
-                company_id=kwargs.get('company_id')
+                company_id=kwargs.get('company_id'),
+                **self._detail_options(kwargs)
             )
             return data
         except Exception as e:
@@ -236,7 +314,8 @@ class FinancialReportsAPIController(http.Controller):
             data = report_obj.asset_Liability_group(
                 date_from=kwargs.get('date_from'),
                 date_to=kwargs.get('date_to'),
-                company_id=kwargs.get('company_id')
+                company_id=kwargs.get('company_id'),
+                **self._detail_options(kwargs)
             )
             return data
         except Exception as e:
@@ -251,7 +330,8 @@ class FinancialReportsAPIController(http.Controller):
             data = report_obj.profit_loss_detail_group(
                 date_from=kwargs.get('date_from'),
                 date_to=kwargs.get('date_to'),
-                company_id=kwargs.get('company_id')
+                company_id=kwargs.get('company_id'),
+                **self._detail_options(kwargs)
             )
             return data
         except Exception as e:
@@ -266,7 +346,8 @@ class FinancialReportsAPIController(http.Controller):
             data = report_obj.equity_detail_group(
                 date_from=kwargs.get('date_from'),
                 date_to=kwargs.get('date_to'),
-                company_id=kwargs.get('company_id')
+                company_id=kwargs.get('company_id'),
+                **self._detail_options(kwargs)
             )
             return data
         except Exception as e:
@@ -283,7 +364,8 @@ class FinancialReportsAPIController(http.Controller):
             data = report_obj.financial_report_combined(
                 date_from=kwargs.get('date_from'),
                 date_to=kwargs.get('date_to'),
-                company_id=kwargs.get('company_id')
+                company_id=kwargs.get('company_id'),
+                **self._detail_options(kwargs)
             )
             return data
         except Exception as e:
@@ -297,7 +379,9 @@ class FinancialReportsAPIController(http.Controller):
         {
           "company_ids": [1, 2, 3],
           "date_from": "YYYY-MM-DD",      # optional
-          "date_to": "YYYY-MM-DD"         # optional
+          "date_to": "YYYY-MM-DD",        # optional
+          "parallel": true,               # optional, hitung per company di worker pool
+          "max_workers": 4                # optional
         }
         Returns: semua hasil financial_report_combined per company dalam satu payload.
         """
@@ -313,7 +397,9 @@ class FinancialReportsAPIController(http.Controller):
             return report.financial_report_combined_multi_company(
                 company_ids=company_ids,
                 date_from=date_from,
-                date_to=date_to
+                date_to=date_to,
+                parallel=bool(kwargs.get('parallel')),
+                max_workers=kwargs.get('max_workers')
             )
         except Exception as e:
             _logger.error("combined_multi_company API error: %s", e, exc_info=True)
@@ -328,7 +414,9 @@ class FinancialReportsAPIController(http.Controller):
           "date_to": "YYYY-MM-DD",
           "company_ids": [1, 2, 3],
           "elimination_account_codes": ["21210030","42000042","67100041"],   # dianjurkan
-          "elimination_account_ids": [35,100,101]                            # opsional (kompatibel)
+          "elimination_account_ids": [35,100,101],                           # opsional (kompatibel)
+          "parallel": true,                                                  # opsional
+          "max_workers": 4                                                   # opsional
         }
         """
         try:
@@ -347,7 +435,9 @@ class FinancialReportsAPIController(http.Controller):
                 date_to=date_to,
                 company_ids=company_ids,
                 elimination_account_codes=elimination_account_codes,
-                elimination_account_ids=elimination_account_ids
+                elimination_account_ids=elimination_account_ids,
+                parallel=bool(kwargs.get('parallel')),
+                max_workers=kwargs.get('max_workers')
             )
         except Exception as e:
             _logger.error("with_elimination API error: %s", e, exc_info=True)
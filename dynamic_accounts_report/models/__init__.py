@@ -21,6 +21,8 @@
 #############################################################################
 from . import move_line
 from . import account_account_custom
+from . import account_balance_snapshot
+from . import ledger_aggregate
 from . import balance_sheet_report
 from . import profit_loss_report
 from . import consolidation
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+import logging
+import time
+_logger = logging.getLogger(__name__)
+
+# Parameter penanda snapshot sudah dibangun penuh dan aman dipakai laporan
+SNAPSHOT_READY_PARAM = 'dynamic_accounts_report.balance_snapshot_ready'
+
+
+class AccountBalanceSnapshot(models.Model):
+    """
+    Saldo harian per company/akun/jurnal dari move line berstatus posted.
+    Dipelihara per (company, account, journal, date) yang tersentuh saat
+    move di-post / di-draft / di-cancel, sehingga opening balance laporan
+    cukup dijumlah dari tabel ini tanpa memindai seluruh histori move line.
+    """
+    _name = 'account.balance.snapshot'
+    _description = 'Daily Account Balance Snapshot'
+    _log_access = False
+    _order = 'date, account_id'
+
+    company_id = fields.Many2one('res.company', required=True, readonly=True, index=True, ondelete='cascade')
+    account_id = fields.Many2one('account.account', required=True, readonly=True, index=True, ondelete='cascade')
+    journal_id = fields.Many2one('account.journal', required=True, readonly=True, ondelete='cascade')
+    date = fields.Date(required=True, readonly=True, index=True)
+    debit = fields.Float(readonly=True)
+    credit = fields.Float(readonly=True)
+    balance = fields.Float(readonly=True)
+    line_count = fields.Integer(readonly=True)
+
+    _sql_constraints = [
+        ('snapshot_key_uniq', 'unique(company_id, account_id, journal_id, date)',
+         'Snapshot saldo harus unik per company, akun, jurnal dan tanggal.'),
+    ]
+
+    # ------------------------------------------------------------------
+    # Pemeliharaan
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _is_ready(self):
+        return bool(self.env['ir.config_parameter'].sudo().get_param(SNAPSHOT_READY_PARAM))
+
+    @api.model
+    def _get_line_keys(self, move_ids):
+        """Key (company, account, journal, date) dari move line milik move_ids."""
+        if not move_ids:
+            return set()
+        self.env['account.move.line'].flush_model(
+            ['move_id', 'company_id', 'account_id', 'journal_id', 'date'])
+        self.env.cr.execute("""
+            SELECT DISTINCT company_id, account_id, journal_id, date
+              FROM account_move_line
+             WHERE move_id IN %s
+               AND account_id IS NOT NULL
+        """, (tuple(move_ids),))
+        return set(self.env.cr.fetchall())
+
+    @api.model
+    def _refresh_keys(self, keys):
+        """
+        Hitung ulang baris snapshot untuk key yang tersentuh.
+        Nilai dihitung absolut dari move line posted (bukan delta) sehingga
+        refresh berulang tetap konsisten; key tanpa line posted dihapus.
+        """
+        if not keys:
+            return
+        self.env['account.move.line'].flush_model([
+            'company_id', 'account_id', 'journal_id', 'date',
+            'debit', 'credit', 'balance', 'parent_state',
+        ])
+        company_ids, account_ids, journal_ids, dates = (list(col) for col in zip(*keys))
+        params = {
+            'company_ids': company_ids,
+            'account_ids': account_ids,
+            'journal_ids': journal_ids,
+            'dates': dates,
+        }
+        keys_cte = """
+            WITH keys AS (
+                SELECT * FROM unnest(%(company_ids)s::int[], %(account_ids)s::int[],
+                                     %(journal_ids)s::int[], %(dates)s::date[])
+                       AS k(company_id, account_id, journal_id, date)
+            )
+        """
+        self.env.cr.execute(keys_cte + """
+            INSERT INTO account_balance_snapshot
+                   (company_id, account_id, journal_id, date, debit, credit, balance, line_count)
+            SELECT aml.company_id, aml.account_id, aml.journal_id, aml.date,
+                   SUM(aml.debit), SUM(aml.credit), SUM(aml.balance), COUNT(*)
+              FROM keys k
+              JOIN account_move_line aml
+                ON aml.company_id = k.company_id
+               AND aml.account_id = k.account_id
+               AND aml.journal_id = k.journal_id
+               AND aml.date = k.date
+             WHERE aml.parent_state = 'posted'
+          GROUP BY aml.company_id, aml.account_id, aml.journal_id, aml.date
+            ON CONFLICT (company_id, account_id, journal_id, date) DO UPDATE
+               SET debit = EXCLUDED.debit,
+                   credit = EXCLUDED.credit,
+                   balance = EXCLUDED.balance,
+                   line_count = EXCLUDED.line_count
+        """, params)
+        self.env.cr.execute(keys_cte + """
+            DELETE FROM account_balance_snapshot s
+             USING keys k
+             WHERE s.company_id = k.company_id
+               AND s.account_id = k.account_id
+               AND s.journal_id = k.journal_id
+               AND s.date = k.date
+               AND NOT EXISTS (
+                    SELECT 1 FROM account_move_line aml
+                     WHERE aml.company_id = s.company_id
+                       AND aml.account_id = s.account_id
+                       AND aml.journal_id = s.journal_id
+                       AND aml.date = s.date
+                       AND aml.parent_state = 'posted')
+        """, params)
+        self.invalidate_model()
+
+    @api.model
+    def rebuild(self, company_ids=None):
+        """
+        Bangun ulang snapshot dari nol (semua company atau company_ids),
+        lalu tandai snapshot siap dipakai laporan.
+        """
+        start = time.time()
+        self.env['account.move.line'].flush_model([
+            'company_id', 'account_id', 'journal_id', 'date',
+            'debit', 'credit', 'balance', 'parent_state',
+        ])
+        company_clause = ''
+        params = {}
+        if company_ids:
+            company_clause = 'AND aml.company_id IN %(company_ids)s'
+            params['company_ids'] = tuple(company_ids)
+            self.env.cr.execute(
+                'DELETE FROM account_balance_snapshot WHERE company_id IN %(company_ids)s', params)
+        else:
+            self.env.cr.execute('DELETE FROM account_balance_snapshot')
+        self.env.cr.execute("""
+            INSERT INTO account_balance_snapshot
+                   (company_id, account_id, journal_id, date, debit, credit, balance, line_count)
+            SELECT aml.company_id, aml.account_id, aml.journal_id, aml.date,
+                   SUM(aml.debit), SUM(aml.credit), SUM(aml.balance), COUNT(*)
+              FROM account_move_line aml
+             WHERE aml.parent_state = 'posted'
+               AND aml.account_id IS NOT NULL
+               {company}
+          GROUP BY aml.company_id, aml.account_id, aml.journal_id, aml.date
+        """.format(company=company_clause), params)
+        row_count = self.env.cr.rowcount
+        self.invalidate_model()
+        self.env['ir.config_parameter'].sudo().set_param(SNAPSHOT_READY_PARAM, '1')
+        _logger.info(
+            "Account balance snapshot rebuilt: %s rows in %.2fs",
+            row_count, time.time() - start)
+        return row_count
+
+    @api.model
+    def _cron_rebuild_snapshot(self):
+        self.rebuild()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    @api.model
+    def get_opening_balances(self, company_ids, account_ids, date_from, journal_ids=None):
+        """
+        Opening balance (date < date_from) per akun dari snapshot harian.
+
+        Return: {account_id: {debit, credit, balance, line_count}}
+        """
+        if not account_ids or not date_from:
+            return {}
+        self.flush_model()
+        params = {
+            'company_ids': tuple(company_ids),
+            'account_ids': tuple(account_ids),
+            'date_from': date_from,
+        }
+        journal_clause = ''
+        if journal_ids:
+            journal_clause = 'AND s.journal_id IN %(journal_ids)s'
+            params['journal_ids'] = tuple(journal_ids)
+        self.env.cr.execute("""
+            SELECT s.account_id,
+                   SUM(s.debit) AS debit, SUM(s.credit) AS credit,
+                   SUM(s.balance) AS balance, SUM(s.line_count) AS line_count
+              FROM account_balance_snapshot s
+             WHERE s.company_id IN %(company_ids)s
+               AND s.account_id IN %(account_ids)s
+               AND s.date < %(date_from)s
+               {journal}
+          GROUP BY s.account_id
+        """.format(journal=journal_clause), params)
+        return {
+            row['account_id']: {
+                'debit': float(row['debit']),
+                'credit': float(row['credit']),
+                'balance': float(row['balance']),
+                'line_count': int(row['line_count']),
+            }
+            for row in self.env.cr.dictfetchall()
+        }
+
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    def _post(self, soft=True):
+        posted = super()._post(soft=soft)
+        snapshot = self.env['account.balance.snapshot'].sudo()
+        snapshot._refresh_keys(snapshot._get_line_keys(posted.ids))
+        return posted
+
+    def _refresh_balance_snapshot_after(self, method_name):
+        """Refresh snapshot untuk key move posted sebelum & sesudah perubahan state."""
+        snapshot = self.env['account.balance.snapshot'].sudo()
+        posted_ids = self.filtered(lambda m: m.state == 'posted').ids
+        keys = snapshot._get_line_keys(posted_ids)
+        res = getattr(super(AccountMove, self), method_name)()
+        if keys:
+            snapshot._refresh_keys(keys)
+        return res
+
+    def button_draft(self):
+        return self._refresh_balance_snapshot_after('button_draft')
+
+    def button_cancel(self):
+        return self._refresh_balance_snapshot_after('button_cancel')
@@ -1,9 +1,33 @@
 # -*- coding: utf-8 -*-
-from odoo import api, models, fields
+from odoo import api, models, fields, _
+from odoo.exceptions import AccessError
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
 import logging
+import time
+from .ledger_aggregate import BALANCE_TOTAL_KEYS, DEFAULT_TRANSACTION_LIMIT
 _logger = logging.getLogger(__name__)
 
+# Jumlah move line per batch untuk export streaming
+EXPORT_BATCH_SIZE = 5000
+
+# Ukuran default worker pool laporan multi-company (mode parallel)
+DEFAULT_REPORT_WORKERS = 4
+
+BS_ACCOUNT_TYPES = [
+    # ASSETS
+    'asset_receivable', 'asset_cash', 'asset_current',
+    'asset_non_current', 'asset_prepayments', 'asset_fixed',
+
+    # LIABILITIES
+    'liability_payable', 'liability_credit_card',
+    'liability_current', 'liability_non_current',
+
+    # EQUITY
+    'equity', 'equity_unaffected'
+]
+
 class BalanceSheetReport(models.TransientModel):
     _name = 'account.balance.sheet.report'
     _description = 'Balance Sheet Report API'
@@ -91,58 +115,134 @@ class BalanceSheetReport(models.TransientModel):
         }
     
     @api.model
-    def get_all_companies_balance_sheet(self, date_from=False, date_to=False):
-        """Ambil balance sheet untuk SEMUA company"""
+    def get_all_companies_balance_sheet(self, date_from=False, date_to=False, parallel=False, max_workers=None):
+        """
+        Ambil balance sheet untuk SEMUA company.
+        parallel=True: tiap company dihitung di worker pool terbatas (cursor sendiri per thread).
+        """
         _logger.info("Getting balance sheet for ALL companies")
         
         # Ambil semua company
         companies = self.env['res.company'].search([])
         _logger.info(f"Found {len(companies)} companies")
         
-        results = []
-        
-        for company in companies:
-            _logger.info(f"Processing company: {company.name}")
-            
-            filters = {
-                'date_from': date_from or False,
-                'date_to': date_to or datetime.now().strftime('%Y-%m-%d'),
-                'company_id': company.id,
-                'company_name': company.name,
-            }
-            
-            try:
-                bs_lines = self._get_balance_sheet_lines(filters, company)
-                summary = self._calculate_summary(bs_lines)
-                
-                results.append({
-                    'company': {
-                        'id': company.id,
-                        'name': company.name,
-                        'currency': company.currency_id.name,
-                        'currency_symbol': company.currency_id.symbol,
-                    },
-                    'filters': filters,
-                    'balance_sheet_lines': bs_lines,
-                    'summary': summary,
-                })
-            except Exception as e:
-                _logger.error(f"Error processing company {company.name}: {str(e)}")
-                results.append({
-                    'company': {
-                        'id': company.id,
-                        'name': company.name,
-                    },
-                    'error': str(e)
-                })
+        results, execution = self._run_per_company(
+            companies, '_get_company_balance_sheet_entry',
+            parallel=parallel, max_workers=max_workers,
+            date_from=date_from, date_to=date_to,
+        )
         
         return {
             'status': 'success',
             'total_companies': len(companies),
             'date_from': date_from,
             'date_to': date_to,
+            'execution': execution,
             'data': results
         }
+
+    @api.model
+    def _get_company_balance_sheet_entry(self, company_id, date_from=False, date_to=False):
+        """Satu entry get_all_companies_balance_sheet untuk satu company."""
+        company = self.env['res.company'].browse(company_id)
+        _logger.info(f"Processing company: {company.name}")
+        
+        filters = {
+            'date_from': date_from or False,
+            'date_to': date_to or datetime.now().strftime('%Y-%m-%d'),
+            'company_id': company.id,
+            'company_name': company.name,
+        }
+        
+        bs_lines = self._get_balance_sheet_lines(filters, company)
+        summary = self._calculate_summary(bs_lines)
+        
+        return {
+            'company': {
+                'id': company.id,
+                'name': company.name,
+                'currency': company.currency_id.name,
+                'currency_symbol': company.currency_id.symbol,
+            },
+            'filters': filters,
+            'balance_sheet_lines': bs_lines,
+            'summary': summary,
+        }
+
+    def _get_report_worker_count(self, max_workers=None):
+        """
+        Ukuran worker pool laporan multi-company.
+
+        Param sistem dynamic_accounts_report.report_workers adalah batas atas;
+        max_workers dari request hanya bisa memperkecilnya. Nilai yang tidak
+        valid diabaikan (kembali ke default).
+        """
+        configured = self.env['ir.config_parameter'].sudo().get_param(
+            'dynamic_accounts_report.report_workers', DEFAULT_REPORT_WORKERS)
+        try:
+            configured = max(int(configured), 1)
+        except (TypeError, ValueError):
+            configured = DEFAULT_REPORT_WORKERS
+        try:
+            requested = int(max_workers) if max_workers else configured
+        except (TypeError, ValueError):
+            requested = configured
+        return max(min(requested, configured), 1)
+
+    def _run_per_company(self, companies, method_name, parallel=False, max_workers=None, **kwargs):
+        """
+        Jalankan method_name(company_id, **kwargs) untuk setiap company.
+
+        parallel=True: fan-out ke ThreadPoolExecutor terbatas; tiap thread membuka
+        cursor sendiri (read-only, di-rollback saat selesai). Cursor worker hanya
+        melihat data yang sudah di-commit, jadi pemanggil yang baru menulis data
+        di transaksi yang sama harus commit dulu atau memakai parallel=False.
+        Hasil selalu mengikuti
+        urutan `companies` sehingga output deterministik. Setiap entry diberi
+        'elapsed_ms', dan error per company tidak menggagalkan company lain.
+
+        Return: (results, execution_info)
+        """
+        company_names = {company.id: company.name for company in companies}
+        workers = min(self._get_report_worker_count(max_workers), len(companies) or 1)
+        # Cursor test berbagi satu koneksi, jadi di mode test selalu sekuensial
+        parallel = bool(parallel) and workers > 1 and not self.env.registry.in_test_mode()
+
+        def run_one(env, company_id):
+            started = time.perf_counter()
+            try:
+                entry = getattr(env[self._name], method_name)(company_id, **kwargs)
+            except Exception as e:
+                _logger.error(f"{method_name} error @ {company_names[company_id]}: {e}", exc_info=True)
+                entry = {
+                    'company': {'id': company_id, 'name': company_names[company_id]},
+                    'status': 'error',
+                    'error': str(e),
+                }
+            entry['elapsed_ms'] = round((time.perf_counter() - started) * 1000.0, 2)
+            return entry
+
+        started = time.perf_counter()
+        if parallel:
+            registry = self.env.registry
+            uid, context, su = self.env.uid, dict(self.env.context), self.env.su
+
+            def worker(company_id):
+                with closing(registry.cursor()) as cr:
+                    return run_one(api.Environment(cr, uid, context, su=su), company_id)
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report_company') as executor:
+                results = list(executor.map(worker, companies.ids))
+        else:
+            results = [run_one(self.env, company_id) for company_id in companies.ids]
+
+        execution = {
+            'mode': 'parallel' if parallel else 'sequential',
+            'workers': workers if parallel else 1,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000.0, 2),
+        }
+        _logger.info(f"{method_name}: {len(results)} companies, {execution}")
+        return results, execution
     
     @api.model
     def get_available_companies(self):
@@ -296,124 +396,52 @@ class BalanceSheetReport(models.TransientModel):
     def _get_balance_sheet_lines(self, filters, company):
         """
         Ambil balance sheet lines berdasarkan account type + analytic filter.
-        PERBAIKAN: Hitung opening balance jika ada date_from.
+        Opening (sebelum date_from), period dan total dihitung untuk semua akun
+        sekaligus dalam satu query agregat (account.ledger.aggregate).
         """
-        bs_account_types = [
-            # ASSETS
-            'asset_receivable', 'asset_cash', 'asset_current',
-            'asset_non_current', 'asset_prepayments', 'asset_fixed',
-            
-            # LIABILITIES
-            'liability_payable', 'liability_credit_card',
-            'liability_current', 'liability_non_current',
-            
-            # EQUITY
-            'equity', 'equity_unaffected'
-        ]
         accounts = self.env['account.account'].search([
-            ('account_type', 'in', bs_account_types),
+            ('account_type', 'in', BS_ACCOUNT_TYPES),
             ('company_id', '=', company.id)
         ])
         _logger.info(f"Found {len(accounts)} balance sheet accounts for company {company.name}")
 
         analytic_ids = filters.get('analytic_account_ids') or []
-        apply_analytic = bool(filters.get('apply_analytic_on_bs'))
-        date_from = filters.get('date_from')
-        date_to = filters.get('date_to')
-        result = {'assets': [], 'liabilities': [], 'equity': []}
+        restricted_accounts = self.env['account.account']
+        if analytic_ids and filters.get('apply_analytic_on_bs'):
+            # Filter analytic hanya untuk akun asset (sama seperti sebelumnya)
+            restricted_accounts = accounts.filtered(lambda a: 'asset' in a.account_type)
+
+        totals = self.env['account.ledger.aggregate'].get_account_totals(
+            company, accounts.ids,
+            date_from=filters.get('date_from'),
+            date_to=filters.get('date_to'),
+            analytic_account_ids=analytic_ids if restricted_accounts else None,
+            analytic_restricted_account_ids=restricted_accounts.ids,
+        )
 
+        result = {'assets': [], 'liabilities': [], 'equity': []}
+        empty = dict.fromkeys(BALANCE_TOTAL_KEYS, 0.0)
         for account in accounts:
-            aml = self.env['account.move.line']
-            
-            # === HITUNG OPENING BALANCE (jika ada date_from) ===
-            opening_balance = 0.0
-            opening_debit = 0.0
-            opening_credit = 0.0
-            
-            if date_from:
-                domain_opening = [
-                    ('account_id', '=', account.id),
-                    ('move_id.state', '=', 'posted'),
-                    ('company_id', '=', company.id),
-                    ('date', '<', date_from)  # Sebelum periode
-                ]
-                
-                # Filter analytic untuk opening (jika apply_analytic=True dan asset)
-                if analytic_ids and apply_analytic and 'asset' in account.account_type:
-                    aal = self.env['account.analytic.line'].search([
-                        ('account_id', 'in', analytic_ids),
-                        ('company_id', '=', company.id),
-                    ])
-                    move_line_ids = set(aal.mapped('move_line_id').ids)
-                    opening_lines = aml.search(domain_opening + [('id', 'in', list(move_line_ids))]) if move_line_ids else aml.search(domain_opening)
-                    if not move_line_ids:
-                        opening_lines = opening_lines.filtered(
-                            lambda l: l.analytic_distribution and any(str(aid) in l.analytic_distribution for aid in analytic_ids)
-                        )
-                else:
-                    opening_lines = aml.search(domain_opening)
-                
-                opening_balance = sum(opening_lines.mapped('balance'))
-                opening_debit = sum(opening_lines.mapped('debit'))
-                opening_credit = sum(opening_lines.mapped('credit'))
-                
-                _logger.info(f"Account {account.code}: opening_balance={opening_balance:.2f}")
-            
-            # === HITUNG MOVEMENT PERIODE ===
-            domain_period = [
-                ('account_id', '=', account.id),
-                ('move_id.state', '=', 'posted'),
-                ('company_id', '=', company.id)
-            ]
-            
-            if date_from:
-                domain_period.append(('date', '>=', date_from))
-            if date_to:
-                domain_period.append(('date', '<=', date_to))
-            
-            # Filter analytic untuk period (jika apply_analytic=True dan asset)
-            if analytic_ids and apply_analytic and 'asset' in account.account_type:
-                aal = self.env['account.analytic.line'].search([
-                    ('account_id', 'in', analytic_ids),
-                    ('company_id', '=', company.id),
-                ])
-                move_line_ids = set(aal.mapped('move_line_id').ids)
-                period_lines = aml.search(domain_period + [('id', 'in', list(move_line_ids))]) if move_line_ids else aml.search(domain_period)
-                if not move_line_ids:
-                    period_lines = period_lines.filtered(
-                        lambda l: l.analytic_distribution and any(str(aid) in l.analytic_distribution for aid in analytic_ids)
-                    )
-            else:
-                period_lines = aml.search(domain_period)
-            
-            period_balance = sum(period_lines.mapped('balance'))
-            period_debit = sum(period_lines.mapped('debit'))
-            period_credit = sum(period_lines.mapped('credit'))
-            
-            # === TOTAL = OPENING + PERIOD ===
-            total_balance = opening_balance + period_balance
-            total_debit = opening_debit + period_debit
-            total_credit = opening_credit + period_credit
-            
-            if total_balance != 0 or opening_balance != 0:  # Tampilkan jika ada opening atau movement
+            amounts = totals.get(account.id, empty)
+            if amounts['balance'] != 0 or amounts['opening_balance'] != 0:  # Tampilkan jika ada opening atau movement
                 account_data = {
                     'id': account.id,
                     'code': account.code,
                     'name': account.name,
                     'type': account.account_type,
-                    'opening_balance': opening_balance,
-                    'opening_debit': opening_debit,
-                    'opening_credit': opening_credit,
-                    'period_balance': period_balance,
-                    'period_debit': period_debit,
-                    'period_credit': period_credit,
-                    'balance': total_balance,
-                    'debit': total_debit,
-                    'credit': total_credit,
+                    'opening_balance': amounts['opening_balance'],
+                    'opening_debit': amounts['opening_debit'],
+                    'opening_credit': amounts['opening_credit'],
+                    'period_balance': amounts['period_balance'],
+                    'period_debit': amounts['period_debit'],
+                    'period_credit': amounts['period_credit'],
+                    'balance': amounts['balance'],
+                    'debit': amounts['debit'],
+                    'credit': amounts['credit'],
                     'company_id': company.id,
                     'company_name': company.name,
                 }
-                
+
                 if 'asset' in account.account_type:
                     result['assets'].append(account_data)
                 elif 'liability' in account.account_type:
@@ -422,6 +450,11 @@ class BalanceSheetReport(models.TransientModel):
                     result['equity'].append(account_data)
 
         # === HITUNG P&L UNTUK PERIODE ===
+        self._append_profit_loss_line(result, filters, company)
+        return result
+
+    def _append_profit_loss_line(self, result, filters, company):
+        """Tambahkan baris Profit/Loss periode berjalan ke sisi liabilities."""
         pl = self._get_profit_loss_for_period(filters, company)
         if abs(pl['net_profit']) > 1e-6:
             is_profit = pl['net_profit'] > 0
@@ -444,9 +477,8 @@ class BalanceSheetReport(models.TransientModel):
                 'company_id': company.id,
                 'company_name': company.name,
             })
-
         return result
-    
+
     def _calculate_summary(self, bs_lines):
         """Summary: assets apa adanya; liabilities/equity sebagai (credit - debit)."""
         total_assets = sum(line['balance'] for line in bs_lines['assets'])
@@ -698,85 +730,21 @@ class BalanceSheetReport(models.TransientModel):
         """
         Export semua move lines dengan detail lengkap untuk validasi manual.
         Returns: list of dict dengan semua field penting per move line.
+        Untuk data besar gunakan route streaming /api/export/all_move_lines/stream.
         """
         _logger.info("=== EXPORT ALL MOVE LINES ===")
         
-        if company_id:
-            company = self.env['res.company'].browse(company_id)
-        else:
-            company = self.env.company
-        
-        # Build domain
-        domain = [
-            ('move_id.state', '=', 'posted'),
-            ('company_id', '=', company.id)
-        ]
-        
-        if date_from:
-            domain.append(('date', '>=', date_from))
-        if date_to:
-            domain.append(('date', '<=', date_to))
-        
-        # Filter by account type jika ada
-        if account_type:
-            if not isinstance(account_type, (list, tuple)):
-                account_type = [account_type]
-            accounts = self.env['account.account'].search([
-                ('account_type', 'in', account_type),
-                ('company_id', '=', company.id)
-            ])
-            domain.append(('account_id', 'in', accounts.ids))
-        
-        # Search move lines
-        aml = self.env['account.move.line']
-        move_lines = aml.search(domain, order='account_id, date, id')
-        
-        _logger.info(f"Found {len(move_lines)} move lines")
+        company = self._get_export_company(company_id)
         
+        if account_type and not isinstance(account_type, (list, tuple)):
+            account_type = [account_type]
+
         result = []
-        for line in move_lines:
-            # Determine account group (BS category)
-            acc_type = line.account_id.account_type
-            if 'asset' in acc_type:
-                group = 'ASSETS'
-            elif 'liability' in acc_type:
-                group = 'LIABILITIES'
-            elif 'equity' in acc_type:
-                group = 'EQUITY'
-            elif 'income' in acc_type:
-                group = 'INCOME'
-            elif 'expense' in acc_type:
-                group = 'EXPENSE'
-            else:
-                group = 'OTHER'
-            
-            # Get account group (parent)
-            account_group = line.account_id.group_id
-            
-            result.append({
-                'id': line.id,
-                'date': str(line.date),
-                'move_name': line.move_id.name,
-                'move_id': line.move_id.id,
-                'account_id': line.account_id.id,
-                'account_code': line.account_id.code,
-                'account_name': line.account_id.name,
-                'account_type': acc_type,
-                'account_group': group,
-                'account_group_id': account_group.id if account_group else False,
-                'account_group_name': account_group.name if account_group else '',
-                'account_group_code': account_group.code_prefix_start if account_group else '',
-                'partner_id': line.partner_id.id if line.partner_id else False,
-                'partner_name': line.partner_id.name if line.partner_id else '',
-                'label': line.name or '',
-                'debit': line.debit,
-                'credit': line.credit,
-                'balance': line.balance,
-                'analytic_distribution': line.analytic_distribution or {},
-                'company_id': company.id,
-                'company_name': company.name,
-                'currency': line.currency_id.name if line.currency_id else company.currency_id.name,
-            })
+        for batch in self.iter_move_line_export_batches(
+                date_from=date_from, date_to=date_to, company_id=company.id, account_type=account_type):
+            result.extend(batch)
+        
+        _logger.info(f"Found {len(result)} move lines")
         
         return {
             'status': 'success',
@@ -795,6 +763,125 @@ class BalanceSheetReport(models.TransientModel):
             'move_lines': result,
         }
 
+    @api.model
+    def _get_account_report_group(self, acc_type):
+        """Kategori laporan (ASSETS, LIABILITIES, ...) dari account_type."""
+        acc_type = acc_type or ''
+        if 'asset' in acc_type:
+            return 'ASSETS'
+        elif 'liability' in acc_type:
+            return 'LIABILITIES'
+        elif 'equity' in acc_type:
+            return 'EQUITY'
+        elif 'income' in acc_type:
+            return 'INCOME'
+        elif 'expense' in acc_type:
+            return 'EXPENSE'
+        return 'OTHER'
+
+    @api.model
+    def _get_export_company(self, company_id=False):
+        """Company yang diekspor; hanya company yang diizinkan untuk user ini."""
+        self.env['account.move.line'].check_access_rights('read')
+        company = self.env['res.company'].browse(int(company_id)) if company_id else self.env.company
+        if company not in self.env.companies:
+            raise AccessError(_("You are not allowed to export the journal items of company %s.", company.id))
+        return company
+
+    @api.model
+    def iter_move_line_export_batches(self, date_from=False, date_to=False, company_id=False,
+                                      account_type=False, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Generator batch move line (list of dict, urut account_id, date, id).
+        Tiap batch dibaca dengan keyset pagination sehingga memori tetap datar
+        berapa pun jumlah baris yang diekspor.
+        """
+        company = self._get_export_company(company_id)
+        aml = self.env['account.move.line']
+        aml.flush_model()
+        self.env['account.move'].flush_model(['name'])
+
+        where = [
+            "aml.parent_state = 'posted'",
+            "aml.company_id = %(company_id)s",
+        ]
+        # Record rule (multi-company, dll.) tetap berlaku seperti pada aml.search()
+        rule_query = aml._where_calc([])
+        aml._apply_ir_rules(rule_query, 'read')
+        rule_from, rule_where, rule_params = rule_query.get_sql()
+        if rule_where:
+            rule_sql = self.env.cr.mogrify(
+                'SELECT "account_move_line".id FROM %s WHERE %s' % (rule_from, rule_where), rule_params).decode()
+            where.append("aml.id IN (%s)" % rule_sql.replace('%', '%%'))
+        params = {'company_id': company.id, 'limit': int(batch_size)}
+        if date_from:
+            where.append("aml.date >= %(date_from)s")
+            params['date_from'] = date_from
+        if date_to:
+            where.append("aml.date <= %(date_to)s")
+            params['date_to'] = date_to
+        if account_type:
+            if not isinstance(account_type, (list, tuple)):
+                account_type = [account_type]
+            where.append("aa.account_type IN %(account_types)s")
+            params['account_types'] = tuple(account_type)
+
+        query = """
+            SELECT aml.id, aml.date, am.name AS move_name, aml.move_id,
+                   aml.account_id, aa.code AS account_code, aa.name AS account_name,
+                   aa.account_type, ag.id AS account_group_id, ag.name AS account_group_name,
+                   ag.code_prefix_start AS account_group_code,
+                   aml.partner_id, rp.name AS partner_name, aml.name AS label,
+                   aml.debit, aml.credit, aml.balance, aml.analytic_distribution,
+                   cur.name AS currency
+              FROM account_move_line aml
+              JOIN account_move am ON am.id = aml.move_id
+              JOIN account_account aa ON aa.id = aml.account_id
+         LEFT JOIN account_group ag ON ag.id = aa.group_id
+         LEFT JOIN res_partner rp ON rp.id = aml.partner_id
+         LEFT JOIN res_currency cur ON cur.id = aml.currency_id
+             WHERE {where}
+               {keyset}
+          ORDER BY aml.account_id, aml.date, aml.id
+             LIMIT %(limit)s
+        """
+        company_currency = company.currency_id.name
+        keyset = ''
+        while True:
+            self.env.cr.execute(query.format(where=' AND '.join(where), keyset=keyset), params)
+            rows = self.env.cr.dictfetchall()
+            if not rows:
+                break
+            yield [{
+                'id': row['id'],
+                'date': str(row['date']),
+                'move_name': row['move_name'],
+                'move_id': row['move_id'],
+                'account_id': row['account_id'],
+                'account_code': row['account_code'],
+                'account_name': row['account_name'],
+                'account_type': row['account_type'],
+                'account_group': self._get_account_report_group(row['account_type']),
+                'account_group_id': row['account_group_id'] or False,
+                'account_group_name': row['account_group_name'] or '',
+                'account_group_code': row['account_group_code'] or '',
+                'partner_id': row['partner_id'] or False,
+                'partner_name': row['partner_name'] or '',
+                'label': row['label'] or '',
+                'debit': float(row['debit']),
+                'credit': float(row['credit']),
+                'balance': float(row['balance']),
+                'analytic_distribution': row['analytic_distribution'] or {},
+                'company_id': company.id,
+                'company_name': company.name,
+                'currency': row['currency'] or company_currency,
+            } for row in rows]
+            if len(rows) < batch_size:
+                break
+            last = rows[-1]
+            params.update(last_account_id=last['account_id'], last_date=last['date'], last_id=last['id'])
+            keyset = "AND (aml.account_id, aml.date, aml.id) > (%(last_account_id)s, %(last_date)s, %(last_id)s)"
+
     @api.model
     def export_aggregated_by_account(self, date_from=False, date_to=False, company_id=False):
         """
@@ -1053,173 +1140,16 @@ class BalanceSheetReport(models.TransientModel):
             }
         }
 
-    @api.model
-    def asset_detail_group(self, date_from=False, date_to=False, company_id=False):
-        """
-        Export detail asset dengan grouping berdasarkan account_group_name.
-        DENGAN OPENING BALANCE: Hitung saldo sebelum date_from sebagai opening.
-        Tambahan: Detail transaksi opening (sebelum date_from) & transaksi periode (date_from..date_to) per account.
-        """
-        _logger.info("=== EXPORT ASSET DETAIL BY GROUP WITH OPENING & PERIOD TRANSACTIONS ===")
-        
-        if company_id:
-            company = self.env['res.company'].browse(company_id)
-        else:
-            company = self.env.company
-
-        aml = self.env['account.move.line']
-        asset_types = ['asset_receivable', 'asset_cash', 'asset_current',
-                       'asset_non_current', 'asset_prepayments', 'asset_fixed']
-
-        asset_accounts = self.env['account.account'].search([
-            ('account_type', 'in', asset_types),
-            ('company_id', '=', company.id)
-        ])
-        
-        grouped_data = {}
-        
-        for account in asset_accounts:
-            account_group = account.group_id
-            
-            # Group key
-            if account_group:
-                group_key = account_group.id
-                group_name = account_group.name
-                group_code = account_group.code_prefix_start or ''
-            else:
-                group_key = 0
-                group_name = 'Unassigned'
-                group_code = ''
-            
-            if group_key not in grouped_data:
-                grouped_data[group_key] = {
-                    'group_id': group_key,
-                    'group_name': group_name,
-                    'group_code': group_code,
-                    'opening_debit': 0.0,
-                    'opening_credit': 0.0,
-                    'opening_balance': 0.0,
-                    'period_debit': 0.0,
-                    'period_credit': 0.0,
-                    'period_balance': 0.0,
-                    'ending_debit': 0.0,
-                    'ending_credit': 0.0,
-                    'ending_balance': 0.0,
-                    'accounts': []
-                }
-            
-            # Opening balance (sebelum date_from)
-            opening_debit = opening_credit = opening_balance = 0.0
-            opening_transactions = []
-            if date_from:
-                domain_opening = [
-                    ('account_id', '=', account.id),
-                    ('move_id.state', '=', 'posted'),
-                    ('company_id', '=', company.id),
-                    ('date', '<', date_from)
-                ]
-                opening_lines = aml.search(domain_opening, order='date,id')
-                opening_debit = sum(opening_lines.mapped('debit'))
-                opening_credit = sum(opening_lines.mapped('credit'))
-                opening_balance = sum(opening_lines.mapped('balance'))
-                
-                # Detail transaksi opening
-                opening_transactions = [{
-                    'date': str(l.date),
-                    'move_name': l.move_id.name,
-                    'account_code': account.code,
-                    'account_name': account.name,
-                    'label': l.name or '',
-                    'partner': l.partner_id.name if l.partner_id else '',
-                    'debit': l.debit,
-                    'credit': l.credit,
-                    'balance': l.balance,
-                } for l in opening_lines]
-            
-            # Period movement (date_from..date_to)
-            domain_period = [
-                ('account_id', '=', account.id),
-                ('move_id.state', '=', 'posted'),
-                ('company_id', '=', company.id)
-            ]
-            if date_from:
-                domain_period.append(('date', '>=', date_from))
-            if date_to:
-                domain_period.append(('date', '<=', date_to))
-            
-            period_lines = aml.search(domain_period, order='date,id')
-            period_debit = sum(period_lines.mapped('debit'))
-            period_credit = sum(period_lines.mapped('credit'))
-            period_balance = sum(period_lines.mapped('balance'))
-            
-            # Ending = Opening + Period
-            ending_debit = opening_debit + period_debit
-            ending_credit = opening_credit + period_credit
-            ending_balance = opening_balance + period_balance
-            
-            # Detail transaksi periode
-            period_transactions = [{
-                'date': str(l.date),
-                'move_name': l.move_id.name,
-                'account_code': account.code,
-                'account_name': account.name,
-                'label': l.name or '',
-                'partner': l.partner_id.name if l.partner_id else '',
-                'debit': l.debit,
-                'credit': l.credit,
-                'balance': l.balance,
-            } for l in period_lines]
-            
-            if ending_balance != 0 or opening_balance != 0 or period_lines or opening_transactions:
-                account_data = {
-                    'account_id': account.id,
-                    'account_code': account.code,
-                    'account_name': account.name,
-                    'account_type': account.account_type,
-                    # Opening
-                    'opening_debit': opening_debit,
-                    'opening_credit': opening_credit,
-                    'opening_balance': opening_balance,
-                    'opening_transactions': opening_transactions,
-                    'opening_transaction_count': len(opening_transactions),
-                    # Period
-                    'period_debit': period_debit,
-                    'period_credit': period_credit,
-                    'period_balance': period_balance,
-                    'period_transactions': period_transactions,
-                    'period_transaction_count': len(period_transactions),
-                    # Ending
-                    'ending_debit': ending_debit,
-                    'ending_credit': ending_credit,
-                    'ending_balance': ending_balance,
-                }
-                grouped_data[group_key]['accounts'].append(account_data)
-                
-                grouped_data[group_key]['opening_debit'] += opening_debit
-                grouped_data[group_key]['opening_credit'] += opening_credit
-                grouped_data[group_key]['opening_balance'] += opening_balance
-                grouped_data[group_key]['period_debit'] += period_debit
-                grouped_data[group_key]['period_credit'] += period_credit
-                grouped_data[group_key]['period_balance'] += period_balance
-                grouped_data[group_key]['ending_debit'] += ending_debit
-                grouped_data[group_key]['ending_credit'] += ending_credit
-                grouped_data[group_key]['ending_balance'] += ending_balance
-        
-        groups_list = [g for g in grouped_data.values() if g['accounts']]
-        groups_list.sort(key=lambda x: (x['group_code'], x['group_name']))
-        
-        grand_total = {
-            'opening_debit': sum(g['opening_debit'] for g in groups_list),
-            'opening_credit': sum(g['opening_credit'] for g in groups_list),
-            'opening_balance': sum(g['opening_balance'] for g in groups_list),
-            'period_debit': sum(g['period_debit'] for g in groups_list),
-            'period_credit': sum(g['period_credit'] for g in groups_list),
-            'period_balance': sum(g['period_balance'] for g in groups_list),
-            'ending_debit': sum(g['ending_debit'] for g in groups_list),
-            'ending_credit': sum(g['ending_credit'] for g in groups_list),
-            'ending_balance': sum(g['ending_balance'] for g in groups_list),
-        }
-        
+    def _get_detail_group_payload(self, company, account_types, date_from=False, date_to=False,
+                                  include_transactions=False, transaction_limit=DEFAULT_TRANSACTION_LIMIT,
+                                  transaction_offset=0):
+        """Payload standar endpoint detail group (groups + grand_total) dari account.ledger.aggregate."""
+        groups_list, grand_total = self.env['account.ledger.aggregate'].get_grouped_totals(
+            company, account_types, date_from=date_from, date_to=date_to,
+            include_transactions=include_transactions,
+            transaction_limit=transaction_limit,
+            transaction_offset=transaction_offset,
+        )
         return {
             'status': 'success',
             'company': {
@@ -1230,530 +1160,106 @@ class BalanceSheetReport(models.TransientModel):
             'filters': {
                 'date_from': date_from,
                 'date_to': date_to,
+                'include_transactions': bool(include_transactions),
+                'transaction_limit': transaction_limit if include_transactions else 0,
+                'transaction_offset': transaction_offset if include_transactions else 0,
             },
             'total_groups': len(groups_list),
             'groups': groups_list,
             'grand_total': grand_total,
         }
+
     @api.model
-    def asset_Liability_group(self, date_from=False, date_to=False, company_id=False):
+    def asset_detail_group(self, date_from=False, date_to=False, company_id=False,
+                           include_transactions=False, transaction_limit=DEFAULT_TRANSACTION_LIMIT,
+                           transaction_offset=0):
         """
         Export detail asset dengan grouping berdasarkan account_group_name.
         DENGAN OPENING BALANCE: Hitung saldo sebelum date_from sebagai opening.
-        Tambahan: Detail transaksi opening (sebelum date_from) & transaksi periode (date_from..date_to) per account.
+        Detail transaksi opening & periode per account hanya jika include_transactions=True,
+        dibatasi transaction_limit/transaction_offset per account.
         """
         _logger.info("=== EXPORT ASSET DETAIL BY GROUP WITH OPENING & PERIOD TRANSACTIONS ===")
-        
-        if company_id:
-            company = self.env['res.company'].browse(company_id)
-        else:
-            company = self.env.company
+        company = self.env['res.company'].browse(company_id) if company_id else self.env.company
+        asset_types = ['asset_receivable', 'asset_cash', 'asset_current',
+                       'asset_non_current', 'asset_prepayments', 'asset_fixed']
+        return self._get_detail_group_payload(
+            company, asset_types, date_from=date_from, date_to=date_to,
+            include_transactions=include_transactions,
+            transaction_limit=transaction_limit,
+            transaction_offset=transaction_offset,
+        )
 
-        aml = self.env['account.move.line']
+    @api.model
+    def asset_Liability_group(self, date_from=False, date_to=False, company_id=False,
+                              include_transactions=False, transaction_limit=DEFAULT_TRANSACTION_LIMIT,
+                              transaction_offset=0):
+        """
+        Export detail liability dengan grouping berdasarkan account_group_name.
+        DENGAN OPENING BALANCE: Hitung saldo sebelum date_from sebagai opening.
+        Detail transaksi opening & periode per account hanya jika include_transactions=True,
+        dibatasi transaction_limit/transaction_offset per account.
+        """
+        _logger.info("=== EXPORT LIABILITY DETAIL BY GROUP WITH OPENING & PERIOD TRANSACTIONS ===")
+        company = self.env['res.company'].browse(company_id) if company_id else self.env.company
         liability_types = ['liability_payable', 'liability_credit_card',
                            'liability_current', 'liability_non_current']
+        return self._get_detail_group_payload(
+            company, liability_types, date_from=date_from, date_to=date_to,
+            include_transactions=include_transactions,
+            transaction_limit=transaction_limit,
+            transaction_offset=transaction_offset,
+        )
 
-        liability_accounts = self.env['account.account'].search([
-            ('account_type', 'in', liability_types),
-            ('company_id', '=', company.id)
-        ])
-        
-        grouped_data = {}
-        
-        for account in liability_accounts:
-            account_group = account.group_id
-            
-            # Group key
-            if account_group:
-                group_key = account_group.id
-                group_name = account_group.name
-                group_code = account_group.code_prefix_start or ''
-            else:
-                group_key = 0
-                group_name = 'Unassigned'
-                group_code = ''
-            
-            if group_key not in grouped_data:
-                grouped_data[group_key] = {
-                    'group_id': group_key,
-                    'group_name': group_name,
-                    'group_code': group_code,
-                    'opening_debit': 0.0,
-                    'opening_credit': 0.0,
-                    'opening_balance': 0.0,
-                    'period_debit': 0.0,
-                    'period_credit': 0.0,
-                    'period_balance': 0.0,
-                    'ending_debit': 0.0,
-                    'ending_credit': 0.0,
-                    'ending_balance': 0.0,
-                    'accounts': []
-                }
-            
-            # Opening balance (sebelum date_from)
-            opening_debit = opening_credit = opening_balance = 0.0
-            opening_transactions = []
-            if date_from:
-                domain_opening = [
-                    ('account_id', '=', account.id),
-                    ('move_id.state', '=', 'posted'),
-                    ('company_id', '=', company.id),
-                    ('date', '<', date_from)
-                ]
-                opening_lines = aml.search(domain_opening, order='date,id')
-                opening_debit = sum(opening_lines.mapped('debit'))
-                opening_credit = sum(opening_lines.mapped('credit'))
-                opening_balance = sum(opening_lines.mapped('balance'))
-                
-                # Detail transaksi opening
-                opening_transactions = [{
-                    'date': str(l.date),
-                    'move_name': l.move_id.name,
-                    'account_code': account.code,
-                    'account_name': account.name,
-                    'label': l.name or '',
-                    'partner': l.partner_id.name if l.partner_id else '',
-                    'debit': l.debit,
-                    'credit': l.credit,
-                    'balance': l.balance,
-                } for l in opening_lines]
-            
-            # Period movement (date_from..date_to)
-            domain_period = [
-                ('account_id', '=', account.id),
-                ('move_id.state', '=', 'posted'),
-                ('company_id', '=', company.id)
-            ]
-            if date_from:
-                domain_period.append(('date', '>=', date_from))
-            if date_to:
-                domain_period.append(('date', '<=', date_to))
-            
-            period_lines = aml.search(domain_period, order='date,id')
-            period_debit = sum(period_lines.mapped('debit'))
-            period_credit = sum(period_lines.mapped('credit'))
-            period_balance = sum(period_lines.mapped('balance'))
-            
-            # Ending = Opening + Period
-            ending_debit = opening_debit + period_debit
-            ending_credit = opening_credit + period_credit
-            ending_balance = opening_balance + period_balance
-            
-            # Detail transaksi periode
-            period_transactions = [{
-                'date': str(l.date),
-                'move_name': l.move_id.name,
-                'account_code': account.code,
-                'account_name': account.name,
-                'label': l.name or '',
-                'partner': l.partner_id.name if l.partner_id else '',
-                'debit': l.debit,
-                'credit': l.credit,
-                'balance': l.balance,
-            } for l in period_lines]
-            
-            if ending_balance != 0 or opening_balance != 0 or period_lines or opening_transactions:
-                account_data = {
-                    'account_id': account.id,
-                    'account_code': account.code,
-                    'account_name': account.name,
-                    'account_type': account.account_type,
-                    # Opening
-                    'opening_debit': opening_debit,
-                    'opening_credit': opening_credit,
-                    'opening_balance': opening_balance,
-                    'opening_transactions': opening_transactions,
-                    'opening_transaction_count': len(opening_transactions),
-                    # Period
-                    'period_debit': period_debit,
-                    'period_credit': period_credit,
-                    'period_balance': period_balance,
-                    'period_transactions': period_transactions,
-                    'period_transaction_count': len(period_transactions),
-                    # Ending
-                    'ending_debit': ending_debit,
-                    'ending_credit': ending_credit,
-                    'ending_balance': ending_balance,
-                }
-                grouped_data[group_key]['accounts'].append(account_data)
-                
-                grouped_data[group_key]['opening_debit'] += opening_debit
-                grouped_data[group_key]['opening_credit'] += opening_credit
-                grouped_data[group_key]['opening_balance'] += opening_balance
-                grouped_data[group_key]['period_debit'] += period_debit
-                grouped_data[group_key]['period_credit'] += period_credit
-                grouped_data[group_key]['period_balance'] += period_balance
-                grouped_data[group_key]['ending_debit'] += ending_debit
-                grouped_data[group_key]['ending_credit'] += ending_credit
-                grouped_data[group_key]['ending_balance'] += ending_balance
-        
-        groups_list = [g for g in grouped_data.values() if g['accounts']]
-        groups_list.sort(key=lambda x: (x['group_code'], x['group_name']))
-        
-        grand_total = {
-            'opening_debit': sum(g['opening_debit'] for g in groups_list),
-            'opening_credit': sum(g['opening_credit'] for g in groups_list),
-            'opening_balance': sum(g['opening_balance'] for g in groups_list),
-            'period_debit': sum(g['period_debit'] for g in groups_list),
-            'period_credit': sum(g['period_credit'] for g in groups_list),
-            'period_balance': sum(g['period_balance'] for g in groups_list),
-            'ending_debit': sum(g['ending_debit'] for g in groups_list),
-            'ending_credit': sum(g['ending_credit'] for g in groups_list),
-            'ending_balance': sum(g['ending_balance'] for g in groups_list),
-        }
-        
-        return {
-            'status': 'success',
-            'company': {
-                'id': company.id,
-                'name': company.name,
-                'currency': company.currency_id.name,
-            },
-            'filters': {
-                'date_from': date_from,
-                'date_to': date_to,
-            },
-            'total_groups': len(groups_list),
-            'groups': groups_list,
-            'grand_total': grand_total,
-        }
     @api.model
-    def equity_detail_group(self, date_from=False, date_to=False, company_id=False):
+    def equity_detail_group(self, date_from=False, date_to=False, company_id=False,
+                            include_transactions=False, transaction_limit=DEFAULT_TRANSACTION_LIMIT,
+                            transaction_offset=0):
         """
-        Export detail asset dengan grouping berdasarkan account_group_name.
+        Export detail equity dengan grouping berdasarkan account_group_name.
         DENGAN OPENING BALANCE: Hitung saldo sebelum date_from sebagai opening.
-        Tambahan: Detail transaksi opening (sebelum date_from) & transaksi periode (date_from..date_to) per account.
+        Detail transaksi opening & periode per account hanya jika include_transactions=True,
+        dibatasi transaction_limit/transaction_offset per account.
         """
-        _logger.info("=== EXPORT ASSET DETAIL BY GROUP WITH OPENING & PERIOD TRANSACTIONS ===")
-        
-        if company_id:
-            company = self.env['res.company'].browse(company_id)
-        else:
-            company = self.env.company
-
-        aml = self.env['account.move.line']
+        _logger.info("=== EXPORT EQUITY DETAIL BY GROUP WITH OPENING & PERIOD TRANSACTIONS ===")
+        company = self.env['res.company'].browse(company_id) if company_id else self.env.company
         equity_types = ['equity']
+        return self._get_detail_group_payload(
+            company, equity_types, date_from=date_from, date_to=date_to,
+            include_transactions=include_transactions,
+            transaction_limit=transaction_limit,
+            transaction_offset=transaction_offset,
+        )
 
-        equity_accounts = self.env['account.account'].search([
-            ('account_type', 'in', equity_types),
-            ('company_id', '=', company.id)
-        ])
-        
-        grouped_data = {}
-        
-        for account in equity_accounts:
-            account_group = account.group_id
-            
-            # Group key
-            if account_group:
-                group_key = account_group.id
-                group_name = account_group.name
-                group_code = account_group.code_prefix_start or ''
-            else:
-                group_key = 0
-                group_name = 'Unassigned'
-                group_code = ''
-            
-            if group_key not in grouped_data:
-                grouped_data[group_key] = {
-                    'group_id': group_key,
-                    'group_name': group_name,
-                    'group_code': group_code,
-                    'opening_debit': 0.0,
-                    'opening_credit': 0.0,
-                    'opening_balance': 0.0,
-                    'period_debit': 0.0,
-                    'period_credit': 0.0,
-                    'period_balance': 0.0,
-                    'ending_debit': 0.0,
-                    'ending_credit': 0.0,
-                    'ending_balance': 0.0,
-                    'accounts': []
-                }
-            
-            # Opening balance (sebelum date_from)
-            opening_debit = opening_credit = opening_balance = 0.0
-            opening_transactions = []
-            if date_from:
-                domain_opening = [
-                    ('account_id', '=', account.id),
-                    ('move_id.state', '=', 'posted'),
-                    ('company_id', '=', company.id),
-                    ('date', '<', date_from)
-                ]
-                opening_lines = aml.search(domain_opening, order='date,id')
-                opening_debit = sum(opening_lines.mapped('debit'))
-                opening_credit = sum(opening_lines.mapped('credit'))
-                opening_balance = sum(opening_lines.mapped('balance'))
-                
-                # Detail transaksi opening
-                opening_transactions = [{
-                    'date': str(l.date),
-                    'move_name': l.move_id.name,
-                    'account_code': account.code,
-                    'account_name': account.name,
-                    'label': l.name or '',
-                    'partner': l.partner_id.name if l.partner_id else '',
-                    'debit': l.debit,
-                    'credit': l.credit,
-                    'balance': l.balance,
-                } for l in opening_lines]
-            
-            # Period movement (date_from..date_to)
-            domain_period = [
-                ('account_id', '=', account.id),
-                ('move_id.state', '=', 'posted'),
-                ('company_id', '=', company.id)
-            ]
-            if date_from:
-                domain_period.append(('date', '>=', date_from))
-            if date_to:
-                domain_period.append(('date', '<=', date_to))
-            
-            period_lines = aml.search(domain_period, order='date,id')
-            period_debit = sum(period_lines.mapped('debit'))
-            period_credit = sum(period_lines.mapped('credit'))
-            period_balance = sum(period_lines.mapped('balance'))
-            
-            # Ending = Opening + Period
-            ending_debit = opening_debit + period_debit
-            ending_credit = opening_credit + period_credit
-            ending_balance = opening_balance + period_balance
-            
-            # Detail transaksi periode
-            period_transactions = [{
-                'date': str(l.date),
-                'move_name': l.move_id.name,
-                'account_code': account.code,
-                'account_name': account.name,
-                'label': l.name or '',
-                'partner': l.partner_id.name if l.partner_id else '',
-                'debit': l.debit,
-                'credit': l.credit,
-                'balance': l.balance,
-            } for l in period_lines]
-            
-            if ending_balance != 0 or opening_balance != 0 or period_lines or opening_transactions:
-                account_data = {
-                    'account_id': account.id,
-                    'account_code': account.code,
-                    'account_name': account.name,
-                    'account_type': account.account_type,
-                    # Opening
-                    'opening_debit': opening_debit,
-                    'opening_credit': opening_credit,
-                    'opening_balance': opening_balance,
-                    'opening_transactions': opening_transactions,
-                    'opening_transaction_count': len(opening_transactions),
-                    # Period
-                    'period_debit': period_debit,
-                    'period_credit': period_credit,
-                    'period_balance': period_balance,
-                    'period_transactions': period_transactions,
-                    'period_transaction_count': len(period_transactions),
-                    # Ending
-                    'ending_debit': ending_debit,
-                    'ending_credit': ending_credit,
-                    'ending_balance': ending_balance,
-                }
-                grouped_data[group_key]['accounts'].append(account_data)
-                
-                grouped_data[group_key]['opening_debit'] += opening_debit
-                grouped_data[group_key]['opening_credit'] += opening_credit
-                grouped_data[group_key]['opening_balance'] += opening_balance
-                grouped_data[group_key]['period_debit'] += period_debit
-                grouped_data[group_key]['period_credit'] += period_credit
-                grouped_data[group_key]['period_balance'] += period_balance
-                grouped_data[group_key]['ending_debit'] += ending_debit
-                grouped_data[group_key]['ending_credit'] += ending_credit
-                grouped_data[group_key]['ending_balance'] += ending_balance
-        
-        groups_list = [g for g in grouped_data.values() if g['accounts']]
-        groups_list.sort(key=lambda x: (x['group_code'], x['group_name']))
-        
-        grand_total = {
-            'opening_debit': sum(g['opening_debit'] for g in groups_list),
-            'opening_credit': sum(g['opening_credit'] for g in groups_list),
-            'opening_balance': sum(g['opening_balance'] for g in groups_list),
-            'period_debit': sum(g['period_debit'] for g in groups_list),
-            'period_credit': sum(g['period_credit'] for g in groups_list),
-            'period_balance': sum(g['period_balance'] for g in groups_list),
-            'ending_debit': sum(g['ending_debit'] for g in groups_list),
-            'ending_credit': sum(g['ending_credit'] for g in groups_list),
-            'ending_balance': sum(g['ending_balance'] for g in groups_list),
-        }
-        
-        return {
-            'status': 'success',
-            'company': {
-                'id': company.id,
-                'name': company.name,
-                'currency': company.currency_id.name,
-            },
-            'filters': {
-                'date_from': date_from,
-                'date_to': date_to,
-            },
-            'total_groups': len(groups_list),
-            'groups': groups_list,
-            'grand_total': grand_total,
-        }
     @api.model
-    def profit_loss_detail_group(self, date_from=False, date_to=False, company_id=False):
+    def profit_loss_detail_group(self, date_from=False, date_to=False, company_id=False,
+                                 include_transactions=False, transaction_limit=DEFAULT_TRANSACTION_LIMIT,
+                                 transaction_offset=0):
         """
         Profit & Loss grouped by parent account_group_name.
         - Opening: transaksi sebelum date_from (opsional jika date_from ada)
         - Period: transaksi date_from..date_to
         - Ending: opening + period (untuk tampilan kumulatif)
         - Net Profit: income_net + expense_net (expense_net negatif)
+        Detail transaksi hanya jika include_transactions=True (limit/offset per account).
         """
         _logger.info("=== EXPORT PROFIT & LOSS BY GROUP WITH OPENING & PERIOD TRANSACTIONS ===")
 
         company = self.env['res.company'].browse(company_id) if company_id else self.env.company
-        aml = self.env['account.move.line']
+        aggregate = self.env['account.ledger.aggregate']
 
         income_types = ['income', 'income_other']
         expense_types = ['expense', 'expense_depreciation', 'expense_direct_cost']
 
-        account_model = self.env['account.account']
-        income_accounts = account_model.search([
-            ('account_type', 'in', income_types),
-            ('company_id', '=', company.id)
-        ])
-        expense_accounts = account_model.search([
-            ('account_type', 'in', expense_types),
-            ('company_id', '=', company.id)
-        ])
-
-        def build_grouped(accounts):
-            grouped = {}
-            for account in accounts:
-                ag = account.group_id
-                group_key = ag.id if ag else 0
-                group_name = ag.name if ag else 'Unassigned'
-                group_code = ag.code_prefix_start if ag and ag.code_prefix_start else ''
-
-                if group_key not in grouped:
-                    grouped[group_key] = {
-                        'group_id': group_key,
-                        'group_name': group_name,
-                        'group_code': group_code,
-                        'opening_debit': 0.0,
-                        'opening_credit': 0.0,
-                        'opening_balance': 0.0,
-                        'period_debit': 0.0,
-                        'period_credit': 0.0,
-                        'period_balance': 0.0,
-                        'ending_debit': 0.0,
-                        'ending_credit': 0.0,
-                        'ending_balance': 0.0,
-                        'accounts': []
-                    }
-
-                # Opening (sebelum date_from)
-                opening_debit = opening_credit = opening_balance = 0.0
-                opening_transactions = []
-                if date_from:
-                    domain_opening = [
-                        ('account_id', '=', account.id),
-                        ('move_id.state', '=', 'posted'),
-                        ('company_id', '=', company.id),
-                        ('date', '<', date_from),
-                    ]
-                    opening_lines = aml.search(domain_opening, order='date,id')
-                    opening_debit = sum(opening_lines.mapped('debit'))
-                    opening_credit = sum(opening_lines.mapped('credit'))
-                    opening_balance = sum(opening_lines.mapped('balance'))
-                    opening_transactions = [{
-                        'date': str(l.date),
-                        'move_name': l.move_id.name,
-                        'account_code': account.code,
-                        'account_name': account.name,
-                        'label': l.name or '',
-                        'partner': l.partner_id.name if l.partner_id else '',
-                        'debit': l.debit,
-                        'credit': l.credit,
-                        'balance': l.balance,
-                    } for l in opening_lines]
-
-                # Period (date_from..date_to)
-                domain_period = [
-                    ('account_id', '=', account.id),
-                    ('move_id.state', '=', 'posted'),
-                    ('company_id', '=', company.id)
-                ]
-                if date_from:
-                    domain_period.append(('date', '>=', date_from))
-                if date_to:
-                    domain_period.append(('date', '<=', date_to))
-
-                period_lines = aml.search(domain_period, order='date,id')
-                period_debit = sum(period_lines.mapped('debit'))
-                period_credit = sum(period_lines.mapped('credit'))
-                period_balance = sum(period_lines.mapped('balance'))
-
-                # Ending kumulatif
-                ending_debit = opening_debit + period_debit
-                ending_credit = opening_credit + period_credit
-                ending_balance = opening_balance + period_balance
-
-                period_transactions = [{
-                    'date': str(l.date),
-                    'move_name': l.move_id.name,
-                    'account_code': account.code,
-                    'account_name': account.name,
-                    'label': l.name or '',
-                    'partner': l.partner_id.name if l.partner_id else '',
-                    'debit': l.debit,
-                    'credit': l.credit,
-                    'balance': l.balance,
-                } for l in period_lines]
-
-                if opening_transactions or period_transactions or ending_balance or opening_balance:
-                    grouped[group_key]['accounts'].append({
-                        'account_id': account.id,
-                        'account_code': account.code,
-                        'account_name': account.name,
-                        'account_type': account.account_type,
-                        # Opening
-                        'opening_debit': opening_debit,
-                        'opening_credit': opening_credit,
-                        'opening_balance': opening_balance,
-                        'opening_transactions': opening_transactions,
-                        'opening_transaction_count': len(opening_transactions),
-                        # Period
-                        'period_debit': period_debit,
-                        'period_credit': period_credit,
-                        'period_balance': period_balance,
-                        'period_transactions': period_transactions,
-                        'period_transaction_count': len(period_transactions),
-                        # Ending
-                        'ending_debit': ending_debit,
-                        'ending_credit': ending_credit,
-                        'ending_balance': ending_balance,
-                        # Net period (credit - debit)
-                        'period_net': period_credit - period_debit,
-                    })
-
-                    g = grouped[group_key]
-                    g['opening_debit'] += opening_debit
-                    g['opening_credit'] += opening_credit
-                    g['opening_balance'] += opening_balance
-                    g['period_debit'] += period_debit
-                    g['period_credit'] += period_credit
-                    g['period_balance'] += period_balance
-                    g['ending_debit'] += ending_debit
-                    g['ending_credit'] += ending_credit
-                    g['ending_balance'] += ending_balance
-
-            # Kembalikan list terurut
-            groups_list = [g for g in grouped.values() if g['accounts']]
-            groups_list.sort(key=lambda x: (x['group_code'], x['group_name']))
-            return groups_list
-
         # Bangun grup Income dan Expense
-        income_groups = build_grouped(income_accounts)
-        expense_groups = build_grouped(expense_accounts)
+        income_groups, _income_total = aggregate.get_grouped_totals(
+            company, income_types, date_from=date_from, date_to=date_to,
+            include_transactions=include_transactions, transaction_limit=transaction_limit,
+            transaction_offset=transaction_offset, with_period_net=True)
+        expense_groups, _expense_total = aggregate.get_grouped_totals(
+            company, expense_types, date_from=date_from, date_to=date_to,
+            include_transactions=include_transactions, transaction_limit=transaction_limit,
+            transaction_offset=transaction_offset, with_period_net=True)
 
         # Totals period dan Net Profit (rumus BENAR)
         total_income_debit = sum(g['period_debit'] for g in income_groups)
@@ -1778,6 +1284,9 @@ class BalanceSheetReport(models.TransientModel):
             'filters': {
                 'date_from': date_from,
                 'date_to': date_to,
+                'include_transactions': bool(include_transactions),
+                'transaction_limit': transaction_limit if include_transactions else 0,
+                'transaction_offset': transaction_offset if include_transactions else 0,
             },
             'income': {
                 'groups': income_groups,
@@ -1799,7 +1308,9 @@ class BalanceSheetReport(models.TransientModel):
         }
     
     @api.model
-    def financial_report_combined(self, date_from=False, date_to=False, company_id=False):
+    def financial_report_combined(self, date_from=False, date_to=False, company_id=False,
+                                  include_transactions=False, transaction_limit=DEFAULT_TRANSACTION_LIMIT,
+                                  transaction_offset=0):
         """
         Gabungan: Asset, Liability, Profit & Loss, dan Equity dalam satu payload.
         Menggunakan fungsi yang sudah ada: asset_detail_group, asset_Liability_group, profit_loss_detail_group, equity_detail_group.
@@ -1807,12 +1318,17 @@ class BalanceSheetReport(models.TransientModel):
         """
         _logger.info("=== EXPORT FINANCIAL REPORT COMBINED ===")
         company = self.env['res.company'].browse(company_id) if company_id else self.env.company
+        detail_options = {
+            'include_transactions': include_transactions,
+            'transaction_limit': transaction_limit,
+            'transaction_offset': transaction_offset,
+        }
 
         # Ambil masing-masing bagian
-        assets = self.asset_detail_group(date_from=date_from, date_to=date_to, company_id=company.id)
-        liabilities = self.asset_Liability_group(date_from=date_from, date_to=date_to, company_id=company.id)
-        equity = self.equity_detail_group(date_from=date_from, date_to=date_to, company_id=company.id)
-        pl = self.profit_loss_detail_group(date_from=date_from, date_to=date_to, company_id=company.id)
+        assets = self.asset_detail_group(date_from=date_from, date_to=date_to, company_id=company.id, **detail_options)
+        liabilities = self.asset_Liability_group(date_from=date_from, date_to=date_to, company_id=company.id, **detail_options)
+        equity = self.equity_detail_group(date_from=date_from, date_to=date_to, company_id=company.id, **detail_options)
+        pl = self.profit_loss_detail_group(date_from=date_from, date_to=date_to, company_id=company.id, **detail_options)
 
         # Ringkasan totals
         totals = {
@@ -1942,7 +1458,8 @@ class BalanceSheetReport(models.TransientModel):
         return result
 
     @api.model
-    def financial_report_combined_multi_company(self, company_ids, date_from=False, date_to=False):
+    def financial_report_combined_multi_company(self, company_ids, date_from=False, date_to=False,
+                                                parallel=False, max_workers=None):
         """
         Panggil financial_report_combined berulang untuk banyak company_id.
         Tidak ada konsolidasi, hanya kumpulkan semua hasil dalam satu payload.
@@ -1950,6 +1467,8 @@ class BalanceSheetReport(models.TransientModel):
         Params:
           - company_ids: int | list[int]
           - date_from, date_to: optional (YYYY-MM-DD)
+          - parallel: bool, hitung per company di worker pool (lihat _run_per_company)
+          - max_workers: int, batas worker pool (default param sistem)
 
         Return:
           {
@@ -1959,7 +1478,8 @@ class BalanceSheetReport(models.TransientModel):
             'per_company': [
               {
                 'company': {'id': .., 'name': ..},
-                'report': <FULL hasil financial_report_combined>
+                'report': <FULL hasil financial_report_combined>,
+                'elapsed_ms': ..
               },
               ...
             ]
@@ -1975,39 +1495,11 @@ class BalanceSheetReport(models.TransientModel):
         if not companies:
             return {'status': 'error', 'message': 'No valid companies found'}
 
-        results = []
-        for company in companies:
-            try:
-                rep = self.with_company(company).with_context(
-                    company_id=company.id,
-                    company_ids=[company.id],
-                    allowed_company_ids=[company.id],
-                    force_company=company.id,
-                ).sudo()
-                data = rep.financial_report_combined(
-                    date_from=date_from,
-                    date_to=date_to,
-                    company_id=company.id
-                )
-                if data.get('status') != 'success':
-                    results.append({
-                        'company': {'id': company.id, 'name': company.name},
-                        'status': 'error',
-                        'error': data.get('message', 'Unknown error')
-                    })
-                else:
-                    results.append({
-                        'company': {'id': company.id, 'name': company.name},
-                        'status': 'success',
-                        'report': data  # FULL hasil seperti financial_report_combined
-                    })
-            except Exception as e:
-                _logger.error(f"multi_company loop error @ {company.name}: {e}", exc_info=True)
-                results.append({
-                    'company': {'id': company.id, 'name': company.name},
-                    'status': 'error',
-                    'error': str(e)
-                })
+        results, execution = self._run_per_company(
+            companies, '_get_company_combined_entry',
+            parallel=parallel, max_workers=max_workers,
+            date_from=date_from, date_to=date_to,
+        )
 
         return {
             'status': 'success',
@@ -2017,14 +1509,44 @@ class BalanceSheetReport(models.TransientModel):
                 'company_ids': [c.id for c in companies],
             },
             'total_companies': len(companies),
+            'execution': execution,
             'per_company': results
         }
+
+    @api.model
+    def _get_company_combined_entry(self, company_id, date_from=False, date_to=False):
+        """Satu entry financial_report_combined_multi_company untuk satu company."""
+        company = self.env['res.company'].browse(company_id)
+        rep = self.with_company(company).with_context(
+            company_id=company.id,
+            company_ids=[company.id],
+            allowed_company_ids=[company.id],
+            force_company=company.id,
+        ).sudo()
+        data = rep.financial_report_combined(
+            date_from=date_from,
+            date_to=date_to,
+            company_id=company.id
+        )
+        if data.get('status') != 'success':
+            return {
+                'company': {'id': company.id, 'name': company.name},
+                'status': 'error',
+                'error': data.get('message', 'Unknown error')
+            }
+        return {
+            'company': {'id': company.id, 'name': company.name},
+            'status': 'success',
+            'report': data  # FULL hasil seperti financial_report_combined
+        }
     @api.model
     def financial_report_with_elimination(self, date_from=False, date_to=False, company_ids=False,
-                                          elimination_account_codes=False, elimination_account_ids=False):
+                                          elimination_account_codes=False, elimination_account_ids=False,
+                                          parallel=False, max_workers=None):
         """
         Balance sheet multi-company dengan eliminasi akun berdasarkan ACCOUNT CODE.
         Tetap mendukung elimination_account_ids (backward compatible) → diubah ke code.
+        parallel=True: tiap company dihitung di worker pool terbatas (lihat _run_per_company).
         """
         # Normalisasi company_ids
         if isinstance(company_ids, int):
@@ -2068,131 +1590,131 @@ class BalanceSheetReport(models.TransientModel):
 
         _logger.info(f"financial_report_with_elimination: companies={len(companies)}, elim_codes={sorted(list(elim_codes))}")
 
-        # Eliminasi per group by account_code
-        def eliminate_accounts_from_groups(groups):
-            new_groups = []
-            for grp in groups:
-                new_grp = dict(grp)
-                # reset agregat, lalu hitung ulang
-                new_grp['opening_debit'] = 0.0
-                new_grp['opening_credit'] = 0.0
-                new_grp['opening_balance'] = 0.0
-                new_grp['period_debit'] = 0.0
-                new_grp['period_credit'] = 0.0
-                new_grp['period_balance'] = 0.0
-                new_grp['ending_debit'] = 0.0
-                new_grp['ending_credit'] = 0.0
-                new_grp['ending_balance'] = 0.0
-
-                new_accounts = []
-                for acc in grp.get('accounts', []):
-                    new_acc = dict(acc)
-                    acc_code = acc.get('account_code') or ''
-                    if acc_code in elim_codes:
-                        # nol-kan semua nilai
-                        new_acc['opening_debit'] = 0.0
-                        new_acc['opening_credit'] = 0.0
-                        new_acc['opening_balance'] = 0.0
-                        new_acc['period_debit'] = 0.0
-                        new_acc['period_credit'] = 0.0
-                        new_acc['period_balance'] = 0.0
-                        new_acc['ending_debit'] = 0.0
-                        new_acc['ending_credit'] = 0.0
-                        new_acc['ending_balance'] = 0.0
-                        new_acc['opening_transactions'] = []
-                        new_acc['opening_transaction_count'] = 0
-                        new_acc['period_transactions'] = []
-                        new_acc['period_transaction_count'] = 0
-
-                    # akumulasi ulang ke group
-                    new_grp['opening_debit'] += new_acc.get('opening_debit', 0.0)
-                    new_grp['opening_credit'] += new_acc.get('opening_credit', 0.0)
-                    new_grp['opening_balance'] += new_acc.get('opening_balance', 0.0)
-                    new_grp['period_debit'] += new_acc.get('period_debit', 0.0)
-                    new_grp['period_credit'] += new_acc.get('period_credit', 0.0)
-                    new_grp['period_balance'] += new_acc.get('period_balance', 0.0)
-                    new_grp['ending_debit'] += new_acc.get('ending_debit', 0.0)
-                    new_grp['ending_credit'] += new_acc.get('ending_credit', 0.0)
-                    new_grp['ending_balance'] += new_acc.get('ending_balance', 0.0)
-                    new_accounts.append(new_acc)
-
-                new_grp['accounts'] = new_accounts
-                new_groups.append(new_grp)
-            return new_groups
-
-        results = []
-        for company in companies:
-            try:
-                rep = self.with_company(company).with_context(
-                    company_id=company.id,
-                    company_ids=[company.id],
-                    allowed_company_ids=[company.id],
-                    force_company=company.id,
-                ).sudo()
-                data = rep.financial_report_combined(date_from=date_from, date_to=date_to, company_id=company.id)
-                if data.get('status') != 'success':
-                    results.append({'company': {'id': company.id, 'name': company.name}, 'status': 'error', 'error': data.get('message', 'Unknown error')})
-                    continue
-
-                # Ambil struktur groups dari masing-masing bagian
-                assets_groups = eliminate_accounts_from_groups(data.get('assets', {}).get('groups', []))
-                liabilities_groups = eliminate_accounts_from_groups(data.get('liabilities', {}).get('groups', []))
-                equity_groups = eliminate_accounts_from_groups(data.get('equity', {}).get('groups', []))
-                income_groups = eliminate_accounts_from_groups(data.get('profit_loss', {}).get('income', {}).get('groups', []))
-                expense_groups = eliminate_accounts_from_groups(data.get('profit_loss', {}).get('expense', {}).get('groups', []))
-
-                # Totals setelah eliminasi
-                total_assets_opening = sum(g.get('opening_balance', 0.0) for g in assets_groups)
-                total_assets_period = sum(g.get('period_balance', 0.0) for g in assets_groups)
-                total_assets_ending = sum(g.get('ending_balance', 0.0) for g in assets_groups)
-
-                total_liab_opening = sum(g.get('opening_balance', 0.0) for g in liabilities_groups)
-                total_liab_period = sum(g.get('period_balance', 0.0) for g in liabilities_groups)
-                total_liab_ending = sum(g.get('ending_balance', 0.0) for g in liabilities_groups)
-
-                total_eq_opening = sum(g.get('opening_balance', 0.0) for g in equity_groups)
-                total_eq_period = sum(g.get('period_balance', 0.0) for g in equity_groups)
-                total_eq_ending = sum(g.get('ending_balance', 0.0) for g in equity_groups)
-
-                total_income_debit = sum(g.get('period_debit', 0.0) for g in income_groups)
-                total_income_credit = sum(g.get('period_credit', 0.0) for g in income_groups)
-                income_net = total_income_credit - total_income_debit
-
-                total_exp_debit = sum(g.get('period_debit', 0.0) for g in expense_groups)
-                total_exp_credit = sum(g.get('period_credit', 0.0) for g in expense_groups)
-                expense_net = total_exp_credit - total_exp_debit
-
-                net_profit = income_net + expense_net
-                ending_le_pl = total_liab_ending + total_eq_ending + net_profit
-
-                results.append({
-                    'company': data['company'],
-                    'status': 'success',
-                    'assets': {'groups': assets_groups, 'grand_total': {'opening_balance': total_assets_opening, 'period_balance': total_assets_period, 'ending_balance': total_assets_ending}},
-                    'liabilities': {'groups': liabilities_groups, 'grand_total': {'opening_balance': total_liab_opening, 'period_balance': total_liab_period, 'ending_balance': total_liab_ending}},
-                    'equity': {'groups': equity_groups, 'grand_total': {'opening_balance': total_eq_opening, 'period_balance': total_eq_period, 'ending_balance': total_eq_ending}},
-                    'income': {'groups': income_groups, 'total_debit': total_income_debit, 'total_credit': total_income_credit, 'net': income_net},
-                    'expense': {'groups': expense_groups, 'total_debit': total_exp_debit, 'total_credit': total_exp_credit, 'net': expense_net},
-                    'profit_loss': {'net_profit': net_profit, 'is_profit': net_profit > 0},
-                    'summary': {
-                        'opening': {'assets': total_assets_opening, 'liabilities': total_liab_opening, 'equity': total_eq_opening},
-                        'period': {'assets': total_assets_period, 'liabilities': total_liab_period, 'equity': total_eq_period, 'income_net': income_net, 'expense_net': expense_net, 'net_profit': net_profit},
-                        'ending': {'assets': total_assets_ending, 'liabilities': total_liab_ending, 'equity': total_eq_ending, 'liabilities_equity_plus_pl': ending_le_pl, 'difference': total_assets_ending - ending_le_pl}
-                    }
-                })
-            except Exception as e:
-                _logger.error(f"financial_report_with_elimination error @ {company.name}: {e}", exc_info=True)
-                results.append({'company': {'id': company.id, 'name': company.name}, 'status': 'error', 'error': str(e)})
+        results, execution = self._run_per_company(
+            companies, '_get_company_elimination_entry',
+            parallel=parallel, max_workers=max_workers,
+            date_from=date_from, date_to=date_to, elim_codes=sorted(elim_codes),
+        )
 
         return {
             'status': 'success',
             'filters': {'date_from': date_from, 'date_to': date_to, 'company_ids': [c.id for c in companies], 'elimination_account_codes': sorted(list(elim_codes))},
             'elimination_accounts': elim_accounts,
             'total_companies': len(companies),
+            'execution': execution,
             'per_company': results
         }
 
+    def _eliminate_accounts_from_groups(self, groups, elim_codes):
+        """Eliminasi per group by account_code: nol-kan akun eliminasi lalu hitung ulang total group."""
+        new_groups = []
+        for grp in groups:
+            new_grp = dict(grp)
+            # reset agregat, lalu hitung ulang
+            new_grp['opening_debit'] = 0.0
+            new_grp['opening_credit'] = 0.0
+            new_grp['opening_balance'] = 0.0
+            new_grp['period_debit'] = 0.0
+            new_grp['period_credit'] = 0.0
+            new_grp['period_balance'] = 0.0
+            new_grp['ending_debit'] = 0.0
+            new_grp['ending_credit'] = 0.0
+            new_grp['ending_balance'] = 0.0
+
+            new_accounts = []
+            for acc in grp.get('accounts', []):
+                new_acc = dict(acc)
+                acc_code = acc.get('account_code') or ''
+                if acc_code in elim_codes:
+                    # nol-kan semua nilai
+                    new_acc['opening_debit'] = 0.0
+                    new_acc['opening_credit'] = 0.0
+                    new_acc['opening_balance'] = 0.0
+                    new_acc['period_debit'] = 0.0
+                    new_acc['period_credit'] = 0.0
+                    new_acc['period_balance'] = 0.0
+                    new_acc['ending_debit'] = 0.0
+                    new_acc['ending_credit'] = 0.0
+                    new_acc['ending_balance'] = 0.0
+                    new_acc['opening_transactions'] = []
+                    new_acc['opening_transaction_count'] = 0
+                    new_acc['period_transactions'] = []
+                    new_acc['period_transaction_count'] = 0
+
+                # akumulasi ulang ke group
+                new_grp['opening_debit'] += new_acc.get('opening_debit', 0.0)
+                new_grp['opening_credit'] += new_acc.get('opening_credit', 0.0)
+                new_grp['opening_balance'] += new_acc.get('opening_balance', 0.0)
+                new_grp['period_debit'] += new_acc.get('period_debit', 0.0)
+                new_grp['period_credit'] += new_acc.get('period_credit', 0.0)
+                new_grp['period_balance'] += new_acc.get('period_balance', 0.0)
+                new_grp['ending_debit'] += new_acc.get('ending_debit', 0.0)
+                new_grp['ending_credit'] += new_acc.get('ending_credit', 0.0)
+                new_grp['ending_balance'] += new_acc.get('ending_balance', 0.0)
+                new_accounts.append(new_acc)
+
+            new_grp['accounts'] = new_accounts
+            new_groups.append(new_grp)
+        return new_groups
 
+    @api.model
+    def _get_company_elimination_entry(self, company_id, date_from=False, date_to=False, elim_codes=()):
+        """Satu entry financial_report_with_elimination untuk satu company."""
+        elim_codes = set(elim_codes)
+        company = self.env['res.company'].browse(company_id)
+        rep = self.with_company(company).with_context(
+            company_id=company.id,
+            company_ids=[company.id],
+            allowed_company_ids=[company.id],
+            force_company=company.id,
+        ).sudo()
+        data = rep.financial_report_combined(date_from=date_from, date_to=date_to, company_id=company.id)
+        if data.get('status') != 'success':
+            return {'company': {'id': company.id, 'name': company.name}, 'status': 'error', 'error': data.get('message', 'Unknown error')}
+
+        # Ambil struktur groups dari masing-masing bagian
+        assets_groups = self._eliminate_accounts_from_groups(data.get('assets', {}).get('groups', []), elim_codes)
+        liabilities_groups = self._eliminate_accounts_from_groups(data.get('liabilities', {}).get('groups', []), elim_codes)
+        equity_groups = self._eliminate_accounts_from_groups(data.get('equity', {}).get('groups', []), elim_codes)
+        income_groups = self._eliminate_accounts_from_groups(data.get('profit_loss', {}).get('income', {}).get('groups', []), elim_codes)
+        expense_groups = self._eliminate_accounts_from_groups(data.get('profit_loss', {}).get('expense', {}).get('groups', []), elim_codes)
+
+        # Totals setelah eliminasi
+        total_assets_opening = sum(g.get('opening_balance', 0.0) for g in assets_groups)
+        total_assets_period = sum(g.get('period_balance', 0.0) for g in assets_groups)
+        total_assets_ending = sum(g.get('ending_balance', 0.0) for g in assets_groups)
+
+        total_liab_opening = sum(g.get('opening_balance', 0.0) for g in liabilities_groups)
+        total_liab_period = sum(g.get('period_balance', 0.0) for g in liabilities_groups)
+        total_liab_ending = sum(g.get('ending_balance', 0.0) for g in liabilities_groups)
+
+        total_eq_opening = sum(g.get('opening_balance', 0.0) for g in equity_groups)
+        total_eq_period = sum(g.get('period_balance', 0.0) for g in equity_groups)
+        total_eq_ending = sum(g.get('ending_balance', 0.0) for g in equity_groups)
+
+        total_income_debit = sum(g.get('period_debit', 0.0) for g in income_groups)
+        total_income_credit = sum(g.get('period_credit', 0.0) for g in income_groups)
+        income_net = total_income_credit - total_income_debit
 
+        total_exp_debit = sum(g.get('period_debit', 0.0) for g in expense_groups)
+        total_exp_credit = sum(g.get('period_credit', 0.0) for g in expense_groups)
+        expense_net = total_exp_credit - total_exp_debit
 
+        net_profit = income_net + expense_net
+        ending_le_pl = total_liab_ending + total_eq_ending + net_profit
 
+        return {
+            'company': data['company'],
+            'status': 'success',
+            'assets': {'groups': assets_groups, 'grand_total': {'opening_balance': total_assets_opening, 'period_balance': total_assets_period, 'ending_balance': total_assets_ending}},
+            'liabilities': {'groups': liabilities_groups, 'grand_total': {'opening_balance': total_liab_opening, 'period_balance': total_liab_period, 'ending_balance': total_liab_ending}},
+            'equity': {'groups': equity_groups, 'grand_total': {'opening_balance': total_eq_opening, 'period_balance': total_eq_period, 'ending_balance': total_eq_ending}},
+            'income': {'groups': income_groups, 'total_debit': total_income_debit, 'total_credit': total_income_credit, 'net': income_net},
+            'expense': {'groups': expense_groups, 'total_debit': total_exp_debit, 'total_credit': total_exp_credit, 'net': expense_net},
+            'profit_loss': {'net_profit': net_profit, 'is_profit': net_profit > 0},
+            'summary': {
+                'opening': {'assets': total_assets_opening, 'liabilities': total_liab_opening, 'equity': total_eq_opening},
+                'period': {'assets': total_assets_period, 'liabilities': total_liab_period, 'equity': total_eq_period, 'income_net': income_net, 'expense_net': expense_net, 'net_profit': net_profit},
+                'ending': {'assets': total_assets_ending, 'liabilities': total_liab_ending, 'equity': total_eq_ending, 'liabilities_equity_plus_pl': ending_le_pl, 'difference': total_assets_ending - ending_le_pl}
+            }
+        }
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+import logging
+_logger = logging.getLogger(__name__)
+
+BALANCE_TOTAL_KEYS = (
+    'opening_debit', 'opening_credit', 'opening_balance',
+    'period_debit', 'period_credit', 'period_balance',
+    'debit', 'credit', 'balance',
+)
+
+GROUP_TOTAL_KEYS = (
+    'opening_debit', 'opening_credit', 'opening_balance',
+    'period_debit', 'period_credit', 'period_balance',
+    'ending_debit', 'ending_credit', 'ending_balance',
+)
+
+# Batas default detail transaksi per akun bila detail diminta
+DEFAULT_TRANSACTION_LIMIT = 100
+
+
+class AccountLedgerAggregate(models.AbstractModel):
+    """
+    Service agregasi ledger bersama untuk API laporan keuangan.
+    Semua total dihitung per akun dalam satu query GROUP BY; detail
+    transaksi hanya diambil bila diminta, dengan limit/offset per akun.
+    """
+    _name = 'account.ledger.aggregate'
+    _description = 'Ledger Aggregation Service'
+
+    @api.model
+    def _get_analytic_move_line_ids(self, company, analytic_account_ids):
+        """ID move line yang terhubung ke analytic account lewat account.analytic.line."""
+        aal = self.env['account.analytic.line'].search([
+            ('account_id', 'in', analytic_account_ids),
+            ('company_id', '=', company.id),
+        ])
+        return set(aal.mapped('move_line_id').ids)
+
+    @api.model
+    def _get_period_conditions(self, date_from=False, date_to=False):
+        """Kondisi SQL opening (date < date_from) dan period (date_from..date_to)."""
+        opening_cond = 'aml.date < %(date_from)s' if date_from else 'FALSE'
+        period_conds = []
+        if date_from:
+            period_conds.append('aml.date >= %(date_from)s')
+        if date_to:
+            period_conds.append('aml.date <= %(date_to)s')
+        return opening_cond, ' AND '.join(period_conds) or 'TRUE'
+
+    @api.model
+    def _flush_move_lines(self):
+        self.env['account.move.line'].flush_model([
+            'account_id', 'company_id', 'date', 'debit', 'credit', 'balance',
+            'parent_state', 'analytic_distribution', 'move_id', 'partner_id', 'name',
+        ])
+
+    @api.model
+    def get_account_totals(self, company, account_ids, date_from=False, date_to=False,
+                           analytic_account_ids=None, analytic_restricted_account_ids=None):
+        """
+        Satu query GROUP BY account_id untuk semua akun.
+        Opening (date < date_from) dan period (date_from..date_to) dipisah dengan FILTER.
+
+        Jika analytic_account_ids diisi, akun di analytic_restricted_account_ids
+        hanya menghitung move line analytic tersebut (via account.analytic.line,
+        fallback ke analytic_distribution).
+
+        Tanpa filter analytic, opening diambil dari account.balance.snapshot
+        (bila sudah dibangun) sehingga line scan hanya mencakup periode.
+
+        Return: {account_id: {opening_debit, opening_credit, opening_balance,
+                              period_debit, period_credit, period_balance,
+                              debit, credit, balance, opening_count, period_count}}
+        """
+        if not account_ids:
+            return {}
+        self._flush_move_lines()
+
+        params = {
+            'company_id': company.id,
+            'account_ids': tuple(account_ids),
+            'date_from': date_from,
+            'date_to': date_to,
+        }
+        opening_cond, period_cond = self._get_period_conditions(date_from, date_to)
+        use_analytic = bool(analytic_account_ids and analytic_restricted_account_ids)
+
+        snapshot_opening = None
+        snapshot = self.env['account.balance.snapshot'].sudo()
+        if date_from and not use_analytic and snapshot._is_ready():
+            snapshot_opening = snapshot.get_opening_balances([company.id], account_ids, date_from)
+            opening_cond = 'FALSE'
+
+        analytic_clause = ''
+        if use_analytic:
+            params['restricted_account_ids'] = tuple(analytic_restricted_account_ids)
+            move_line_ids = self._get_analytic_move_line_ids(company, analytic_account_ids)
+            if move_line_ids:
+                params['analytic_line_ids'] = tuple(move_line_ids)
+                analytic_match = 'aml.id IN %(analytic_line_ids)s'
+            else:
+                # Fallback ke analytic_distribution bila tidak ada move_line_id di AAL
+                params['analytic_keys'] = [str(aid) for aid in analytic_account_ids]
+                analytic_match = 'aml.analytic_distribution ?| %(analytic_keys)s'
+            analytic_clause = (
+                'AND (aml.account_id NOT IN %%(restricted_account_ids)s OR %s)' % analytic_match
+            )
+
+        query = """
+            SELECT aml.account_id,
+                   COALESCE(SUM(aml.debit) FILTER (WHERE {opening}), 0) AS opening_debit,
+                   COALESCE(SUM(aml.credit) FILTER (WHERE {opening}), 0) AS opening_credit,
+                   COALESCE(SUM(aml.balance) FILTER (WHERE {opening}), 0) AS opening_balance,
+                   COALESCE(SUM(aml.debit) FILTER (WHERE {period}), 0) AS period_debit,
+                   COALESCE(SUM(aml.credit) FILTER (WHERE {period}), 0) AS period_credit,
+                   COALESCE(SUM(aml.balance) FILTER (WHERE {period}), 0) AS period_balance,
+                   COUNT(*) FILTER (WHERE {opening}) AS opening_count,
+                   COUNT(*) FILTER (WHERE {period}) AS period_count
+              FROM account_move_line aml
+             WHERE aml.parent_state = 'posted'
+               AND aml.company_id = %(company_id)s
+               AND aml.account_id IN %(account_ids)s
+               AND (({opening}) OR ({period}))
+               {analytic}
+          GROUP BY aml.account_id
+        """.format(opening=opening_cond, period=period_cond, analytic=analytic_clause)
+        self.env.cr.execute(query, params)
+
+        totals = {}
+        for row in self.env.cr.dictfetchall():
+            amounts = {key: float(row[key]) for key in BALANCE_TOTAL_KEYS[:6]}
+            # TOTAL = OPENING + PERIOD
+            amounts['debit'] = amounts['opening_debit'] + amounts['period_debit']
+            amounts['credit'] = amounts['opening_credit'] + amounts['period_credit']
+            amounts['balance'] = amounts['opening_balance'] + amounts['period_balance']
+            amounts['opening_count'] = row['opening_count']
+            amounts['period_count'] = row['period_count']
+            totals[row['account_id']] = amounts
+
+        if snapshot_opening is not None:
+            for account_id, opening in snapshot_opening.items():
+                amounts = totals.setdefault(account_id, dict(
+                    dict.fromkeys(BALANCE_TOTAL_KEYS, 0.0), opening_count=0, period_count=0))
+                amounts['opening_debit'] = opening['debit']
+                amounts['opening_credit'] = opening['credit']
+                amounts['opening_balance'] = opening['balance']
+                amounts['opening_count'] = opening['line_count']
+                amounts['debit'] += opening['debit']
+                amounts['credit'] += opening['credit']
+                amounts['balance'] += opening['balance']
+        return totals
+
+    @api.model
+    def get_account_transactions(self, company, account_ids, date_from=False, date_to=False,
+                                 section='period', limit=DEFAULT_TRANSACTION_LIMIT, offset=0):
+        """
+        Detail transaksi per akun (urut date, id) untuk section 'opening' atau 'period'.
+        limit/offset berlaku per akun (ROW_NUMBER per account_id), limit=None berarti semua.
+
+        Return: {account_id: [ {date, move_name, label, partner, debit, credit, balance}, ... ]}
+        """
+        if not account_ids or (section == 'opening' and not date_from):
+            return {}
+        self._flush_move_lines()
+        self.env['account.move'].flush_model(['name'])
+        self.env['res.partner'].flush_model(['name'])
+
+        opening_cond, period_cond = self._get_period_conditions(date_from, date_to)
+        params = {
+            'company_id': company.id,
+            'account_ids': tuple(account_ids),
+            'date_from': date_from,
+            'date_to': date_to,
+            'offset': max(int(offset or 0), 0),
+        }
+        limit_clause = ''
+        if limit:
+            params['limit'] = int(limit)
+            limit_clause = 'AND t.rn <= %(offset)s + %(limit)s'
+
+        query = """
+            SELECT t.account_id, t.date, t.move_name, t.label, t.partner,
+                   t.debit, t.credit, t.balance
+              FROM (
+                    SELECT aml.account_id, aml.date, am.name AS move_name,
+                           aml.name AS label, rp.name AS partner,
+                           aml.debit, aml.credit, aml.balance,
+                           ROW_NUMBER() OVER (PARTITION BY aml.account_id ORDER BY aml.date, aml.id) AS rn
+                      FROM account_move_line aml
+                      JOIN account_move am ON am.id = aml.move_id
+                 LEFT JOIN res_partner rp ON rp.id = aml.partner_id
+                     WHERE aml.parent_state = 'posted'
+                       AND aml.company_id = %(company_id)s
+                       AND aml.account_id IN %(account_ids)s
+                       AND ({condition})
+                   ) t
+             WHERE t.rn > %(offset)s {limit}
+          ORDER BY t.account_id, t.rn
+        """.format(condition=opening_cond if section == 'opening' else period_cond, limit=limit_clause)
+        self.env.cr.execute(query, params)
+
+        transactions = {}
+        for account_id, line_date, move_name, label, partner, debit, credit, balance in self.env.cr.fetchall():
+            transactions.setdefault(account_id, []).append({
+                'date': str(line_date),
+                'move_name': move_name,
+                'label': label or '',
+                'partner': partner or '',
+                'debit': float(debit),
+                'credit': float(credit),
+                'balance': float(balance),
+            })
+        return transactions
+
+    @api.model
+    def get_grouped_totals(self, company, account_types, date_from=False, date_to=False,
+                           include_transactions=False, transaction_limit=DEFAULT_TRANSACTION_LIMIT,
+                           transaction_offset=0, with_period_net=False):
+        """
+        Total opening/period/ending per akun dan per account.group untuk sekumpulan account type.
+        Detail transaksi hanya diambil jika include_transactions=True.
+
+        Return: (groups_list terurut (group_code, group_name), grand_total)
+        """
+        accounts = self.env['account.account'].search([
+            ('account_type', 'in', list(account_types)),
+            ('company_id', '=', company.id)
+        ])
+        totals = self.get_account_totals(company, accounts.ids, date_from=date_from, date_to=date_to)
+
+        opening_transactions = period_transactions = {}
+        if include_transactions:
+            active_ids = list(totals)
+            opening_transactions = self.get_account_transactions(
+                company, active_ids, date_from=date_from, date_to=date_to, section='opening',
+                limit=transaction_limit, offset=transaction_offset)
+            period_transactions = self.get_account_transactions(
+                company, active_ids, date_from=date_from, date_to=date_to, section='period',
+                limit=transaction_limit, offset=transaction_offset)
+
+        grouped = {}
+        for account in accounts:
+            amounts = totals.get(account.id)
+            if not amounts:
+                continue
+            if not (amounts['opening_count'] or amounts['period_count']
+                    or amounts['balance'] or amounts['opening_balance']):
+                continue
+
+            ag = account.group_id
+            group_key = ag.id if ag else 0
+            group = grouped.setdefault(group_key, dict(
+                dict.fromkeys(GROUP_TOTAL_KEYS, 0.0),
+                group_id=group_key,
+                group_name=ag.name if ag else 'Unassigned',
+                group_code=(ag.code_prefix_start or '') if ag else '',
+                accounts=[],
+            ))
+
+            account_info = {'account_code': account.code, 'account_name': account.name}
+            account_data = {
+                'account_id': account.id,
+                'account_code': account.code,
+                'account_name': account.name,
+                'account_type': account.account_type,
+                # Opening
+                'opening_debit': amounts['opening_debit'],
+                'opening_credit': amounts['opening_credit'],
+                'opening_balance': amounts['opening_balance'],
+                'opening_transactions': [dict(line, **account_info) for line in opening_transactions.get(account.id, [])],
+                'opening_transaction_count': amounts['opening_count'],
+                # Period
+                'period_debit': amounts['period_debit'],
+                'period_credit': amounts['period_credit'],
+                'period_balance': amounts['period_balance'],
+                'period_transactions': [dict(line, **account_info) for line in period_transactions.get(account.id, [])],
+                'period_transaction_count': amounts['period_count'],
+                # Ending = Opening + Period
+                'ending_debit': amounts['debit'],
+                'ending_credit': amounts['credit'],
+                'ending_balance': amounts['balance'],
+            }
+            if with_period_net:
+                # Net period (credit - debit)
+                account_data['period_net'] = amounts['period_credit'] - amounts['period_debit']
+            group['accounts'].append(account_data)
+            for key in GROUP_TOTAL_KEYS:
+                group[key] += account_data[key]
+
+        groups_list = list(grouped.values())
+        groups_list.sort(key=lambda x: (x['group_code'], x['group_name']))
+        grand_total = {key: sum(g[key] for g in groups_list) for key in GROUP_TOTAL_KEYS}
+        return groups_list, grand_total
@@ -65,7 +65,7 @@ Best Warehouse Reports Apps ,
     'maintainer': 'Nano Tech Soft LLC.',
     'live_test_url': 'https://warehousereport14.kappso.com/',
     'category': 'Warehouse',
-    'version': '1.0.0',
+    'version': '1.0.1',
     'support': 'sales@nanotsoft.com',
     'images': ['static/description/new_banner.gif'],
     'depends': ['base', 'stock', 'sale_stock', 'purchase_stock'],
@@ -74,6 +74,8 @@ Best Warehouse Reports Apps ,
         'security/ir.model.access.csv',
         'security/ks_warehouse_security.xml',
         'views/ks_warehouse_view.xml',
+        'views/ks_warehouse_report_job_view.xml',
+        'data/ks_warehouse_report_job_data.xml',
         'wizard/ks_warehouse_report_valuation_view.xml',
         'wizard/ks_warehouse_report_measures_view.xml',
         'wizard/ks_warehouse_report_movement_view.xml',
@@ -1 +1,2 @@
 from . import ks_warehouse_report
+from . import ks_warehouse_report_job
@@ -0,0 +1,197 @@
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+from datetime import timedelta
+import logging
+
+from .ks_xlsx_stream import KsStreamingSheet
+
+_log = logging.getLogger(__name__)
+
+# Running jobs older than this are considered lost (worker killed, server restart)
+KS_JOB_TIMEOUT = timedelta(hours=2)
+# Number of progress updates written while a report is rendered
+KS_PROGRESS_STEPS = 20
+
+
+class KSWarehouseReportJob(models.Model):
+    _name = "ks.warehouse.report.job"
+    _description = "Warehouse Report Job"
+    _order = 'id desc'
+
+    name = fields.Char('Report', required=True, readonly=True)
+    res_model = fields.Char('Report Model', required=True, readonly=True)
+    res_id = fields.Many2oneReference('Report ID', model_field='res_model', required=True, readonly=True)
+    user_id = fields.Many2one('res.users', 'Requested By', required=True, readonly=True, index=True,
+                              default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', 'Company', required=True, readonly=True,
+                                 default=lambda self: self.env.company)
+    state = fields.Selection([('pending', 'Pending'),
+                              ('running', 'Running'),
+                              ('done', 'Done'),
+                              ('failed', 'Failed')], default='pending', required=True, readonly=True, index=True)
+    progress = fields.Float('Progress', readonly=True)
+    date_start = fields.Datetime('Started', readonly=True)
+    date_done = fields.Datetime('Finished', readonly=True)
+    error = fields.Text('Error', readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', 'Attachment', readonly=True, ondelete='set null')
+    ks_file = fields.Binary(related='attachment_id.datas', string='File')
+    ks_file_name = fields.Char(related='attachment_id.name', string='File Name')
+
+    @api.model
+    def ks_enqueue(self, report):
+        job = self.create({
+            'name': report.ks_name or report._description,
+            'res_model': report._name,
+            'res_id': report.id,
+            'company_id': report.ks_company_id.id or self.env.company.id,
+        })
+        report.ks_job_id = job
+        self.env.ref('nanotsoft_warehouse_report.ks_cron_process_report_jobs').sudo()._trigger()
+        return job
+
+    def _ks_commit(self):
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+
+    @api.model
+    def _ks_acquire_job(self):
+        # SKIP LOCKED lets several cron workers share the queue
+        self.env.cr.execute("""
+            SELECT id FROM ks_warehouse_report_job
+            WHERE state = 'pending'
+            ORDER BY id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        if not row:
+            return self.browse()
+        job = self.browse(row[0])
+        job.write({'state': 'running', 'progress': 0.0, 'date_start': fields.Datetime.now()})
+        self._ks_commit()
+        return job
+
+    @api.model
+    def _cron_process_jobs(self, limit=10):
+        self = self.sudo()
+        lost = self.search([('state', '=', 'running'),
+                            ('date_start', '<', fields.Datetime.now() - KS_JOB_TIMEOUT)])
+        if lost:
+            lost.write({'state': 'failed', 'error': _('The report was interrupted.'),
+                        'date_done': fields.Datetime.now()})
+            self._ks_commit()
+        for dummy in range(limit):
+            job = self._ks_acquire_job()
+            if not job:
+                break
+            job._ks_run()
+
+    def _ks_run(self):
+        self.ensure_one()
+        report = self.env[self.res_model].with_user(self.user_id).with_company(self.company_id) \
+            .browse(self.res_id).with_context(ks_report_job_id=self.id)
+        attachment = self.env['ir.attachment']
+        error = False
+        try:
+            with self.env.cr.savepoint():
+                attachment = report.ks_render_xlsx_report()
+        except Exception as e:
+            _log.exception("Warehouse report job %s failed", self.id)
+            error = e.args[0] if isinstance(e, UserError) and e.args else str(e)
+        # the progress updates were committed by another cursor: start a new transaction
+        # before writing the job itself
+        self._ks_commit()
+        if error:
+            self.write({'state': 'failed', 'error': error, 'date_done': fields.Datetime.now()})
+        else:
+            self.write({'state': 'done', 'progress': 100.0, 'attachment_id': attachment.id,
+                        'date_done': fields.Datetime.now()})
+        self._ks_notify()
+        self._ks_commit()
+
+    def _ks_notify(self):
+        for job in self:
+            if job.state == 'done':
+                message = _('%s is ready. Download it from the report wizard or Warehouse Reports > Report Jobs.',
+                            job.name)
+                notification_type = 'success'
+            else:
+                message = _('%s failed: %s', job.name, job.error)
+                notification_type = 'danger'
+            self.env['bus.bus']._sendone(job.user_id.partner_id, 'simple_notification', {
+                'title': _('Warehouse Report'),
+                'message': message,
+                'type': notification_type,
+                'sticky': True,
+            })
+
+    def ks_set_progress(self, progress):
+        self.ensure_one()
+        if self.env.registry.in_test_mode():
+            self.write({'progress': progress})
+            return
+        # written from a separate cursor so the wizard sees it while the report is rendered
+        with self.env.registry.cursor() as cr:
+            cr.execute("UPDATE ks_warehouse_report_job SET progress = %s WHERE id = %s", (progress, self.id))
+
+
+class KSWarehouseReportXlsxMixin(models.AbstractModel):
+    _name = "ks.warehouse.report.xlsx.mixin"
+    _description = "Warehouse XLSX Report Job Mixin"
+
+    ks_job_id = fields.Many2one('ks.warehouse.report.job', 'Report Job', readonly=True, copy=False)
+    ks_job_state = fields.Selection(related='ks_job_id.state', string='Job Status')
+    ks_job_progress = fields.Float(related='ks_job_id.progress', string='Job Progress')
+    ks_job_error = fields.Text(related='ks_job_id.error', string='Job Error')
+    ks_job_file = fields.Binary(related='ks_job_id.ks_file', string='Report File')
+    ks_job_file_name = fields.Char(related='ks_job_id.ks_file_name', string='Report File Name')
+
+    def ks_generate_xlsx_report(self):
+        """ Queue the report; the cron renders it and notifies the user when it is ready. """
+        self.ensure_one()
+        self.env['ks.warehouse.report.job'].ks_enqueue(self)
+        return self.ks_action_reload()
+
+    def ks_action_reload(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+            'context': self.env.context,
+        }
+
+    def ks_render_xlsx_report(self):
+        """ Write the report with ks_new_sheet() and return ks_save_report(). """
+        raise UserError(_("The report %s cannot be generated in XLSX.", self._description or self._name))
+
+    def ks_get_product_costs(self, product_ids):
+        """ standard_price of the product templates, read once for all rows. """
+        products = self.env['product.product'].browse(set(product_ids))
+        return {product.id: product.product_tmpl_id.standard_price for product in products}
+
+    def ks_new_sheet(self, report_name):
+        return KsStreamingSheet(report_name)
+
+    def ks_iter_progress(self, datas):
+        """ Iterate over the report rows, publishing the progress on the running job. """
+        job = self.env['ks.warehouse.report.job'].browse(self.env.context.get('ks_report_job_id'))
+        total = len(datas)
+        step = max(total // KS_PROGRESS_STEPS, 1)
+        for index, data in enumerate(datas):
+            if job and index and not index % step:
+                job.sudo().ks_set_progress(round(index * 100.0 / total, 1))
+            yield data
+
+    def ks_save_report(self, sheet, report_name):
+        """ Save the streamed workbook into an attachment of the running job. """
+        job_id = self.env.context.get('ks_report_job_id')
+        return self.env['ir.attachment'].create({
+            'name': str(report_name) + '.xlsx',
+            'raw': sheet.save(),
+            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            'res_model': 'ks.warehouse.report.job' if job_id else self._name,
+            'res_id': job_id or self.id,
+        })
@@ -0,0 +1,89 @@
+import io
+import logging
+
+_log = logging.getLogger(__name__)
+
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+    from openpyxl.worksheet.cell_range import CellRange
+except ImportError:
+    _log.debug('Can not `import openpyxl`.')
+
+
+class KsStreamingSheet(object):
+    """ Cell-addressed facade over an openpyxl write-only worksheet.
+
+    The reports write their sheets with sheet.cell(row, col, value), sheet['A1'],
+    merge_cells() and freeze_panes, going down the sheet row by row. Rows are kept
+    in a small buffer and appended to the write-only worksheet once the report is
+    `window` rows further, so memory depends on the window, not on the report size.
+    """
+
+    def __init__(self, title, window=50):
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._ws = self._workbook.create_sheet(title=str(title)[:31])
+        self._window = window
+        self._rows = {}
+        self._next_row = 1
+
+    @property
+    def title(self):
+        return self._ws.title
+
+    @title.setter
+    def title(self, value):
+        self._ws.title = str(value)[:31]
+
+    @property
+    def freeze_panes(self):
+        return self._ws.freeze_panes
+
+    @freeze_panes.setter
+    def freeze_panes(self, value):
+        if self._next_row > 1:
+            raise ValueError("freeze_panes must be set before rows are streamed")
+        self._ws.freeze_panes = value
+
+    def cell(self, row, column, value=None):
+        if row < self._next_row:
+            raise ValueError("Row %s was already streamed to the worksheet" % row)
+        cells = self._rows.setdefault(row, {})
+        ks_cell = cells.get(column)
+        if ks_cell is None:
+            ks_cell = cells[column] = WriteOnlyCell(self._ws)
+        if value is not None:
+            ks_cell.value = value
+        self._flush(row - self._window)
+        return ks_cell
+
+    def __getitem__(self, coordinate):
+        column, row = coordinate_from_string(coordinate)
+        return self.cell(row, column_index_from_string(column))
+
+    def __setitem__(self, coordinate, value):
+        self[coordinate].value = value
+
+    def merge_cells(self, start_row, start_column, end_row, end_column):
+        self._ws.merged_cells.add(CellRange(min_col=start_column, min_row=start_row,
+                                            max_col=end_column, max_row=end_row))
+
+    def _flush(self, upto_row):
+        while self._next_row <= upto_row:
+            cells = self._rows.pop(self._next_row, None)
+            if cells:
+                line = [None] * max(cells)
+                for column, ks_cell in cells.items():
+                    line[column - 1] = ks_cell
+                self._ws.append(line)
+            else:
+                self._ws.append([])
+            self._next_row += 1
+
+    def save(self):
+        """ Stream the remaining rows and return the xlsx file content. """
+        self._flush(max(self._rows, default=0))
+        output = io.BytesIO()
+        self._workbook.save(output)
+        return output.getvalue()
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import test_ks_merge_data
+from . import test_ks_report_job
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from unittest.mock import patch
+
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+# Number of synthetic SKUs generated for the benchmark
+BENCH_SKUS = 20000
+BENCH_LOCATIONS = 3
+
+
+def _quant_row(product_id, location_id, company_id, barcode=True):
+    # product_code, type, categ, name, location, company, sales price, qty available, product_id[, barcode]
+    row = ('P%05d' % product_id, 'product', 1, 'Product %s' % product_id, location_id, company_id,
+           10.0, 5.0, product_id)
+    return row + ('BC%05d' % product_id,) if barcode else row
+
+
+@tagged('post_install', '-at_install')
+class TestKsMergeData(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company_id = cls.env.company.id
+        cls.valuation = cls.env['ks.warehouse.report.valuation'].new({'ks_show_exhausted': False})
+        cls.measure = cls.env['ks.warehouse.report.measure'].new({})
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(
+            type(self.env['ks.warehouse.report.xlsx.mixin']), 'ks_get_product_costs',
+            lambda _self, product_ids: {product_id: 2.0 for product_id in product_ids})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_valuation_merge(self):
+        company = self.company_id
+        datas = [_quant_row(1, 10, company), _quant_row(1, 11, company), _quant_row(2, 10, company),
+                 _quant_row(3, 10, company)]
+        dates_in = [
+            (1, 10, company, 4.0, 6.0, 6.0),
+            (1, 11, company, 1.0, 1.0, 1.0),    # same product again: only the first row is kept
+            (2, 10, company, 0.0, -1.0, -1.0),  # exhausted: hidden
+            (3, 12, company, 1.0, 1.0, 1.0),    # no quant on that location
+        ]
+        result = self.valuation.ks_merge_data(datas, dates_in, adjusted={(1, 10, company): 1.0},
+                                              scrap={(1, 10, company): 2.0})
+        self.assertEqual(result, [
+            (1, 'product', 1, 'Product 1', 10, company, 6.0, 2.0, 10.0, 4.0, 8.0, 6.0, 12.0,
+             1.0, 2.0, 2.0, 4.0, 3.0, 6.0, 'BC00001'),
+        ])
+        with self.assertRaises(ValidationError):
+            self.valuation.ks_merge_data(datas, [(3, 12, company, 1.0, 1.0, 1.0)])
+
+    def test_measure_merge(self):
+        company = self.company_id
+        datas = [_quant_row(1, 10, company, False), _quant_row(1, 11, company, False)]
+        dates_in = [(1, 10, company, 4.0, 6.0, 6.0), (1, 11, company, 1.0, 2.0, 2.0)]
+        result = self.measure.ks_merge_data(
+            datas, dates_in, adjusted={(1, 11, company): [3.0, 4.0]}, scrap={(1, 10, company): 1.0},
+            sale={(1, company): 5.0}, purchase={(1, company): 7.0})
+        # sale and purchase are per product and company: reported on the first location only
+        self.assertEqual(result, [
+            (1, 'product', 1, 'Product 1', 10, company, 4.0, 5.0, 7.0, 0, 0, 1.0, 6.0),
+            (1, 'product', 1, 'Product 1', 11, company, 1.0, 0, 0, 4.0, 3.0, 0, 2.0),
+        ])
+
+    def test_merge_benchmark(self):
+        company = self.company_id
+        datas, dates_in, adjusted, scrap = [], [], {}, {}
+        for product_id in range(1, BENCH_SKUS + 1):
+            for location_id in range(1, BENCH_LOCATIONS + 1):
+                datas.append(_quant_row(product_id, location_id, company))
+                dates_in.append((product_id, location_id, company, 1.0, 2.0, 2.0))
+                adjusted[(product_id, location_id, company)] = 1.0
+                scrap[(product_id, location_id, company)] = 0.5
+        started = time.perf_counter()
+        result = self.valuation.ks_merge_data(datas, dates_in, adjusted=adjusted, scrap=scrap)
+        elapsed = time.perf_counter() - started
+        _logger.info("Valuation merge benchmark (%s SKUs x %s locations): %.3fs",
+                     BENCH_SKUS, BENCH_LOCATIONS, elapsed)
+        self.assertEqual(len(result), BENCH_SKUS)
+        # the former nested loop needed minutes here
+        self.assertLess(elapsed, 10.0)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import io
+from datetime import date
+from unittest.mock import patch
+
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.nanotsoft_warehouse_report.models.ks_xlsx_stream import KsStreamingSheet
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+# More rows than the streaming window, so rows are flushed while the report is written
+REPORT_ROWS = 120
+
+
+@tagged('post_install', '-at_install')
+class TestKsReportJob(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.category = cls.env.ref('product.product_category_all')
+        cls.Job = cls.env['ks.warehouse.report.job']
+        cls.Wizard = cls.env['ks.warehouse.report.location.transfer']
+
+    def _patch_wizard_data(self, merge_data):
+        wizard_class = type(self.Wizard)
+        for method in ('ks_adjusted_stock', 'ks_sale_product', 'ks_purchase_product'):
+            patcher = patch.object(wizard_class, method, lambda _self: [])
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(wizard_class, 'ks_merge_data', merge_data)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _rows(self, _wizard, adjusted, sale, purchase):
+        # code, type, categ, name, company, last sale, last purchase, last adjust, locations
+        return [('P%04d' % index, 'product', self.category.id, 'Product %s' % index, self.company.id,
+                 '2024-01-02', '2024-01-03', '2024-01-04', False, False, False)
+                for index in range(REPORT_ROWS)]
+
+    def _enqueue(self):
+        wizard = self.Wizard.create({
+            'ks_date_from': date(2024, 1, 1),
+            'ks_date_to': date(2024, 12, 31),
+            'ks_company_id': self.company.id,
+        })
+        wizard.ks_generate_xlsx_report()
+        self.assertEqual(wizard.ks_job_id.state, 'pending')
+        return wizard.ks_job_id
+
+    def test_streaming_sheet(self):
+        if not openpyxl:
+            self.skipTest('openpyxl is not installed')
+        sheet = KsStreamingSheet('Streaming', window=5)
+        sheet.freeze_panes = 'A2'
+        sheet['A1'] = 'Title'
+        sheet.merge_cells(start_row=1, end_row=1, start_column=1, end_column=3)
+        for row in range(2, 21):
+            sheet.cell(row, 2, row * 10)
+        with self.assertRaises(ValueError):
+            sheet.cell(10, 1, 'too late')
+        with self.assertRaises(ValueError):
+            sheet.freeze_panes = 'B2'
+
+        worksheet = openpyxl.load_workbook(io.BytesIO(sheet.save())).active
+        self.assertEqual(worksheet.title, 'Streaming')
+        self.assertEqual(worksheet['A1'].value, 'Title')
+        self.assertEqual([worksheet.cell(row, 2).value for row in range(2, 21)],
+                         [row * 10 for row in range(2, 21)])
+        self.assertEqual(worksheet.freeze_panes, 'A2')
+        self.assertIn('A1:C1', [str(cells) for cells in worksheet.merged_cells.ranges])
+
+    def test_report_job_done(self):
+        if not openpyxl:
+            self.skipTest('openpyxl is not installed')
+        self._patch_wizard_data(self._rows)
+        job = self._enqueue()
+
+        self.Job._cron_process_jobs()
+
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.progress, 100.0)
+        self.assertTrue(job.date_start and job.date_done)
+        self.assertEqual(job.attachment_id.res_model, job._name)
+        self.assertEqual(job.attachment_id.res_id, job.id)
+        worksheet = openpyxl.load_workbook(io.BytesIO(job.attachment_id.raw)).active
+        self.assertEqual(worksheet.max_row, 9 + REPORT_ROWS)
+        self.assertEqual(worksheet.cell(10, 2).value, 'P0000')
+        self.assertEqual(worksheet.cell(9 + REPORT_ROWS, 5).value, 'Product %s' % (REPORT_ROWS - 1))
+
+    def test_report_job_failed(self):
+        def no_data(_wizard, adjusted, sale, purchase):
+            raise ValidationError("Opps! There are no data.")
+        self._patch_wizard_data(no_data)
+        job = self._enqueue()
+
+        self.Job._cron_process_jobs()
+
+        self.assertEqual(job.state, 'failed')
+        self.assertEqual(job.error, "Opps! There are no data.")
+        self.assertFalse(job.attachment_id)
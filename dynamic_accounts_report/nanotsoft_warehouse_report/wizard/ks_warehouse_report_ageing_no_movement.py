@@ -1,24 +1,20 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 
-import base64
-from io import StringIO
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import logging
-import pathlib
-import os
 
 _log = logging.getLogger(__name__)
 
 try:
-    import openpyxl
     from openpyxl.styles import Border, Font, Alignment
 except ImportError:
     _log.debug('Can not `import openpyxl`.')
 
 class KSWarehouseReportAgeingNoMovements(models.Model):
     _name = "ks.warehouse.report.ageing.no.movement"
+    _inherit = ['ks.warehouse.report.xlsx.mixin']
     _description = "Stock Ageing No Movements / Stock Report"
 
     ks_report = {'product_code': 0, 'product_type': 1, 'product_categ_id': 2, 'product_name': 3, 'location_id': 4,
@@ -86,11 +82,9 @@ class KSWarehouseReportAgeingNoMovements(models.Model):
 
         sheet.freeze_panes = 'C11'
 
-    def ks_generate_xlsx_report(self):
+    def ks_render_xlsx_report(self):
         report_name = self.ks_name
-        workbook = openpyxl.Workbook()
-
-        sheet = workbook.active
+        sheet = self.ks_new_sheet(report_name)
 
         self.ks_set_default_5_columns_left(report_name, sheet)
 
@@ -164,7 +158,7 @@ class KSWarehouseReportAgeingNoMovements(models.Model):
             i = 1;
             row = 11;
             col = 0
-            for data in datas:
+            for data in self.ks_iter_progress(datas):
                 self.ks_set_default_5_rows_left(sheet, row, j, data)
                 ks_col = 0
                 start = datetime.strptime(str(self.ks_date_from), "%Y-%m-%d")
@@ -204,33 +198,7 @@ class KSWarehouseReportAgeingNoMovements(models.Model):
 
                 row += 1
                 j += 1
-        output = StringIO()
-        filename = (str(pathlib.Path(__file__).parent) + '/' + str(report_name) + '.xlsx')
-        _log.info("Filepath: %s" % (filename))
-        workbook.save(filename)
-        fp = open(filename, "rb")
-        file_data = fp.read()
-        out = base64.encodebytes(file_data)
-
-        # Files actions
-        attach_vals = {
-            'report_name': str(report_name) + '.xlsx',
-            'datas': out,
-        }
-
-        act_id = self.env['ks.warehouse.report.ageing.no.movement.out'].create(attach_vals)
-        fp.close()
-        os.remove(filename)
-        _log.info("File closed and removed.")
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'ks.warehouse.report.ageing.no.movement.out',
-            'res_id': act_id.id,
-            'view_type': 'form',
-            'view_mode': 'form',
-            'context': self.env.context,
-            'target': 'new',
-        }
+        return self.ks_save_report(sheet, report_name)
 
     
     def ks_set_default_5_rows_left(self, sheet, row, j, data):
@@ -247,10 +215,3 @@ class KSWarehouseReportAgeingNoMovements(models.Model):
         if data[4]:
             location_id = self.env['stock.location'].browse(int(data[4]))
         sheet.cell(row, 6, location_id.display_name)
-
-    class KSWarehouseReportAgeingNoMovementOUT(models.Model):
-        _name = "ks.warehouse.report.ageing.no.movement.out"
-        _description = "Stock Ageing No Movement report Out"
-
-        datas = fields.Binary('File', readonly=True)
-        report_name = fields.Char('Report Name', readonly=True)
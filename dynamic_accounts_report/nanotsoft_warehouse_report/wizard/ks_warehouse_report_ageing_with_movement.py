@@ -1,24 +1,19 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 
-import base64
-from io import StringIO
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from datetime import timedelta
 import logging
-import pathlib
-import os
 
 _log = logging.getLogger(__name__)
 
 try:
-    import openpyxl
     from openpyxl.styles import Border, Font, Alignment
 except ImportError:
     _log.debug('Can not `import openpyxl`.')
 
 class KSWarehouseReportAgeingWithMovement(models.Model):
     _name = "ks.warehouse.report.ageing.with.movement"
+    _inherit = ['ks.warehouse.report.xlsx.mixin']
     _description = "Stock Ageing With Movements / Stock Report"
 
     ks_report = {'product_code': 0, 'product_type': 1, 'product_categ_id': 2, 'product_name': 3, 'location_id': 4,
@@ -86,11 +81,9 @@ class KSWarehouseReportAgeingWithMovement(models.Model):
 
         sheet.freeze_panes = 'C12'
     
-    def ks_generate_xlsx_report(self):
+    def ks_render_xlsx_report(self):
         report_name = self.ks_name
-        workbook = openpyxl.Workbook()
-
-        sheet = workbook.active
+        sheet = self.ks_new_sheet(report_name)
 
         self.ks_set_default_5_columns_left(report_name, sheet)
 
@@ -183,17 +176,24 @@ class KSWarehouseReportAgeingWithMovement(models.Model):
         #
         # datas = self.ks_apply_filter(datas)
 
+        # all buckets for all product/location pairs in one grouped query
+        ks_bucket_data = self.ks_get_bucketed_pro_data(datas, ks_date_from, ks_date_to, period_length)
+        ks_costs = self.ks_get_product_costs([data[0] for data in datas])
+        # warm the cache used by ks_set_default_5_rows_left
+        self.env['product.category'].browse({int(data[2]) for data in datas if data[2]}).mapped('name')
+        self.env['stock.location'].browse({int(data[4]) for data in datas if data[4]}).mapped('display_name')
+
         if datas:
             j = 1;
             i = 1;
             row = 12;
             col = 0
-            for data in datas:
+            for data in self.ks_iter_progress(datas):
                 self.ks_set_default_5_rows_left(sheet, row, j, data)
                 ks_col = 0
-                ks_cost = self.env['product.product'].browse(data[0]).product_tmpl_id.standard_price
-                start = datetime.strptime(str(self.ks_date_from), "%Y-%m-%d")
-                for i in range(0, (self.ks_date_to - self.ks_date_from).days, self.ks_duration):
+                ks_cost = ks_costs.get(data[0], 0.0)
+                ks_buckets = ks_bucket_data.get((data[0], data[4]), {})
+                for ks_bucket, i in enumerate(range(0, (self.ks_date_to - self.ks_date_from).days, self.ks_duration)):
                     # if 14 + ks_col > 255:  # It will enter the loop if column gretaer than 255 to split the sheet into new
                     #     ks_col = 0
                     #     if 'nd_sheet' in locals(): nd_sheet += 1
@@ -201,10 +201,8 @@ class KSWarehouseReportAgeingWithMovement(models.Model):
                     #     sheet = ks_sheet[nd_sheet]
                     #     self.ks_set_default_5_rows_left(sheet, row, j, data)
 
-                    stop = start + relativedelta(days=period_length)
-                    stop = ks_date_to if stop > ks_date_to else stop
-
-                    pro_data = self.ks_get_pro_data(data, start, stop)
+                    bucket_data = ks_buckets.get(ks_bucket)
+                    pro_data = [bucket_data] if bucket_data else []
 
                     sheet.cell(row, 7 + ks_col, pro_data[0][0] if pro_data else 0)
                     sheet.cell(row, 8 + ks_col, (pro_data[0][0] if pro_data else 0) * ks_cost)
@@ -216,7 +214,6 @@ class KSWarehouseReportAgeingWithMovement(models.Model):
                     sheet.cell(row, 14 + ks_col, (pro_data[0][3] if pro_data else 0) * ks_cost)
                     sheet.cell(row, 15 + ks_col, pro_data[0][4] if pro_data else 0)
                     sheet.cell(row, 16 + ks_col, (pro_data[0][4] if pro_data else 0) * ks_cost)
-                    start = stop
                     ks_col += 10
                 # else:
                 #     if 'ks_sheet' in locals(): sheet = ks_sheet[1]
@@ -225,33 +222,7 @@ class KSWarehouseReportAgeingWithMovement(models.Model):
                 row += 1
                 i += 1
                 j += 1
-        output = StringIO()
-        filename = (str(pathlib.Path(__file__).parent) + '/' + str(report_name) + '.xlsx')
-        _log.info("Filepath: %s" % (filename))
-        workbook.save(filename)
-        fp = open(filename, "rb")
-        file_data = fp.read()
-        out = base64.encodebytes(file_data)
-
-        # Files actions
-        attach_vals = {
-            'report_name': str(report_name) + '.xlsx',
-            'datas': out,
-        }
-
-        act_id = self.env['ks.warehouse.report.ageing.with.movement.out'].create(attach_vals)
-        fp.close()
-        os.remove(filename)
-        _log.info("File closed and removed.")
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'ks.warehouse.report.ageing.with.movement.out',
-            'res_id': act_id.id,
-            'view_type': 'form',
-            'view_mode': 'form',
-            'context': self.env.context,
-            'target': 'new',
-        }
+        return self.ks_save_report(sheet, report_name)
 
     
     def ks_set_default_5_rows_left(self, sheet, row, j, data):
@@ -269,7 +240,85 @@ class KSWarehouseReportAgeingWithMovement(models.Model):
             location_id = self.env['stock.location'].browse(int(data[4]))
         sheet.cell(row, 6, location_id.display_name)
 
-    
+    def ks_get_bucketed_pro_data(self, datas, date_from, date_to, period_length):
+        """
+        Sale / purchase / internal / adjustment / scrap quantities for every
+        (product, location) pair of `datas` and every ageing bucket, in one query.
+
+        Bucket k covers [date_from + k * period_length days, next bucket start);
+        the last bucket is closed on date_to.
+
+        Returns {(product_id, location_id): {bucket: (sale, purchase, internal, adjustment, scrap)}}
+        """
+        if not datas:
+            return {}
+        ks_limit_days = (date_to - date_from).days
+        bucket_count = len(range(0, ks_limit_days, period_length))
+        if not bucket_count:
+            return {}
+        params = {
+            'company_id': self.ks_company_id.id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'period_seconds': period_length * 86400,
+            'last_bucket': bucket_count - 1,
+            'product_ids': list({data[0] for data in datas}),
+            'location_ids': list({data[4] for data in datas}),
+        }
+        bucket = "LEAST(FLOOR(EXTRACT(EPOCH FROM ({date} - %(date_from)s)) / %(period_seconds)s)::int, %(last_bucket)s)"
+        self.env.cr.execute("""
+        with moves as (
+                select sml.product_id, sml.location_id, {sml_bucket} as bucket,
+                    0 as sale, 0 as purchase,
+                    case when spt.code = 'internal' then sml.qty_done else 0 end as internal_adjust,
+                    sml.qty_done as adjustment, 0 as scrapped
+                from stock_move_line as sml
+                    left join stock_move as sm on sm.id = sml.move_id
+                    left join stock_location as sld on sld.id = sm.location_dest_id
+                    left join stock_picking_type as spt on spt.id = sm.picking_type_id
+                where sml.state = 'done' and sm.company_id = %(company_id)s
+                    and sml.date between %(date_from)s and %(date_to)s
+                    and sml.product_id = any(%(product_ids)s) and sml.location_id = any(%(location_ids)s)
+                    and sld.scrap_location = False
+            union all
+                select scrap.product_id, scrap.location_id, {scrap_bucket},
+                    0, 0, 0, 0, scrap.scrap_qty
+                from stock_scrap as scrap
+                    left join stock_move as sm on sm.id = scrap.move_id
+                where scrap.state = 'done' and sm.company_id = %(company_id)s
+                    and scrap.date_done between %(date_from)s and %(date_to)s
+                    and scrap.product_id = any(%(product_ids)s) and scrap.location_id = any(%(location_ids)s)
+            union all
+                select sm.product_id, sm.location_id, {sm_bucket},
+                    case when sl.usage in ('internal', 'transit') and sld.usage not in ('internal', 'transit')
+                              and sld.scrap_location = False
+                         then sm.product_uom_qty else 0 end,
+                    case when sl.usage = 'supplier' and sld.usage in ('internal', 'transit')
+                         then sm.product_uom_qty else 0 end,
+                    0, 0, 0
+                from stock_move as sm
+                    left join stock_location as sl on sl.id = sm.location_id
+                    left join stock_location as sld on sld.id = sm.location_dest_id
+                where sm.state = 'done' and sm.company_id = %(company_id)s
+                    and sm.date between %(date_from)s and %(date_to)s
+                    and sm.product_id = any(%(product_ids)s) and sm.location_id = any(%(location_ids)s)
+        )
+        select product_id, location_id, bucket,
+            coalesce(sum(sale), 0), coalesce(sum(purchase), 0), coalesce(sum(internal_adjust), 0),
+            coalesce(sum(adjustment), 0), coalesce(sum(scrapped), 0)
+        from moves
+        group by product_id, location_id, bucket
+        """.format(
+            sml_bucket=bucket.format(date='sml.date'),
+            scrap_bucket=bucket.format(date='scrap.date_done'),
+            sm_bucket=bucket.format(date='sm.date'),
+        ), params)
+
+        result = {}
+        for product_id, location_id, ks_bucket, *quantities in self.env.cr.fetchall():
+            result.setdefault((product_id, location_id), {})[ks_bucket] = tuple(quantities)
+        return result
+
     def ks_get_pro_data(self, data, start, stop):
         company = self.ks_company_id.id
         start = fields.Datetime.to_datetime(start)
@@ -342,11 +391,3 @@ class KSWarehouseReportAgeingWithMovement(models.Model):
             )
         )
         return self.env.cr.fetchall()
-
-
-    class KSWarehouseReportAgeingWithMovementOUT(models.Model):
-        _name = "ks.warehouse.report.ageing.with.movement.out"
-        _description = "Stock Ageing No Movement report Out"
-
-        datas = fields.Binary('File', readonly=True)
-        report_name = fields.Char('Report Name', readonly=True)
@@ -1,16 +1,11 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
 
-import base64
-from io import StringIO
 import logging
-import pathlib
-import os
 
 _log = logging.getLogger(__name__)
 
 try:
-    import openpyxl
     from openpyxl.styles import Border, Font, Alignment
 except ImportError:
     _log.debug('Can not `import openpyxl`.')
@@ -18,6 +13,7 @@ except ImportError:
 
 class KSWarehouseReportMeasures(models.Model):
     _name = "ks.warehouse.report.measure"
+    _inherit = ['ks.warehouse.report.xlsx.mixin']
     _description = "Stock Measures / Stock Report"
 
     ks_report = {'product_code': 0, 'product_type': 1, 'product_categ_id': 2, 'product_name': 3, 'location_id': 4,
@@ -92,11 +88,9 @@ class KSWarehouseReportMeasures(models.Model):
 
         sheet.freeze_panes = 'C10'
 
-    def ks_generate_xlsx_report(self):
+    def ks_render_xlsx_report(self):
         report_name = self.ks_name
-        workbook = openpyxl.Workbook()
-
-        sheet = workbook.active
+        sheet = self.ks_new_sheet(report_name)
 
         self.ks_create_workbook_header(report_name, sheet)
 
@@ -130,7 +124,7 @@ class KSWarehouseReportMeasures(models.Model):
         if datas:
             i = 1;
             row = 10;
-            for data in datas:
+            for data in self.ks_iter_progress(datas):
                 sheet.cell(row, 1, i)
                 sheet.cell(row, 2, data[0])
                 if data[1] == 'product':
@@ -171,33 +165,7 @@ class KSWarehouseReportMeasures(models.Model):
 
                 row += 1
                 i += 1
-        output = StringIO()
-        filename = (str(pathlib.Path(__file__).parent) + '/' + str(report_name) + '.xlsx')
-        _log.info("Filepath: %s" % (filename))
-        workbook.save(filename)
-        fp = open(filename, "rb")
-        file_data = fp.read()
-        out = base64.encodebytes(file_data)
-
-        # Files actions
-        attach_vals = {
-            'report_name': str(report_name) + '.xlsx',
-            'datas': out,
-        }
-
-        act_id = self.env['ks.warehouse.report.measure.out'].create(attach_vals)
-        fp.close()
-        os.remove(filename)
-        _log.info("File closed and removed.")
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'ks.warehouse.report.measure.out',
-            'res_id': act_id.id,
-            'view_type': 'form',
-            'view_mode': 'form',
-            'context': self.env.context,
-            'target': 'new',
-        }
+        return self.ks_save_report(sheet, report_name)
 
     
     def ks_purchase_product(self):
@@ -219,7 +187,7 @@ class KSWarehouseReportMeasures(models.Model):
         else:
             ks_dict = dict()
             for ks in purchase_date:  # product_id + location_id + company_id : qty_done(state=done)
-                ks_dict[str(ks[0]) + str(ks[2])] = ks[3]
+                ks_dict[(ks[0], ks[2])] = ks[3]
             purchase_date = ks_dict
         return purchase_date
 
@@ -245,7 +213,7 @@ class KSWarehouseReportMeasures(models.Model):
         else:
             ks_dict = dict()
             for ks in sale_date:  # product_id + location_id + company_id : qty_done(state=done)
-                ks_dict[str(ks[0]) + str(ks[2])] = ks[3]
+                ks_dict[(ks[0], ks[2])] = ks[3]
             sale_date = ks_dict
         return sale_date
 
@@ -271,7 +239,7 @@ class KSWarehouseReportMeasures(models.Model):
         else:
             ks_dict = dict()
             for ks in adjusted_date:  # product_id + location_id + company_id : Adjustment, internal(code ='internal')
-                ks_dict[str(ks[0]) + str(ks[1]) + str(ks[2])] = [ks[3], ks[4]]
+                ks_dict[(ks[0], ks[1], ks[2])] = [ks[3], ks[4]]
             adjusted_date = ks_dict
         return adjusted_date
 
@@ -316,7 +284,7 @@ class KSWarehouseReportMeasures(models.Model):
         else:
             ks_dict = dict()
             for ks in scrap_date:  # product_id + location_id + company_id : qty_done(state=done)
-                ks_dict[str(ks[0]) + str(ks[1]) + str(ks[2])] = ks[3]
+                ks_dict[(ks[0], ks[1], ks[2])] = ks[3]
             scrap_date = ks_dict
         return scrap_date
 
@@ -349,41 +317,37 @@ class KSWarehouseReportMeasures(models.Model):
 
     
     def ks_merge_data(self, datas, dates_in, adjusted={}, scrap={}, sale={}, purchase={}):
+        """ Join the valuation layers with the quant rows on (product, location, company)
+            through a dict. Sale and purchase are per (product, company) and only reported
+            on the first matching location. """
         ks_list = []
         kr = self.ks_report
         kid = self.kr_in_dates
+        ks_datas = {}
+        for data in datas:
+            ks_datas.setdefault((data[kr['product_id']], data[kr['location_id']], data[kr['company_id']]), []).append(data)
         for date in dates_in:
-            for data in datas:
-                dp_id, dl_id, dc_id = data[kr['product_id']], data[kr['location_id']], data[kr['company_id']]
-                if dp_id == date[kid['product_id']] and dl_id == date[kid['location_id']] and dc_id == date[kid['company_id']]:
-                    ks_adjusted = adjusted.get(str(dp_id) + str(dl_id) + str(dc_id), (0, 0))
-                    ks_scrap = scrap.get(str(dp_id) + str(dl_id) + str(dc_id), 0)
-                    ks_sale = sale.get(str(dp_id) + str(dc_id), 0)
-                    if ks_sale: del sale[str(dp_id) + str(dc_id)]
-                    ks_purchase = purchase.get(str(dp_id) + str(dc_id), 0)
-                    if ks_purchase: del purchase[str(dp_id) + str(dc_id)]
-                    ks_list.append(
-                        (data[kr['product_id']], data[kr['product_type']], data[kr['product_categ_id']],
-                         data[kr['product_name']], data[kr['location_id']], data[kr['company_id']],
-                         date[kid['opening_stock']], ks_sale, ks_purchase, ks_adjusted[1], ks_adjusted[0],
-                         ks_scrap, date[kid['closing_stock']]
-                         )
-                    )
+            ks_key = (date[kid['product_id']], date[kid['location_id']], date[kid['company_id']])
+            for data in ks_datas.get(ks_key, ()):
+                ks_adjusted = adjusted.get(ks_key, (0, 0))
+                ks_scrap = scrap.get(ks_key, 0)
+                ks_sale = sale.pop((ks_key[0], ks_key[2]), 0)
+                ks_purchase = purchase.pop((ks_key[0], ks_key[2]), 0)
+                ks_list.append(
+                    (data[kr['product_id']], data[kr['product_type']], data[kr['product_categ_id']],
+                     data[kr['product_name']], data[kr['location_id']], data[kr['company_id']],
+                     date[kid['opening_stock']], ks_sale, ks_purchase, ks_adjusted[1], ks_adjusted[0],
+                     ks_scrap, date[kid['closing_stock']]
+                     )
+                )
         if not ks_list:
             raise ValidationError(_("Opps! There are no data."))
         return ks_list
 
-    
+
     # def ks_apply_filter(self, data):
     #         # ks_data = self.ks_exhausted_filter(data)
     #         ks_data = data
     #         if not ks_data:
     #             raise ValidationError(_("Opps! There are no data."))
     #         return ks_data
-
-    class KSWarehouseReportMeasureOUT(models.Model):
-        _name = "ks.warehouse.report.measure.out"
-        _description = "Stock Measure report Out"
-
-        datas = fields.Binary('File', readonly=True)
-        report_name = fields.Char('Report Name', readonly=True)
@@ -1,16 +1,11 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
 
-import base64
-from io import StringIO
 import logging
-import pathlib
-import os
 
 _log = logging.getLogger(__name__)
 
 try:
-    import openpyxl
     from openpyxl.styles import Border, Font, Alignment
 except ImportError:
     _log.debug('Can not `import openpyxl`.')
@@ -18,6 +13,7 @@ except ImportError:
 
 class KSWarehouseReportmovements(models.Model):
     _name = "ks.warehouse.report.movement"
+    _inherit = ['ks.warehouse.report.xlsx.mixin']
     _description = "Stock movements / Stock Report"
 
     ks_report = {'product_code': 0, 'product_type': 1, 'product_categ_id': 2, 'product_name': 3, 'location_id': 4,
@@ -107,11 +103,9 @@ class KSWarehouseReportmovements(models.Model):
 
         sheet.freeze_panes = 'C10'
 
-    def ks_generate_xlsx_report(self):
+    def ks_render_xlsx_report(self):
         report_name = self.ks_name
-        workbook = openpyxl.Workbook()
-
-        sheet = workbook.active
+        sheet = self.ks_new_sheet(report_name)
 
         self.ks_create_workbook_header(report_name, sheet)
 
@@ -135,7 +129,7 @@ class KSWarehouseReportmovements(models.Model):
         if datas:
             i = 1;
             row = 10;
-            for data in datas:
+            for data in self.ks_iter_progress(datas):
                 sheet.cell(row, 1, i)
                 sheet.cell(row, 2, data[0])
                 if data[1] == 'product':
@@ -169,33 +163,7 @@ class KSWarehouseReportmovements(models.Model):
 
                 row += 1
                 i += 1
-        output = StringIO()
-        filename = (str(pathlib.Path(__file__).parent) + '/' + str(report_name) + '.xlsx')
-        _log.info("Filepath: %s" % (filename))
-        workbook.save(filename)
-        fp = open(filename, "rb")
-        file_data = fp.read()
-        out = base64.encodebytes(file_data)
-
-        # Files actions
-        attach_vals = {
-            'report_name': str(report_name) + '.xlsx',
-            'datas': out,
-        }
-
-        act_id = self.env['ks.warehouse.report.movement.out'].create(attach_vals)
-        fp.close()
-        os.remove(filename)
-        _log.info("File closed and removed.")
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'ks.warehouse.report.movement.out',
-            'res_id': act_id.id,
-            'view_type': 'form',
-            'view_mode': 'form',
-            'context': self.env.context,
-            'target': 'new',
-        }
+        return self.ks_save_report(sheet, report_name)
 
 
     def ks_operations(self):
@@ -273,10 +241,3 @@ class KSWarehouseReportmovements(models.Model):
     #         if not ks_data:
     #             raise ValidationError(_("Opps! There are no data."))
     #         return ks_data
-
-    class KSWarehouseReportmovementOUT(models.Model):
-        _name = "ks.warehouse.report.movement.out"
-        _description = "Stock movement report Out"
-
-        datas = fields.Binary('File', readonly=True)
-        report_name = fields.Char('Report Name', readonly=True)
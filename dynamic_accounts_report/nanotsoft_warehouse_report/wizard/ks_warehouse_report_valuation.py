@@ -1,16 +1,11 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
 
-import base64
-from io import StringIO
 import logging
-import pathlib
-import os
 
 _log = logging.getLogger(__name__)
 
 try:
-    import openpyxl
     from openpyxl.styles import Border, Font, Alignment
 except ImportError:
     _log.debug('Can not `import openpyxl`.')
@@ -19,6 +14,7 @@ except ImportError:
 
 class KSWarehouseReportValuation(models.Model):
     _name = "ks.warehouse.report.valuation"
+    _inherit = ['ks.warehouse.report.xlsx.mixin']
     _description = "Stock Valuation report"
     # _auto = False
 
@@ -102,11 +98,9 @@ class KSWarehouseReportValuation(models.Model):
 
         sheet.freeze_panes = 'C10'
 
-    def ks_generate_xlsx_report(self):
+    def ks_render_xlsx_report(self):
         report_name = self.ks_name
-        workbook = openpyxl.Workbook()
-
-        sheet = workbook.active
+        sheet = self.ks_new_sheet(report_name)
 
         self.ks_create_workbook_header(report_name, sheet)
 
@@ -143,7 +137,7 @@ class KSWarehouseReportValuation(models.Model):
 
         if datas:
             i = 1; row = 10; col = 0
-            for data in datas:
+            for data in self.ks_iter_progress(datas):
                 # if (not self.location_id or self.location.id == data[4]) or (not self.location_id or self.location.id == data[4])
                 sheet.cell(row, 1, i)
                 sheet.cell(row, 2, data[0])
@@ -188,33 +182,7 @@ class KSWarehouseReportValuation(models.Model):
 
                 row += 1
                 i += 1
-        output = StringIO()
-        filename = (str(pathlib.Path(__file__).parent) + '/' + str(report_name) + '.xlsx')
-        _log.info("Filepath: %s" % (filename))
-        workbook.save(filename)
-        fp = open(filename, "rb")
-        file_data = fp.read()
-        out = base64.encodebytes(file_data)
-
-        # Files actions
-        attach_vals = {
-            'report_name': str(report_name) + '.xlsx',
-            'datas': out,
-        }
-
-        act_id = self.env['ks.warehouse.report.valuation.out'].create(attach_vals)
-        fp.close()
-        os.remove(filename)
-        _log.info("File closed and removed.")
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'ks.warehouse.report.valuation.out',
-            'res_id': act_id.id,
-            'view_type': 'form',
-            'view_mode': 'form',
-            'context': self.env.context,
-            'target': 'new',
-        }
+        return self.ks_save_report(sheet, report_name)
 
 
     def ks_action_generate_report(self):
@@ -276,7 +244,7 @@ class KSWarehouseReportValuation(models.Model):
         else:
             ks_dict = dict()
             for ks in scrap_date: # product_id + location_id + company_id : qty_done(state=done)
-                ks_dict[str(ks[0])+str(ks[1])+str(ks[2])] = ks[3]
+                ks_dict[(ks[0], ks[1], ks[2])] = ks[3]
             scrap_date = ks_dict
         return scrap_date
 
@@ -300,7 +268,7 @@ class KSWarehouseReportValuation(models.Model):
         else:
             ks_dict = dict()
             for ks in adjusted_date: # product_id + location_id + company_id : qty_done(state=done)
-                ks_dict[str(ks[0])+str(ks[1])+str(ks[2])] = ks[3]
+                ks_dict[(ks[0], ks[1], ks[2])] = ks[3]
             adjusted_date = ks_dict
         return adjusted_date
 
@@ -333,38 +301,41 @@ class KSWarehouseReportValuation(models.Model):
 
 
     def ks_merge_data(self, datas, dates_in, adjusted={}, scrap={}):
+        """ Join the valuation layers with the quant rows on (product, location, company)
+            through a dict; one row per product, costs read once for all products. """
         ks_list = []
         kr = self.ks_report
         kid = self.kr_in_dates
+        ks_datas = {}
+        for data in datas:
+            ks_datas.setdefault((data[kr['product_id']], data[kr['location_id']], data[kr['company_id']]), data)
+        ks_matches = []
         for date in dates_in:
-            for data in datas:
-                dp_id, dl_id, dc_id= data[kr['product_id']], data[kr['location_id']], data[kr['company_id']]
-                if dp_id == date[kid['product_id']] and dl_id == date[kid['location_id']] and dc_id == date[kid['company_id']]:
-                    ks_cost = self.env['product.product'].browse(date[kid['product_id']]).product_tmpl_id.standard_price
-                    ks_adjusted = adjusted.get(str(dp_id)+str(dl_id)+str(dc_id), 0)
-                    ks_scrap = scrap.get(str(dp_id)+str(dl_id)+str(dc_id), 0)
-                    ks_qty_available = date[kid['qty_date']]
-                    if not self.ks_show_exhausted:
-                        if ks_qty_available < 0: ks_qty_available = 'not_allowed'
-                    if ks_qty_available != 'not_allowed':
-                        ks_data = 0
-                        for rec in ks_list:
-                            if rec[0] == data[kr['product_id']]:
-                                ks_data = 1
-                        if not ks_data:
-                            ks_list.append(
-                                (data[kr['product_id']], data[kr['product_type']], data[kr['product_categ_id']],
-                                 data[kr['product_name']], data[kr['location_id']], data[kr['company_id']],
-                                 date[kid['qty_date']], ks_cost, data[kr['product_sales_price']],
-                                 date[kid['opening_stock']],
-                                 date[kid['opening_stock']] * ks_cost, date[kid['closing_stock']],
-                                 date[kid['closing_stock']] * ks_cost, ks_adjusted, ks_adjusted * ks_cost,
-                                 ks_scrap, ks_scrap * ks_cost,
-                                 date[kid['closing_stock']] - ks_adjusted-ks_scrap,
-                                 (date[kid['closing_stock']] - ks_adjusted-ks_scrap) * ks_cost, data[kr['product_barcode']]
-
-                                 )
-                            )
+            ks_key = (date[kid['product_id']], date[kid['location_id']], date[kid['company_id']])
+            data = ks_datas.get(ks_key)
+            if data and (self.ks_show_exhausted or date[kid['qty_date']] >= 0):
+                ks_matches.append((ks_key, date, data))
+        ks_costs = self.ks_get_product_costs(ks_key[0] for ks_key, date, data in ks_matches)
+        ks_products = set()
+        for ks_key, date, data in ks_matches:
+            if data[kr['product_id']] in ks_products:
+                continue
+            ks_products.add(data[kr['product_id']])
+            ks_cost = ks_costs.get(ks_key[0], 0.0)
+            ks_adjusted = adjusted.get(ks_key, 0)
+            ks_scrap = scrap.get(ks_key, 0)
+            ks_list.append(
+                (data[kr['product_id']], data[kr['product_type']], data[kr['product_categ_id']],
+                 data[kr['product_name']], data[kr['location_id']], data[kr['company_id']],
+                 date[kid['qty_date']], ks_cost, data[kr['product_sales_price']],
+                 date[kid['opening_stock']],
+                 date[kid['opening_stock']] * ks_cost, date[kid['closing_stock']],
+                 date[kid['closing_stock']] * ks_cost, ks_adjusted, ks_adjusted * ks_cost,
+                 ks_scrap, ks_scrap * ks_cost,
+                 date[kid['closing_stock']] - ks_adjusted-ks_scrap,
+                 (date[kid['closing_stock']] - ks_adjusted-ks_scrap) * ks_cost, data[kr['product_barcode']]
+                 )
+            )
         if not ks_list:
             raise ValidationError(_("Opps! There are no data."))
         return ks_list
@@ -386,10 +357,3 @@ class KSWarehouseReportValuation(models.Model):
     #     else:
     #         ks_data = data
     #     return ks_data
-
-class KSWarehouseReportValuationOUT(models.Model):
-    _name = "ks.warehouse.report.valuation.out"
-    _description = "Stock Valuation report Out"
-
-    datas = fields.Binary('File', readonly=True)
-    report_name = fields.Char('Report Name', readonly=True)
@@ -14,6 +14,8 @@ odoo.define('dynamic_accounts_report.general_ledger', function(require) {
 	var datepicker = require('web.datepicker');
 	var time = require('web.time');
 	window.click_num = 0;
+	// Jumlah move line per halaman saat akun dibuka di tampilan dinamis
+	var GL_LINE_PAGE_SIZE = 200;
 	var GeneralLedger = AbstractAction.extend({
 		template: 'GeneralTemp',
 		events: {
@@ -23,6 +25,7 @@ odoo.define('dynamic_accounts_report.general_ledger', function(require) {
 			'click #pdf': 'print_pdf',
 			'click #xlsx': 'print_xlsx',
 			'click .gl-line': 'show_drop_down',
+			'click .gl-load-more': 'load_more_lines',
 			'click .view-account-move': 'view_acc_move',
 			'mousedown div.input-group.date[data-target-input="nearest"]': '_onCalendarIconClick',
 		},
@@ -95,7 +98,7 @@ odoo.define('dynamic_accounts_report.general_ledger', function(require) {
 					model: 'account.general.ledger',
 					method: 'view_report',
 					args: [
-						[this.wizard_id], action_title
+						[this.wizard_id], action_title, true
 					],
 				}).then(function(datas) {
 					//                    _.each(datas['report_lines'], function(rep_lines) {
@@ -264,7 +267,7 @@ odoo.define('dynamic_accounts_report.general_ledger', function(require) {
 					model: 'account.general.ledger',
 					method: 'get_accounts_line',
 					args: [
-						[self.wizard_id], account_id, action_title
+						[self.wizard_id], account_id, action_title, offset, GL_LINE_PAGE_SIZE
 					],
 				}).then(function(data) {
 					//                    _.each(data['report_lines'], function(rep_lines) {
@@ -288,6 +291,9 @@ odoo.define('dynamic_accounts_report.general_ledger', function(require) {
 									currency_symbol: data.currency[0],
 									id: data['report_lines'][i]['id'],
 									currency_position: data.currency[1],
+									has_more: data['has_more'],
+									next_offset: offset + data['report_lines'][i]['move_lines'].length,
+									next_balance: self._running_balance(0, data['report_lines'][i]['move_lines']),
 
 								}))
 							$(event.currentTarget).next('tr').find('td ul li:first a').css({
@@ -301,6 +307,53 @@ odoo.define('dynamic_accounts_report.general_ledger', function(require) {
 			}
 		},
 
+		_running_balance: function(balance_start, move_lines) {
+			var balance = balance_start;
+			_.each(move_lines, function(move_line) {
+				balance = Math.round((balance + move_line.balance) * 100) / 100;
+			});
+			return balance;
+		},
+
+		load_more_lines: function(event) {
+			event.preventDefault();
+			event.stopPropagation();
+			var self = this;
+			var $link = $(event.currentTarget);
+			var $row = $link.closest('tr');
+			var account_id = $link.data('account-id');
+			var offset = $link.data('offset');
+			var balance_start = parseFloat($link.data('balance')) || 0;
+			$link.remove();
+			self._rpc({
+				model: 'account.general.ledger',
+				method: 'get_accounts_line',
+				args: [
+					[self.wizard_id], account_id, self._title, offset, GL_LINE_PAGE_SIZE
+				],
+			}).then(function(data) {
+				var account = _.find(data['report_lines'], function(line) {
+					return line['id'] == account_id;
+				});
+				var move_lines = account ? account['move_lines'] : [];
+				$row.before(QWeb.render('SubSectionLines', {
+					account_data: move_lines,
+					currency_symbol: data.currency[0],
+					currency_position: data.currency[1],
+					balance_start: balance_start,
+				}));
+				if (data['has_more']) {
+					$row.find('td').append($('<a href="#" class="gl-load-more"/>')
+						.text(_t('Load more lines'))
+						.attr('data-account-id', account_id)
+						.attr('data-offset', offset + move_lines.length)
+						.attr('data-balance', self._running_balance(balance_start, move_lines)));
+				} else {
+					$row.remove();
+				}
+			});
+		},
+
 		view_acc_move: function(event) {
 			event.preventDefault();
 			var self = this;
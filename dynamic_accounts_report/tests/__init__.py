@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+from . import test_balance_sheet_report
+from . import test_account_balance_snapshot
+from . import test_trial_balance
+from . import test_daybook
+from . import test_general_ledger
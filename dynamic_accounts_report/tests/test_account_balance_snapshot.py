@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestAccountBalanceSnapshot(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.snapshot = cls.env['account.balance.snapshot']
+        cls.company = cls.company_data['company']
+        cls.journal = cls.company_data['default_journal_misc']
+        cls.account = cls.env['account.account'].create({
+            'name': 'Snapshot Asset',
+            'code': 'SNAP001',
+            'account_type': 'asset_current',
+            'company_id': cls.company.id,
+        })
+        cls.counterpart = cls.company_data['default_account_revenue']
+        cls.snapshot.rebuild()
+
+    def _create_move(self, move_date, amount, post=True):
+        move = self.env['account.move'].create({
+            'move_type': 'entry',
+            'date': move_date,
+            'journal_id': self.journal.id,
+            'line_ids': [
+                (0, 0, {'account_id': self.account.id, 'debit': amount, 'credit': 0.0}),
+                (0, 0, {'account_id': self.counterpart.id, 'debit': 0.0, 'credit': amount}),
+            ],
+        })
+        if post:
+            move.action_post()
+        return move
+
+    def _opening(self, date_from):
+        return self.snapshot.get_opening_balances(
+            [self.company.id], [self.account.id], date_from).get(self.account.id)
+
+    def test_post_draft_cancel_maintain_snapshot(self):
+        move_1 = self._create_move(date(2024, 1, 10), 100.0)
+        move_2 = self._create_move(date(2024, 1, 10), 50.0)
+        self._create_move(date(2024, 2, 1), 30.0)
+
+        opening = self._opening(date(2024, 2, 1))
+        self.assertAlmostEqual(opening['debit'], 150.0)
+        self.assertAlmostEqual(opening['balance'], 150.0)
+        self.assertEqual(opening['line_count'], 2)
+
+        move_1.button_draft()
+        self.assertAlmostEqual(self._opening(date(2024, 2, 1))['balance'], 50.0)
+
+        move_2.button_draft()
+        move_2.button_cancel()
+        self.assertFalse(self._opening(date(2024, 2, 1)))
+
+        move_1.action_post()
+        self.assertAlmostEqual(self._opening(date(2024, 3, 1))['balance'], 130.0)
+
+    def test_rebuild_matches_incremental(self):
+        for day in range(1, 6):
+            self._create_move(date(2024, 3, day), 10.0 * day)
+        self._create_move(date(2024, 3, 2), 99.0, post=False)
+        incremental = self.snapshot.search_read(
+            [('account_id', '=', self.account.id)], ['date', 'debit', 'credit', 'balance', 'line_count'])
+
+        self.snapshot.rebuild(company_ids=self.company.ids)
+        rebuilt = self.snapshot.search_read(
+            [('account_id', '=', self.account.id)], ['date', 'debit', 'credit', 'balance', 'line_count'])
+
+        strip = lambda rows: sorted((r['date'], r['debit'], r['credit'], r['balance'], r['line_count']) for r in rows)
+        self.assertEqual(strip(incremental), strip(rebuilt))
+        self.assertEqual(len(rebuilt), 5)
+
+    def test_account_totals_use_snapshot_opening(self):
+        self._create_move(date(2024, 1, 5), 80.0)
+        self._create_move(date(2024, 4, 5), 20.0)
+        totals = self.env['account.ledger.aggregate'].get_account_totals(
+            self.company, [self.account.id], date_from=date(2024, 4, 1), date_to=date(2024, 4, 30))
+        amounts = totals[self.account.id]
+        self.assertAlmostEqual(amounts['opening_balance'], 80.0)
+        self.assertEqual(amounts['opening_count'], 1)
+        self.assertAlmostEqual(amounts['period_balance'], 20.0)
+        self.assertAlmostEqual(amounts['balance'], 100.0)
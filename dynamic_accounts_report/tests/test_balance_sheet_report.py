@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from datetime import date, timedelta
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.dynamic_accounts_report.models.balance_sheet_report import BS_ACCOUNT_TYPES
+from odoo.exceptions import AccessError
+from odoo.tests import tagged
+
+_logger = logging.getLogger(__name__)
+
+# Ukuran ledger yang digenerate untuk benchmark
+BENCH_ACCOUNTS = 60
+BENCH_MOVES = 600
+
+
+def _get_balance_sheet_lines_orm(report, filters, company):
+    """Implementasi lama (ORM, 2x search per akun), referensi uji kesamaan hasil & benchmark."""
+    accounts = report.env['account.account'].search([
+        ('account_type', 'in', BS_ACCOUNT_TYPES),
+        ('company_id', '=', company.id)
+    ])
+
+    analytic_ids = filters.get('analytic_account_ids') or []
+    apply_analytic = bool(filters.get('apply_analytic_on_bs'))
+    date_from = filters.get('date_from')
+    date_to = filters.get('date_to')
+    result = {'assets': [], 'liabilities': [], 'equity': []}
+
+    for account in accounts:
+        aml = report.env['account.move.line']
+
+        # === HITUNG OPENING BALANCE (jika ada date_from) ===
+        opening_balance = 0.0
+        opening_debit = 0.0
+        opening_credit = 0.0
+
+        if date_from:
+            domain_opening = [
+                ('account_id', '=', account.id),
+                ('move_id.state', '=', 'posted'),
+                ('company_id', '=', company.id),
+                ('date', '<', date_from)  # Sebelum periode
+            ]
+
+            # Filter analytic untuk opening (jika apply_analytic=True dan asset)
+            if analytic_ids and apply_analytic and 'asset' in account.account_type:
+                aal = report.env['account.analytic.line'].search([
+                    ('account_id', 'in', analytic_ids),
+                    ('company_id', '=', company.id),
+                ])
+                move_line_ids = set(aal.mapped('move_line_id').ids)
+                opening_lines = aml.search(domain_opening + [('id', 'in', list(move_line_ids))]) if move_line_ids else aml.search(domain_opening)
+                if not move_line_ids:
+                    opening_lines = opening_lines.filtered(
+                        lambda l: l.analytic_distribution and any(str(aid) in l.analytic_distribution for aid in analytic_ids)
+                    )
+            else:
+                opening_lines = aml.search(domain_opening)
+
+            opening_balance = sum(opening_lines.mapped('balance'))
+            opening_debit = sum(opening_lines.mapped('debit'))
+            opening_credit = sum(opening_lines.mapped('credit'))
+
+        # === HITUNG MOVEMENT PERIODE ===
+        domain_period = [
+            ('account_id', '=', account.id),
+            ('move_id.state', '=', 'posted'),
+            ('company_id', '=', company.id)
+        ]
+
+        if date_from:
+            domain_period.append(('date', '>=', date_from))
+        if date_to:
+            domain_period.append(('date', '<=', date_to))
+
+        # Filter analytic untuk period (jika apply_analytic=True dan asset)
+        if analytic_ids and apply_analytic and 'asset' in account.account_type:
+            aal = report.env['account.analytic.line'].search([
+                ('account_id', 'in', analytic_ids),
+                ('company_id', '=', company.id),
+            ])
+            move_line_ids = set(aal.mapped('move_line_id').ids)
+            period_lines = aml.search(domain_period + [('id', 'in', list(move_line_ids))]) if move_line_ids else aml.search(domain_period)
+            if not move_line_ids:
+                period_lines = period_lines.filtered(
+                    lambda l: l.analytic_distribution and any(str(aid) in l.analytic_distribution for aid in analytic_ids)
+                )
+        else:
+            period_lines = aml.search(domain_period)
+
+        period_balance = sum(period_lines.mapped('balance'))
+        period_debit = sum(period_lines.mapped('debit'))
+        period_credit = sum(period_lines.mapped('credit'))
+
+        # === TOTAL = OPENING + PERIOD ===
+        total_balance = opening_balance + period_balance
+        total_debit = opening_debit + period_debit
+        total_credit = opening_credit + period_credit
+
+        if total_balance != 0 or opening_balance != 0:  # Tampilkan jika ada opening atau movement
+            account_data = {
+                'id': account.id,
+                'code': account.code,
+                'name': account.name,
+                'type': account.account_type,
+                'opening_balance': opening_balance,
+                'opening_debit': opening_debit,
+                'opening_credit': opening_credit,
+                'period_balance': period_balance,
+                'period_debit': period_debit,
+                'period_credit': period_credit,
+                'balance': total_balance,
+                'debit': total_debit,
+                'credit': total_credit,
+                'company_id': company.id,
+                'company_name': company.name,
+            }
+
+            if 'asset' in account.account_type:
+                result['assets'].append(account_data)
+            elif 'liability' in account.account_type:
+                result['liabilities'].append(account_data)
+            elif 'equity' in account.account_type:
+                result['equity'].append(account_data)
+
+    # === HITUNG P&L UNTUK PERIODE ===
+    report._append_profit_loss_line(result, filters, company)
+    return result
+
+
+@tagged('post_install', '-at_install')
+class TestBalanceSheetReport(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.report = cls.env['account.balance.sheet.report']
+        cls.company = cls.company_data['company']
+        cls.journal = cls.company_data['default_journal_misc']
+        cls.bench_accounts = cls.env['account.account'].create([{
+            'name': 'Bench Asset %s' % index,
+            'code': 'BENCH%04d' % index,
+            'account_type': 'asset_current',
+            'company_id': cls.company.id,
+        } for index in range(BENCH_ACCOUNTS)])
+        cls._generate_ledger(BENCH_MOVES)
+
+    @classmethod
+    def _generate_ledger(cls, move_count):
+        """Buat ledger sintetis: setiap move mendebit akun bench dan mengkredit payable/revenue."""
+        counterparts = [
+            cls.company_data['default_account_payable'],
+            cls.company_data['default_account_revenue'],
+        ]
+        start = date(2023, 1, 1)
+        vals_list = []
+        for index in range(move_count):
+            amount = 100.0 + (index % 37) * 3.5
+            account = cls.bench_accounts[index % len(cls.bench_accounts)]
+            counterpart = counterparts[index % len(counterparts)]
+            vals_list.append({
+                'move_type': 'entry',
+                'date': start + timedelta(days=index % 730),
+                'journal_id': cls.journal.id,
+                'line_ids': [
+                    (0, 0, {'account_id': account.id, 'debit': amount, 'credit': 0.0}),
+                    (0, 0, {'account_id': counterpart.id, 'debit': 0.0, 'credit': amount}),
+                ],
+            })
+        moves = cls.env['account.move'].create(vals_list)
+        moves.action_post()
+        return moves
+
+    def _filters(self, date_from=False, date_to=False):
+        return {
+            'date_from': date_from,
+            'date_to': date_to,
+            'company_id': self.company.id,
+            'company_name': self.company.name,
+            'analytic_account_ids': [],
+        }
+
+    def _assert_same_lines(self, expected, result):
+        for section in ('assets', 'liabilities', 'equity'):
+            self.assertEqual(
+                [line['id'] for line in expected[section]],
+                [line['id'] for line in result[section]],
+                "Accounts differ in section %s" % section)
+            for old, new in zip(expected[section], result[section]):
+                self.assertEqual(set(old), set(new))
+                for key, value in old.items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(value, new[key], places=2, msg="%s / %s" % (old['code'], key))
+                    else:
+                        self.assertEqual(value, new[key])
+
+    def test_balance_sheet_lines_match_orm(self):
+        for date_from, date_to in ((False, '2024-12-31'), ('2024-01-01', '2024-06-30'), (False, False)):
+            filters = self._filters(date_from, date_to)
+            self._assert_same_lines(
+                _get_balance_sheet_lines_orm(self.report, filters, self.company),
+                self.report._get_balance_sheet_lines(filters, self.company),
+            )
+
+    def test_balance_sheet_lines_benchmark(self):
+        filters = self._filters('2024-01-01', '2024-12-31')
+        timings = {}
+        methods = (
+            ('orm', lambda filters, company: _get_balance_sheet_lines_orm(self.report, filters, company)),
+            ('sql', self.report._get_balance_sheet_lines),
+        )
+        for label, method in methods:
+            self.env.invalidate_all()
+            queries_before = self.cr.sql_log_count
+            started = time.perf_counter()
+            method(filters, self.company)
+            timings[label] = (time.perf_counter() - started, self.cr.sql_log_count - queries_before)
+        _logger.info(
+            "Balance sheet benchmark (%s accounts, %s moves): orm %.3fs / %s queries, sql %.3fs / %s queries",
+            BENCH_ACCOUNTS, BENCH_MOVES,
+            timings['orm'][0], timings['orm'][1], timings['sql'][0], timings['sql'][1])
+        self.assertLess(timings['sql'][1], timings['orm'][1])
+
+    def test_detail_group_totals_and_pagination(self):
+        filters = self._filters('2024-01-01', '2024-12-31')
+        bs_lines = self.report._get_balance_sheet_lines(filters, self.company)
+        expected = {line['id']: line for line in bs_lines['assets']}
+
+        payload = self.report.asset_detail_group(
+            date_from='2024-01-01', date_to='2024-12-31', company_id=self.company.id)
+        accounts = [acc for group in payload['groups'] for acc in group['accounts']]
+        self.assertTrue(accounts)
+        for acc in accounts:
+            # Tanpa include_transactions tidak ada detail, tapi jumlahnya tetap ada
+            self.assertEqual(acc['period_transactions'], [])
+            self.assertAlmostEqual(acc['ending_balance'], expected[acc['account_id']]['balance'], places=2)
+
+        paged = self.report.asset_detail_group(
+            date_from='2024-01-01', date_to='2024-12-31', company_id=self.company.id,
+            include_transactions=True, transaction_limit=2, transaction_offset=1)
+        for group in paged['groups']:
+            for acc in group['accounts']:
+                self.assertLessEqual(len(acc['period_transactions']), 2)
+                self.assertEqual(
+                    len(acc['period_transactions']),
+                    max(0, min(2, acc['period_transaction_count'] - 1)))
+
+    def test_move_line_export_batches(self):
+        batches = list(self.report.iter_move_line_export_batches(
+            date_from='2023-01-01', date_to='2024-12-31', company_id=self.company.id, batch_size=97))
+        rows = [row for batch in batches for row in batch]
+        self.assertTrue(all(len(batch) <= 97 for batch in batches))
+        self.assertEqual(len(rows), len({row['id'] for row in rows}))
+        keys = [(row['account_id'], row['date'], row['id']) for row in rows]
+        self.assertEqual(keys, sorted(keys))
+        exported = self.report.export_all_move_lines(
+            date_from='2023-01-01', date_to='2024-12-31', company_id=self.company.id)
+        self.assertEqual(exported['total_lines'], len(rows))
+
+    def test_move_line_export_other_company_denied(self):
+        company_2 = self.company_data_2['company']
+        report = self.report.with_context(allowed_company_ids=self.company.ids)
+        with self.assertRaises(AccessError):
+            list(report.iter_move_line_export_batches(company_id=company_2.id))
+        with self.assertRaises(AccessError):
+            report.export_all_move_lines(company_id=company_2.id)
+
+    def test_report_worker_count_clamped(self):
+        self.env['ir.config_parameter'].sudo().set_param('dynamic_accounts_report.report_workers', 3)
+        self.assertEqual(self.report._get_report_worker_count(), 3)
+        self.assertEqual(self.report._get_report_worker_count(2), 2)
+        # Request tidak boleh melewati batas param sistem
+        self.assertEqual(self.report._get_report_worker_count(25), 3)
+        self.assertEqual(self.report._get_report_worker_count('25'), 3)
+        self.assertEqual(self.report._get_report_worker_count(-5), 1)
+        self.assertEqual(self.report._get_report_worker_count('abc'), 3)
+        self.env['ir.config_parameter'].sudo().set_param('dynamic_accounts_report.report_workers', 'abc')
+        self.assertEqual(self.report._get_report_worker_count(), 4)
+
+    def test_multi_company_execution_timing(self):
+        company_ids = [self.company.id, self.company_data_2['company'].id]
+        results = {}
+        for parallel in (True, False):
+            result = self.report.financial_report_combined_multi_company(
+                company_ids, date_from='2024-01-01', date_to='2024-12-31', parallel=parallel, max_workers=2)
+            self.assertEqual([entry['company']['id'] for entry in result['per_company']], company_ids)
+            self.assertIn(result['execution']['mode'], ('parallel', 'sequential'))
+            for entry in result['per_company']:
+                self.assertEqual(entry['status'], 'success')
+                self.assertGreaterEqual(entry.pop('elapsed_ms'), 0.0)
+            result.pop('execution')
+            results[parallel] = result
+        # Mode parallel dan sekuensial harus menghasilkan data yang sama
+        self.assertEqual(results[True], results[False])
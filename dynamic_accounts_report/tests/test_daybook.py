@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestDayBook(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.journal = cls.company_data['default_journal_misc']
+        cls.account = cls.company_data['default_account_expense']
+        cls.counterpart = cls.company_data['default_account_revenue']
+        moves = cls.env['account.move'].create([{
+            'move_type': 'entry',
+            'date': move_date,
+            'journal_id': cls.journal.id,
+            'line_ids': [
+                (0, 0, {'account_id': cls.account.id, 'debit': amount, 'credit': 0.0}),
+                (0, 0, {'account_id': cls.counterpart.id, 'debit': 0.0, 'credit': amount}),
+            ],
+        } for move_date, amount in (
+            (date(2022, 3, 1), 10.0), (date(2022, 3, 1), 15.0), (date(2023, 7, 9), 40.0))])
+        moves.action_post()
+        cls.daybook = cls.env['account.day.book']
+
+    def _report(self, date_from, date_to):
+        form = {
+            'date_from': str(date_from),
+            'date_to': str(date_to),
+            'target_move': 'posted',
+            'account_ids': (self.account | self.counterpart).ids,
+            'journal_ids': self.journal.ids,
+        }
+        self.env.flush_all()
+        queries = self.cr.sql_log_count
+        result = self.daybook._get_report_values({'form': form})
+        return result['Accounts'], self.cr.sql_log_count - queries
+
+    def test_daybook_groups_lines_per_date(self):
+        records, __ = self._report(date(2022, 1, 1), date(2023, 12, 31))
+        self.assertEqual([rec['date'] for rec in records], [date(2022, 3, 1), date(2023, 7, 9)])
+        self.assertEqual(len(records[0]['child_lines']), 4)
+        self.assertAlmostEqual(records[0]['debit'], 25.0)
+        self.assertAlmostEqual(records[0]['credit'], 25.0)
+        self.assertAlmostEqual(records[1]['balance'], 0.0)
+
+    def test_daybook_query_count_independent_of_range(self):
+        self._report(date(2022, 3, 1), date(2022, 3, 1))
+        __, single_day = self._report(date(2022, 3, 1), date(2022, 3, 1))
+        __, multi_year = self._report(date(2015, 1, 1), date(2024, 12, 31))
+        self.assertEqual(single_day, multi_year)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+from unittest.mock import patch
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestGeneralLedger(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.company = cls.company_data['company']
+        cls.journal = cls.company_data['default_journal_misc']
+        cls.account = cls.company_data['default_account_expense']
+        cls.counterpart = cls.company_data['default_account_revenue']
+        moves = cls.env['account.move'].create([{
+            'move_type': 'entry',
+            'date': date(2024, 1, day),
+            'journal_id': cls.journal.id,
+            'line_ids': [
+                (0, 0, {'account_id': cls.account.id, 'debit': 10.0 * day, 'credit': 0.0}),
+                (0, 0, {'account_id': cls.counterpart.id, 'debit': 0.0, 'credit': 10.0 * day}),
+            ],
+        } for day in range(1, 6)])
+        moves.action_post()
+        cls.wizard = cls.env['account.general.ledger'].create({
+            'journal_ids': [(6, 0, cls.journal.ids)],
+            'date_from': date(2024, 1, 1),
+            'date_to': date(2024, 1, 31),
+        })
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(
+            type(self.env['account.move.line']), 'get_current_company_value',
+            lambda _self: [self.company.id, 0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _lines(self, result):
+        account_line = next(line for line in result['report_lines'] if line['id'] == self.account.id)
+        return account_line['move_lines']
+
+    def test_index_move_lines_by_account(self):
+        lines = [{'account_id': 1, 'lid': 1}, {'account_id': 2, 'lid': 2}, {'account_id': 1, 'lid': 3}]
+        index = self.wizard._index_move_lines_by_account(lines)
+        self.assertEqual([line['lid'] for line in index[1]], [1, 3])
+        self.assertEqual([line['lid'] for line in index[2]], [2])
+
+    def test_account_lines_are_paged(self):
+        full = self.wizard.get_accounts_line(self.account.id, 'General Ledger')
+        self.assertEqual(len(self._lines(full)), 5)
+        self.assertFalse(full['has_more'])
+
+        first = self.wizard.get_accounts_line(self.account.id, 'General Ledger', 0, 3)
+        self.assertTrue(first['has_more'])
+        rest = self.wizard.get_accounts_line(self.account.id, 'General Ledger', 3, 3)
+        self.assertFalse(rest['has_more'])
+        self.assertEqual(
+            [line['lid'] for line in self._lines(first) + self._lines(rest)],
+            [line['lid'] for line in self._lines(full)])
+        self.assertEqual([line['ldate'] for line in self._lines(full)],
+                         [date(2024, 1, day) for day in range(1, 6)])
+
+    def test_lines_only_attached_to_their_account(self):
+        data = {
+            'display_account': 'movement',
+            'model': self.wizard,
+            'journals': self.journal,
+            'target_move': 'posted',
+            'accounts': self.env['account.account'],
+            'account_tags': self.env['account.account.tag'],
+            'analytics': self.env['account.analytic.account'],
+            'date_from': date(2024, 1, 1),
+            'date_to': date(2024, 1, 31),
+        }
+        records = self.wizard._get_report_value(data)
+        for res in records['Accounts']:
+            self.assertTrue(res['move_lines'])
+            self.assertTrue(all(line['account_id'] == res['account_id'] for line in res['move_lines']))
+        lazy = self.wizard._get_report_value(data, with_move_lines=False)
+        self.assertTrue(all(res['move_lines'] == [] for res in lazy['Accounts']))
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+from unittest.mock import patch
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.dynamic_accounts_report.models.account_balance_snapshot import SNAPSHOT_READY_PARAM
+from odoo.tests import tagged
+
+
+def _get_init_bal(wizard, account, data):
+    """Implementasi lama (1 query per akun), referensi uji kesamaan saldo awal."""
+    if data.get('date_from'):
+        tables, where_clause, where_params = wizard.env[
+            'account.move.line']._query_get()
+        tables = tables.replace('"', '')
+        if not tables:
+            tables = 'account_move_line'
+        wheres = [""]
+        if where_clause.strip():
+            wheres.append(where_clause.strip())
+        filters = " AND ".join(wheres)
+        if data['target_move'] == 'posted':
+            filters += " AND account_move_line.parent_state = 'posted'"
+        else:
+            filters += " AND account_move_line.parent_state in ('draft','posted')"
+        if data.get('date_from'):
+            filters += " AND account_move_line.date < '%s'" % data.get('date_from')
+
+        if data['journals']:
+            filters += ' AND jrnl.id IN %s' % str(tuple(data['journals'].ids) + tuple([0]))
+        tables += ' JOIN account_journal jrnl ON (account_move_line.journal_id=jrnl.id)'
+
+        # compute the balance, debit and credit for the provided accounts
+        request = (
+                "SELECT account_id AS id, SUM(debit) AS debit, SUM(credit) AS credit, (SUM(debit) - SUM(credit)) AS balance" + \
+                " FROM " + tables + " WHERE account_id = %s" % account.id + filters + " GROUP BY account_id")
+        params = tuple(where_params)
+        wizard.env.cr.execute(request, params)
+        for row in wizard.env.cr.dictfetchall():
+            return row
+
+
+@tagged('post_install', '-at_install')
+class TestTrialBalance(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.company = cls.company_data['company']
+        cls.journal = cls.company_data['default_journal_misc']
+        cls.counterpart = cls.company_data['default_account_revenue']
+        cls.wizard = cls.env['account.trial.balance'].create({})
+        cls.accounts = cls._create_accounts_with_moves(20, 'TBA')
+
+    @classmethod
+    def _create_accounts_with_moves(cls, count, prefix):
+        accounts = cls.env['account.account'].create([{
+            'name': '%s %s' % (prefix, index),
+            'code': '%s%04d' % (prefix, index),
+            'account_type': 'asset_current',
+            'company_id': cls.company.id,
+        } for index in range(count)])
+        moves = cls.env['account.move'].create([{
+            'move_type': 'entry',
+            'date': move_date,
+            'journal_id': cls.journal.id,
+            'line_ids': [
+                (0, 0, {'account_id': account.id, 'debit': 10.0 + index, 'credit': 0.0}),
+                (0, 0, {'account_id': cls.counterpart.id, 'debit': 0.0, 'credit': 10.0 + index}),
+            ],
+        } for index, account in enumerate(accounts) for move_date in (date(2024, 1, 15), date(2024, 6, 15))])
+        moves.action_post()
+        return accounts
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(
+            type(self.env['account.move.line']), 'get_current_company_value',
+            lambda _self: [self.company.id, 0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _data(self):
+        return {
+            'display_account': 'all',
+            'model': self.wizard,
+            'journals': self.env['account.journal'],
+            'target_move': 'posted',
+            'date_from': date(2024, 3, 1),
+            'date_to': date(2024, 12, 31),
+        }
+
+    def _report_queries(self, accounts):
+        self.env.flush_all()
+        queries = self.cr.sql_log_count
+        result = self.wizard._get_accounts(accounts, 'all', self._data())
+        return result, self.cr.sql_log_count - queries
+
+    def test_init_balances_match_per_account_query(self):
+        data = self._data()
+        for ready in (False, '1'):
+            self.env['ir.config_parameter'].sudo().set_param(SNAPSHOT_READY_PARAM, ready)
+            if ready:
+                self.env['account.balance.snapshot'].rebuild()
+            init_balances = self.wizard._get_init_balances(self.accounts, data)
+            for account in self.accounts:
+                expected = _get_init_bal(self.wizard, account, data)
+                self.assertAlmostEqual(init_balances[account.id]['debit'], expected['debit'])
+                self.assertAlmostEqual(init_balances[account.id]['credit'], expected['credit'])
+                self.assertAlmostEqual(init_balances[account.id]['balance'], expected['balance'])
+
+    def test_query_count_independent_of_account_count(self):
+        for ready in (False, '1'):
+            self.env['ir.config_parameter'].sudo().set_param(SNAPSHOT_READY_PARAM, ready)
+            # Pemanasan cache ORM (currency, company) agar hitungan sebanding
+            self._report_queries(self.accounts)
+            result, small_count = self._report_queries(self.accounts[:5])
+            self.assertEqual(len(result), 5)
+            result, large_count = self._report_queries(self.accounts)
+            self.assertEqual(len(result), len(self.accounts))
+            self.assertTrue(all(line['Init_balance'] for line in result))
+            self.assertLessEqual(large_count, small_count)
@@ -22,7 +22,7 @@
 import time
 
 from datetime import date
-from datetime import timedelta, datetime
+from datetime import datetime
 from odoo import fields, models, api, _
 import io
 import json
@@ -173,24 +173,19 @@ class AgeingView(models.TransientModel):
         date_start = datetime.strptime(str(form_data['date_from']),
                                        '%Y-%m-%d').date()
         date_end = datetime.strptime(str(form_data['date_to']), '%Y-%m-%d').date()
-        days = date_end - date_start
-        dates = []
+        # Satu query untuk seluruh rentang, dikelompokkan per tanggal di Python
+        entries = self._get_account_move_entries(
+            accounts, form_data, journals, date_start, date_end)
         record = []
-        for i in range(days.days + 1):
-            dates.append(date_start + timedelta(days=i))
-        for head in dates:
-            pass_date = str(head)
-            accounts_res = self._get_account_move_entry(
-                accounts, form_data,journals, pass_date)
-            if accounts_res['lines']:
-                record.append({
-                    'date': head,
-                    'debit': accounts_res['debit'],
-                    'credit': accounts_res['credit'],
-                    'balance': accounts_res['balance'],
-                    'child_lines': accounts_res['lines'],
-                    'id': accounts_res['move_id'],
-                })
+        for head, accounts_res in entries.items():
+            record.append({
+                'date': head,
+                'debit': accounts_res['debit'],
+                'credit': accounts_res['credit'],
+                'balance': accounts_res['balance'],
+                'child_lines': accounts_res['lines'],
+                'id': accounts_res['move_id'],
+            })
         return {
             'doc_ids': self.ids,
             'time': time,
@@ -218,16 +213,18 @@ class AgeingView(models.TransientModel):
         res = super(AgeingView, self).write(vals)
         return res
 
-    def _get_account_move_entry(self, accounts, form_data,journals, pass_date):
+    def _get_account_move_entries(self, accounts, form_data, journals, date_from, date_to):
+        """
+        Move line untuk seluruh rentang tanggal dalam satu query terurut,
+        dikelompokkan per tanggal. Hanya tanggal yang memiliki line yang muncul.
+
+        Return: {date: {debit, credit, balance, lines, move_id}} terurut menurut tanggal
+        """
         cr = self.env.cr
-        move_line = self.env['account.move.line']
-        tables, where_clause, where_params = move_line._query_get()
-        wheres = [""]
+        self.env['account.move.line'].check_access_rights('read')
         companies = self.env.companies.ids
         companies.append(0)
         target_move = "AND l.company_id in %s" % str(tuple(companies))
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
         if form_data['target_move'] == 'posted':
             target_move += " AND m.state = 'posted'"
         else:
@@ -235,7 +232,7 @@ class AgeingView(models.TransientModel):
         sql = ('''
                 SELECT l.id AS lid,m.id AS move_id, acc.name as accname, l.account_id AS account_id, l.date AS ldate, j.code AS lcode, l.currency_id, 
                 l.amount_currency, l.ref AS lref, l.name AS lname, COALESCE(l.debit,0) AS debit, COALESCE(l.credit,0) AS credit, 
-                COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) AS balance,
+                COALESCE(l.debit,0) - COALESCE(l.credit, 0) AS balance,
                 m.name AS move_name, c.symbol AS currency_code, p.name AS partner_name
                 FROM account_move_line l
                 JOIN account_move m ON (l.move_id=m.id)
@@ -243,30 +240,36 @@ class AgeingView(models.TransientModel):
                 LEFT JOIN res_partner p ON (l.partner_id=p.id)
                 JOIN account_journal j ON (l.journal_id=j.id)
                 JOIN account_account acc ON (l.account_id = acc.id) 
-                WHERE l.account_id IN %s AND l.journal_id IN %s ''' + target_move + ''' AND l.date = %s
-                GROUP BY l.id,m.id, l.account_id, l.date,
-                     j.code, l.currency_id, l.amount_currency, l.ref, l.name, m.name, c.symbol, p.name , acc.name
-                     ORDER BY l.date DESC
+                WHERE l.account_id IN %s AND l.journal_id IN %s ''' + target_move + ''' AND l.date >= %s AND l.date <= %s
+                ORDER BY l.date, l.id
         ''')
         params = (
-        tuple(accounts.ids), tuple(journals.ids), pass_date)
+        tuple(accounts.ids), tuple(journals.ids), date_from, date_to)
         cr.execute(sql, params)
-        data = cr.dictfetchall()
-
-        res = {}
-        debit = credit = balance = 0.00
-        id = ''
-        for line in data:
-            debit += line['debit']
-            credit += line['credit']
-            balance += line['balance']
-            id = line['move_id']
-        res['debit'] = debit
-        res['credit'] = credit
-        res['balance'] = balance
-        res['lines'] = data
-        res['move_id'] = id
-        return res
+
+        entries = {}
+        for line in cr.dictfetchall():
+            res = entries.get(line['ldate'])
+            if res is None:
+                res = entries[line['ldate']] = {
+                    'debit': 0.00, 'credit': 0.00, 'balance': 0.00,
+                    'lines': [], 'move_id': '',
+                }
+            res['debit'] += line['debit']
+            res['credit'] += line['credit']
+            res['balance'] += line['balance']
+            res['lines'].append(line)
+            res['move_id'] = line['move_id']
+        return entries
+
+    def _get_account_move_entry(self, accounts, form_data,journals, pass_date):
+        pass_date = datetime.strptime(str(pass_date), '%Y-%m-%d').date()
+        res = self._get_account_move_entries(
+            accounts, form_data, journals, pass_date, pass_date).get(pass_date)
+        return res or {
+            'debit': 0.00, 'credit': 0.00, 'balance': 0.00,
+            'lines': [], 'move_id': '',
+        }
 
     @api.model
     def _get_currency(self):
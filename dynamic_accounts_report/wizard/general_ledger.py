@@ -20,6 +20,7 @@
 #
 #############################################################################
 import time
+from collections import defaultdict
 from odoo import fields, models, api, _
 
 import io
@@ -57,7 +58,7 @@ class GeneralView(models.TransientModel):
     date_to = fields.Date(string='End Date')
 
     @api.model
-    def view_report(self, option, title):
+    def view_report(self, option, title, lazy_lines=False):
         r = self.env['account.general.ledger'].search([('id', '=', option[0])])
         self = r
         # Create a dictionary for title to journal type mapping
@@ -105,7 +106,8 @@ class GeneralView(models.TransientModel):
                 'date_to': r.date_to,
             })
         filters = self.get_filter(option)
-        records = self._get_report_value(data)
+        # Tampilan dinamis memuat move line per akun saat akun dibuka
+        records = self._get_report_value(data, with_move_lines=not lazy_lines)
         currency = self._get_currency()
         return {
             'name': title,
@@ -215,7 +217,7 @@ class GeneralView(models.TransientModel):
         filter_dict.update(default_filters)
         return filter_dict
 
-    def _get_report_value(self, data):
+    def _get_report_value(self, data, with_move_lines=True):
         docs = data['model']
         display_account = data['display_account']
         init_balance = True
@@ -230,22 +232,14 @@ class GeneralView(models.TransientModel):
             raise UserError(_("No Accounts Found! Please Add One"))
         account_res = self._get_accounts(accounts, init_balance,
                                          display_account, data)
-        list_ac = []
-        for rec in account_res:
-            list_ac.append(rec['account_id'])
-        title = "General Ledger"
-        account_line = self.get_accounts_line(list_ac, title)['report_lines']
-        acc_line_list = []
-        acc_line_list.clear()
-        for line in account_line[0]['move_lines']:
-            acc_line_list.append(line)
+        lines_by_account = {}
+        if with_move_lines:
+            list_ac = list({rec['account_id'] for rec in account_res})
+            title = "General Ledger"
+            __, move_lines = self._get_accounts_move_lines(list_ac, title)
+            lines_by_account = self._index_move_lines_by_account(move_lines)
         for res in account_res:
-            line_list = []
-            line_list.clear()
-            for line in acc_line_list:
-                if line['account_id'] == res['account_id']:
-                    line_list.append(line)
-            res['move_lines'] = line_list
+            res['move_lines'] = lines_by_account.get(res['account_id'], [])
         debit_total = 0
         debit_total = sum(x['debit'] for x in account_res)
         credit_total = sum(x['credit'] for x in account_res)
@@ -446,7 +440,46 @@ class GeneralView(models.TransientModel):
                           self.env.company.currency_id.position, lang]
         return currency_array
 
-    def get_accounts_line(self, account_id, title):
+    @api.model
+    def _index_move_lines_by_account(self, move_lines):
+        """Index move line per account_id (dict of lists, urutan query dipertahankan)."""
+        lines_by_account = defaultdict(list)
+        for line in move_lines:
+            lines_by_account[line['account_id']].append(line)
+        return lines_by_account
+
+    def get_accounts_line(self, account_id, title, offset=0, limit=None):
+        """
+        Move line per akun untuk tampilan dinamis. Dengan limit, hanya satu
+        halaman (offset/limit) yang dikirim dan 'has_more' menandai sisa line;
+        paging ditujukan untuk satu akun yang sedang dibuka.
+        """
+        accounts, move_lines = self._get_accounts_move_lines(
+            account_id, title, offset=offset,
+            limit=limit + 1 if limit else None)
+        has_more = bool(limit) and len(move_lines) > limit
+        if has_more:
+            move_lines = move_lines[:limit]
+        lines_by_account = self._index_move_lines_by_account(move_lines)
+        # Calculate the debit, credit and balance for Accounts
+        account_res = []
+        for account in accounts:
+            res = dict((fn, 0.0) for fn in ['credit', 'debit', 'balance'])
+            res['code'] = account.code
+            res['name'] = account.name
+            res['id'] = account.id
+            res['move_lines'] = lines_by_account.get(account.id, [])
+            account_res.append(res)
+        currency = self._get_currency()
+        return {
+            'report_lines': account_res,
+            'currency': currency,
+            'offset': offset,
+            'has_more': has_more,
+        }
+
+    def _get_accounts_move_lines(self, account_id, title, offset=0, limit=None):
+        """Akun terpilih dan move line-nya (urut date, id) dalam satu query."""
         # to get the english translation of the title
         record_id = self.env['ir.actions.client'].with_context(
             lang=self.env.user.lang). \
@@ -538,27 +571,14 @@ class GeneralView(models.TransientModel):
                 JOIN account_account a ON (l.account_id = a.id) '''
                + WHERE + new_final_filter + ''' GROUP BY l.id, m.id,  
                l.account_id, l.date, j.code, l.currency_id, l.amount_currency,
-               l.ref, l.name, m.name, c.symbol, c.position, p.name, anl.keys''')
+               l.ref, l.name, m.name, c.symbol, c.position, p.name, anl.keys
+               ORDER BY l.account_id, l.date, l.id, anl.keys''')
         params = tuple(where_params)
+        if limit:
+            sql += ' LIMIT %s OFFSET %s'
+            params += (int(limit), max(int(offset or 0), 0))
         cr.execute(sql, params)
-        account_ress = cr.dictfetchall()
-        i = 0
-        # Calculate the debit, credit and balance for Accounts
-        account_res = []
-        for account in accounts:
-            currency = (account.currency_id and account.currency_id or
-                        account.company_id.currency_id)
-            res = dict((fn, 0.0) for fn in ['credit', 'debit', 'balance'])
-            res['code'] = account.code
-            res['name'] = account.name
-            res['id'] = account.id
-            res['move_lines'] = account_ress
-            account_res.append(res)
-        currency = self._get_currency()
-        return {
-            'report_lines': account_res,
-            'currency': currency,
-        }
+        return accounts, cr.dictfetchall()
 
     def get_dynamic_xlsx_report(self, data, response, report_data, dfr_data):
         report_data_main = json.loads(report_data)
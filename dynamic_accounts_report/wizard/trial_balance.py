@@ -216,6 +216,9 @@ class TrialView(models.TransientModel):
         for row in self.env.cr.dictfetchall():
             account_result[row.pop('id')] = row
 
+        # Initial balance semua akun sekaligus (bukan satu query per akun)
+        init_balances = self._get_init_balances(accounts, data) if data.get('date_from') else {}
+
         account_res = []
         for account in accounts:
             res = dict((fn, 0.0) for fn in ['credit', 'debit', 'balance'])
@@ -225,7 +228,7 @@ class TrialView(models.TransientModel):
             res['id'] = account.id
             if data.get('date_from'):
 
-                res['Init_balance'] = self.get_init_bal(account, display_account, data)
+                res['Init_balance'] = init_balances.get(account.id)
 
             if account.id in account_result:
                 res['debit'] = account_result[account.id].get('debit')
@@ -242,37 +245,55 @@ class TrialView(models.TransientModel):
                 account_res.append(res)
         return account_res
 
-    def get_init_bal(self, account, display_account, data):
-        if data.get('date_from'):
-
-            tables, where_clause, where_params = self.env[
-                'account.move.line']._query_get()
-            tables = tables.replace('"', '')
-            if not tables:
-                tables = 'account_move_line'
-            wheres = [""]
-            if where_clause.strip():
-                wheres.append(where_clause.strip())
-            filters = " AND ".join(wheres)
-            if data['target_move'] == 'posted':
-                filters += " AND account_move_line.parent_state = 'posted'"
-            else:
-                filters += " AND account_move_line.parent_state in ('draft','posted')"
-            if data.get('date_from'):
-                filters += " AND account_move_line.date < '%s'" % data.get('date_from')
-
-            if data['journals']:
-                filters += ' AND jrnl.id IN %s' % str(tuple(data['journals'].ids) + tuple([0]))
-            tables += ' JOIN account_journal jrnl ON (account_move_line.journal_id=jrnl.id)'
+    def _get_init_balances(self, accounts, data):
+        """
+        Initial balance (date < date_from) untuk semua akun dalam satu query.
+        Untuk target move 'posted' dipakai account.balance.snapshot bila
+        sudah dibangun, selain itu satu query GROUP BY account_id.
+
+        Return: {account_id: {id, debit, credit, balance}}
+        """
+        if not accounts or not data.get('date_from'):
+            return {}
+        move_line = self.env['account.move.line']
+        snapshot = self.env['account.balance.snapshot'].sudo()
+        if data['target_move'] == 'posted' and snapshot._is_ready():
+            opening = snapshot.get_opening_balances(
+                move_line.get_current_company_value(), accounts.ids, data['date_from'],
+                journal_ids=data['journals'].ids if data['journals'] else None)
+            return {
+                account_id: {
+                    'id': account_id,
+                    'debit': values['debit'],
+                    'credit': values['credit'],
+                    'balance': values['debit'] - values['credit'],
+                }
+                for account_id, values in opening.items()
+            }
+
+        tables, where_clause, where_params = move_line._query_get()
+        tables = tables.replace('"', '')
+        if not tables:
+            tables = 'account_move_line'
+        wheres = [""]
+        if where_clause.strip():
+            wheres.append(where_clause.strip())
+        filters = " AND ".join(wheres)
+        if data['target_move'] == 'posted':
+            filters += " AND account_move_line.parent_state = 'posted'"
+        else:
+            filters += " AND account_move_line.parent_state in ('draft','posted')"
+        filters += " AND account_move_line.date < %s"
+        if data['journals']:
+            filters += ' AND jrnl.id IN %s' % str(tuple(data['journals'].ids) + tuple([0]))
+        tables += ' JOIN account_journal jrnl ON (account_move_line.journal_id=jrnl.id)'
 
-            # compute the balance, debit and credit for the provided accounts
-            request = (
-                    "SELECT account_id AS id, SUM(debit) AS debit, SUM(credit) AS credit, (SUM(debit) - SUM(credit)) AS balance" + \
-                    " FROM " + tables + " WHERE account_id = %s" % account.id + filters + " GROUP BY account_id")
-            params = tuple(where_params)
-            self.env.cr.execute(request, params)
-            for row in self.env.cr.dictfetchall():
-                return row
+        request = (
+                "SELECT account_id AS id, SUM(debit) AS debit, SUM(credit) AS credit, (SUM(debit) - SUM(credit)) AS balance" + \
+                " FROM " + tables + " WHERE account_id IN %s " + filters + " GROUP BY account_id")
+        params = (tuple(accounts.ids),) + tuple(where_params) + (data['date_from'],)
+        self.env.cr.execute(request, params)
+        return {row['id']: row for row in self.env.cr.dictfetchall()}
 
     @api.model
     def _get_currency(self):
@@ -1,6 +1,6 @@
 {
     'name': 'ILO Farming Perspective',
-    'version': '1.0',
+    'version': '1.1',
     'depends': [
         'base',
         'sale',
@@ -41,6 +41,8 @@
         'data/ir_sequence_data.xml',
         'data/ilo_sequence_data.xml',
         'data/ilo_farmer_sequence.xml',
+        'data/ilo_reference_cron.xml',
+        'data/qr_code_cron.xml',
     ],
     'installable': True,
     'application': True,
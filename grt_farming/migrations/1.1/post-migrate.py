@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """qr_code_image is now computed from qr.code: drop the PNGs it used to store."""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    attachments = env['ir.attachment'].search([
+        ('res_model', 'in', ('ownership.code', 'ownership.line')),
+        ('res_field', '=', 'qr_code_image'),
+    ])
+    _logger.info("Removing %s stored QR code images of ownership codes and lines", len(attachments))
+    attachments.unlink()
@@ -43,6 +43,7 @@ class IloReference(models.Model):
         reference_codes = ownership_code.reference_code.split(', ')  # Assuming reference_code is a comma-separated string
 
         ref = None  # Initialize ref to None
+        touched_references = self.browse()
 
         for reference_one in reference_codes:
             if ownership_line and ownership_line.specific_code == reference_one:
@@ -67,6 +68,7 @@ class IloReference(models.Model):
                 _logger.info("Found existing reference, updating the chain for reference: %s", reference_two)
                 existing_reference.update_reference_chain(ownership_code.name, ownership_code.id)
                 ref = existing_reference  # Mark ref as existing reference
+                touched_references |= ref
             else:
                 _logger.info("No existing reference found, creating a new reference chain for ownership code: %s", ownership_code.reference_code)
                 ref = self.create({
@@ -79,10 +81,11 @@ class IloReference(models.Model):
 
                 for link in ref.reference_link_ids:
                     link.parent_reference_id = ref.id  # Set the parent reference ID
+                touched_references |= ref
 
         if ref:
-            # Call populate_reference_summary only if a reference was created or updated
-            self.env['ilo.reference.summary'].populate_reference_summary()
+            # Only refresh the summary rows of the chains touched by this ownership code
+            self.env['ilo.reference.summary'].refresh_reference_summary(touched_references)
         else:
             _logger.warning("No references were created for ownership code: %s", ownership_code.reference_code)
 
@@ -117,8 +120,12 @@ class IloReference(models.Model):
                 ref.update_reference_chain(ownership_code.name, ownership_code.id)
                 _logger.info("Updated reference chain for ownership code: %s", reference_code)
 
-                # Check if this reference code exists in any of the summary's reference_2, reference_3, or reference_4 fields
+                # Summaries linked to a chain are rebuilt from the chain itself
+                self.env['ilo.reference.summary'].refresh_reference_summary(ref)
+
+                # Check if this reference code exists in any of the legacy summary's reference_2, reference_3, or reference_4 fields
                 summaries = self.env['ilo.reference.summary'].search([
+                    ('reference_id', '=', False),
                     '|', '|',
                     ('reference_2', '=', reference_code),
                     ('reference_3', '=', reference_code),
@@ -322,6 +329,11 @@ class IloReferenceSummary(models.Model):
     latest_quantity = fields.Float(string='Latest Quantity')
     date_created = fields.Datetime(string='Date Created', default=fields.Datetime.now)
     date_modified = fields.Datetime(string='Date Modified', compute='_compute_date_modified', store=True)
+    reference_id = fields.Many2one('ilo.reference', string='Reference Chain', ondelete='set null', index=True, readonly=True)
+
+    _sql_constraints = [
+        ('reference_id_uniq', 'unique(reference_id)', 'Each reference chain can only have one summary row.'),
+    ]
 
     @api.depends('reference_3', 'reference_4', 'reference_5')
     def _compute_date_modified(self):
@@ -348,73 +360,94 @@ class IloReferenceSummary(models.Model):
                 record.state = 'Unknown'  # Default state if no actor_ilo_associate is set
 
     @api.model
-    def populate_reference_summary(self):
-        existing_summaries = self.search([])
-        references = self.env['ilo.reference'].search([])
+    def _prepare_summary_values(self, ref):
+        """Build the summary row values of a single reference chain."""
+        links = ref.reference_link_ids
+        values = {
+            'reference_1': links[0].reference if len(links) > 0 else False,
+            'date_order_1': links[0].ownership_line_id.date_order if len(links) > 0 else False,
+            'actor_1': links[0].ownership_line_id.source_actor.id if len(links) > 0 and links[0].ownership_line_id.source_actor else False,
+            'kabupaten_1': links[0].ownership_line_id.kabupaten_id.id if len(links) > 0 and links[0].ownership_line_id.kabupaten_id else False,
+
+            # Gather the latest quantity from the last reference link
+            'latest_quantity': links[-1].ownership_code_id.total_requested_quantity if links else 0.0,
+        }
+        for index in range(2, 6):
+            link = links[index - 1] if len(links) >= index else None
+            values.update({
+                'reference_%s' % index: link.reference if link else False,
+                'date_order_%s' % index: link.ownership_code_id.date_order if link else False,
+                'actor_%s' % index: link.ownership_code_id.destination_actor.id if link and link.ownership_code_id.destination_actor else False,
+                'kabupaten_%s' % index: link.ownership_code_id.kabupaten_id.id if link and link.ownership_code_id.kabupaten_id else False,
+            })
+        return values
 
+    @api.model
+    def _get_legacy_summary_index(self, values_list):
+        """Index summaries created before rows were keyed on their chain.
+
+        Legacy rows are matched on their first two references so they get
+        adopted by their chain instead of being duplicated.
+        """
+        first_references = list({values['reference_1'] for values in values_list if values['reference_1']})
+        if not first_references:
+            return {}
+        legacy_summaries = self.search([
+            ('reference_id', '=', False),
+            ('reference_1', 'in', first_references),
+        ], order='id desc')
+        index = {}
+        for summary in legacy_summaries:
+            index.setdefault((summary.reference_1, summary.reference_2 or False), summary)
+        return index
+
+    @api.model
+    def refresh_reference_summary(self, references):
+        """Create or update the summary rows of the given reference chains only."""
+        references = references.filtered('reference_link_ids')
+        if not references:
+            return self.browse()
+
+        summaries = self.search([('reference_id', 'in', references.ids)])
+        summary_by_reference = {summary.reference_id.id: summary for summary in summaries}
+        values_by_reference = {ref.id: self._prepare_summary_values(ref) for ref in references}
+        legacy_index = self._get_legacy_summary_index([
+            values for ref_id, values in values_by_reference.items() if ref_id not in summary_by_reference
+        ])
+
+        vals_list = []
         for ref in references:
-            if ref.reference_link_ids:
-                # Gather references, dates, actors, kabupaten values
-                table_entry = {
-                    'reference_1': ref.reference_link_ids[0].reference if len(ref.reference_link_ids) > 0 else False,
-                    'date_order_1': ref.reference_link_ids[0].ownership_line_id.date_order if len(ref.reference_link_ids) > 0 else False,
-                    'actor_1': ref.reference_link_ids[0].ownership_line_id.source_actor.id if len(ref.reference_link_ids) > 0 and ref.reference_link_ids[0].ownership_line_id.source_actor else False,
-                    'kabupaten_1': ref.reference_link_ids[0].ownership_line_id.kabupaten_id.id if len(ref.reference_link_ids) > 0 and ref.reference_link_ids[0].ownership_line_id.kabupaten_id else False,
-
-                    'reference_2': ref.reference_link_ids[1].reference if len(ref.reference_link_ids) > 1 else False,
-                    'date_order_2': ref.reference_link_ids[1].ownership_code_id.date_order if len(ref.reference_link_ids) > 1 else False,
-                    'actor_2': ref.reference_link_ids[1].ownership_code_id.destination_actor.id if len(ref.reference_link_ids) > 1 and ref.reference_link_ids[1].ownership_code_id.destination_actor else False,
-                    'kabupaten_2': ref.reference_link_ids[1].ownership_code_id.kabupaten_id.id if len(ref.reference_link_ids) > 1 and ref.reference_link_ids[1].ownership_code_id.kabupaten_id else False,
-
-                    'reference_3': ref.reference_link_ids[2].reference if len(ref.reference_link_ids) > 2 else False,
-                    'date_order_3': ref.reference_link_ids[2].ownership_code_id.date_order if len(ref.reference_link_ids) > 2 else False,
-                    'actor_3': ref.reference_link_ids[2].ownership_code_id.destination_actor.id if len(ref.reference_link_ids) > 2 and ref.reference_link_ids[2].ownership_code_id.destination_actor else False,
-                    'kabupaten_3': ref.reference_link_ids[2].ownership_code_id.kabupaten_id.id if len(ref.reference_link_ids) > 2 and ref.reference_link_ids[2].ownership_code_id.kabupaten_id else False,
-
-                    'reference_4': ref.reference_link_ids[3].reference if len(ref.reference_link_ids) > 3 else False,
-                    'date_order_4': ref.reference_link_ids[3].ownership_code_id.date_order if len(ref.reference_link_ids) > 3 else False,
-                    'actor_4': ref.reference_link_ids[3].ownership_code_id.destination_actor.id if len(ref.reference_link_ids) > 3 and ref.reference_link_ids[3].ownership_code_id.destination_actor else False,
-                    'kabupaten_4': ref.reference_link_ids[3].ownership_code_id.kabupaten_id.id if len(ref.reference_link_ids) > 3 and ref.reference_link_ids[3].ownership_code_id.kabupaten_id else False,
-
-                    'reference_5': ref.reference_link_ids[4].reference if len(ref.reference_link_ids) > 4 else False,
-                    'date_order_5': ref.reference_link_ids[4].ownership_code_id.date_order if len(ref.reference_link_ids) > 4 else False,
-                    'actor_5': ref.reference_link_ids[4].ownership_code_id.destination_actor.id if len(ref.reference_link_ids) > 4 and ref.reference_link_ids[4].ownership_code_id.destination_actor else False,
-                    'kabupaten_5': ref.reference_link_ids[4].ownership_code_id.kabupaten_id.id if len(ref.reference_link_ids) > 4 and ref.reference_link_ids[4].ownership_code_id.kabupaten_id else False,
-                    
-                    # Gather the latest quantity from the last reference link
-                    'latest_quantity': ref.reference_link_ids[-1].ownership_code_id.total_requested_quantity if ref.reference_link_ids else 0.0,
-                }
-                _logger.debug("Processing reference: %s", ref.id)
-
-                # Check for an existing summary with the same reference, actor, kabupaten, and quantities
-                existing_summary = existing_summaries.filtered(lambda s: (
-                    s.reference_1 == table_entry['reference_1'] and
-                    s.reference_2 == table_entry['reference_2'] and
-                    s.reference_3 == table_entry['reference_3'] and
-                    s.reference_4 == table_entry['reference_4'] and
-                    s.reference_5 == table_entry['reference_5'] and
-                    s.actor_1 == table_entry['actor_1'] and
-                    s.actor_2 == table_entry['actor_2'] and
-                    s.actor_3 == table_entry['actor_3'] and
-                    s.actor_4 == table_entry['actor_4'] and
-                    s.actor_5 == table_entry['actor_5'] and
-                    s.kabupaten_1 == table_entry['kabupaten_1'] and
-                    s.kabupaten_2 == table_entry['kabupaten_2'] and
-                    s.kabupaten_3 == table_entry['kabupaten_3'] and
-                    s.kabupaten_4 == table_entry['kabupaten_4'] and
-                    s.kabupaten_5 == table_entry['kabupaten_5'] and
-                    s.latest_quantity == table_entry['latest_quantity']  # Match the latest quantity
-                ))
-
-                if existing_summary:
-                    _logger.info("Updating existing summary for reference: %s", ref.id)
-                    existing_summary.write(table_entry)
-                else:
-                    _logger.info("Creating new summary for reference: %s", ref.id)
-                    self.create(table_entry)
+            table_entry = dict(values_by_reference[ref.id], reference_id=ref.id)
+            summary = summary_by_reference.get(ref.id) or legacy_index.pop(
+                (table_entry['reference_1'], table_entry['reference_2']), False)
+            if summary:
+                _logger.debug("Updating existing summary for reference: %s", ref.id)
+                summary.write(table_entry)
+            else:
+                _logger.debug("Creating new summary for reference: %s", ref.id)
+                vals_list.append(table_entry)
+
+        if vals_list:
+            self.create(vals_list)
+        _logger.info("Refreshed reference summary for %s reference chain(s).", len(references))
+        return self.search([('reference_id', 'in', references.ids)])
+
+    @api.model
+    def populate_reference_summary(self, batch_size=1000):
+        """Full rebuild of the summary table, processed in batches of chains."""
+        reference_ids = self.env['ilo.reference'].search([]).ids
+        for start in range(0, len(reference_ids), batch_size):
+            batch = self.env['ilo.reference'].browse(reference_ids[start:start + batch_size])
+            self.refresh_reference_summary(batch)
+            # Keep the cache bounded on large traceability tables
+            self.env.invalidate_all()
 
         _logger.info("Population of reference summary table completed.")
 
+    @api.model
+    def _cron_populate_reference_summary(self):
+        self.populate_reference_summary()
+
 
 
 
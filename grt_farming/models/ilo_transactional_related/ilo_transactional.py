@@ -92,7 +92,7 @@ class OwnershipCode(models.Model):
 
     # QR Code Details
     qr_code_id = fields.Many2one('qr.code', string="QR Code")
-    qr_code_image = fields.Binary("Gambar QR Code", attachment=True)
+    qr_code_image = fields.Binary("Gambar QR Code", compute='_compute_qr_code_image')
 
     #ProductTransaction
     product_transaction_image_ownership_code = fields.Binary(string="Gambar Produk Jual")
@@ -406,15 +406,21 @@ class OwnershipCode(models.Model):
                 Date of Order: {self.date_order.strftime('%Y-%m-%d %H:%M:%S') if self.date_order else 'N/A'}
             """
             
-            # Create the QR code
-            qr_code = self.env['qr.code'].create({
+            # Reuse the QR code of an identical payload, or create it (rendered later)
+            qr_code = self.env['qr.code']._get_or_create([{
                 'name': self.name,
                 'data': qr_data
-            })
+            }])[0]
 
             # Link the QR code to the ownership code record
             self.qr_code_id = qr_code.id
-            self.qr_code_image = qr_code.qr_code
+
+    @api.depends('qr_code_id')
+    def _compute_qr_code_image(self):
+        # The image is stored once on qr.code; render it now if the cron did not yet
+        self.qr_code_id._render_pending()
+        for record in self:
+            record.qr_code_image = record.qr_code_id.qr_code
 
     def action_confirm(self):
         self.ensure_one()
@@ -584,7 +590,7 @@ class OwnershipLine(models.Model):
 
     # QR Code Information
     qr_code_id = fields.Many2one('qr.code', string="Rekor QR Code")
-    qr_code_image = fields.Binary("Gambar QR Code", attachment=True)
+    qr_code_image = fields.Binary("Gambar QR Code", compute='_compute_qr_code_image')
 
     # Stock Movement Link
     stock_move_id = fields.Many2one('ilo.stock_move', string='Pergerakan Stok', help="Pergerakan stok terkait untuk baris kepemilikan ini")
@@ -785,33 +791,35 @@ class OwnershipLine(models.Model):
             self.destination_location_id = location if location else False
 
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override the create method to also create a product history and update related ownership code."""
         
-        # Generate a unique transaction number
-        vals['transaction_number'] = self.get_unique_transaction_number()
+        # Generate unique transaction numbers for the whole batch
+        next_number = int(self.get_unique_transaction_number())
+        for offset, vals in enumerate(vals_list):
+            vals['transaction_number'] = f"{next_number + offset:03d}"
 
-        # Create the ownership line record
-        ownership_line = super(OwnershipLine, self).create(vals)
+        # Create the ownership line records
+        ownership_lines = super(OwnershipLine, self).create(vals_list)
 
         # Automatically set destination_actor from ownership_code if present
-        ownership_code = self.env['ownership.code'].browse(vals.get('ownership_code_id'))
-        if ownership_code:
-            ownership_line.destination_actor = ownership_code.destination_actor.id
+        for ownership_line in ownership_lines:
+            if ownership_line.ownership_code_id:
+                ownership_line.destination_actor = ownership_line.ownership_code_id.destination_actor.id
 
-        # Generate specific ownership code and QR code after record is created
-        ownership_line.generate_specific_ownership_code()
-        ownership_line.name = ownership_line.specific_code
-        ownership_line._generate_qr_code()
+        # Generate specific ownership codes, then the QR codes of the whole batch at once
+        ownership_lines.generate_specific_ownership_code()
+        for ownership_line in ownership_lines:
+            ownership_line.name = ownership_line.specific_code
+        ownership_lines._generate_qr_code()
 
         # Update the related ownership_code with the production code
-        if ownership_code:
-            ownership_code._compute_production_code()
-        ownership_line._update_quant_quantity_sold()
+        ownership_lines.ownership_code_id._compute_production_code()
+        ownership_lines._update_quant_quantity_sold()
 
 
-        return ownership_line
+        return ownership_lines
 
     def write(self, vals):
         """Override the write method to enforce state-based restrictions on field modifications
@@ -914,40 +922,47 @@ class OwnershipLine(models.Model):
         self.quant_id.adjust_quantity_sold(self.quantity)
 
     def _generate_qr_code(self):
+        records = self.filtered('specific_code')
+        qr_code_vals = []
+        for record in records:
+            # Prepare QR code data to include additional fields
+            qr_code_data = f"""
+                Transaction Code: {record.specific_code}
+                Seller: {record.source_actor.name or 'N/A'}
+                Seller Code: {record.source_actor_associate_code or 'N/A'}
+                Buyer: {record.destination_actor.name or 'N/A'}
+                Buyer Code: {record.destination_actor_associate_code or 'N/A'}
+                Date of Order: {record.date_order or 'N/A'}
+                Product: {record.product_id.display_name or 'N/A'}
+                Quantity: {record.quantity or 0} {record.product_uom_id.name or ''}
+                Production Code: {record.production_code or 'N/A'}
+                Price: {record.price or 0}
+                Value: {record.value or 0}
+            """
+            # Set up values for the QR code record creation
+            qr_code_vals.append({
+                'name': f"QR for {record.specific_code}",
+                'data': qr_code_data,
+            })
+        # Identical payloads share one QR code; images are rendered by the cron or on first view
+        qr_codes = self.env['qr.code']._get_or_create(qr_code_vals)
+        for record, qr_code_record in zip(records, qr_codes):
+            # Link the QR code to the current record
+            record.qr_code_id = qr_code_record.id
+
+    @api.depends('qr_code_id')
+    def _compute_qr_code_image(self):
+        # The image is stored once on qr.code; render it now if the cron did not yet
+        self.qr_code_id._render_pending()
         for record in self:
-            if record.specific_code:
-                # Prepare QR code data to include additional fields
-                qr_code_data = f"""
-                    Transaction Code: {record.specific_code}
-                    Seller: {record.source_actor.name or 'N/A'}
-                    Seller Code: {record.source_actor_associate_code or 'N/A'}
-                    Buyer: {record.destination_actor.name or 'N/A'}
-                    Buyer Code: {record.destination_actor_associate_code or 'N/A'}
-                    Date of Order: {record.date_order or 'N/A'}
-                    Product: {record.product_id.display_name or 'N/A'}
-                    Quantity: {record.quantity or 0} {record.product_uom_id.name or ''}
-                    Production Code: {record.production_code or 'N/A'}
-                    Price: {record.price or 0}
-                    Value: {record.value or 0}
-                """
-                # Set up values for the QR code record creation
-                qr_code_vals = {
-                    'name': f"QR for {record.specific_code}",
-                    'data': qr_code_data,
-                }
-                # Create the QR code in the 'qr.code' model
-                qr_code_record = self.env['qr.code'].create(qr_code_vals)
-                
-                # Link the newly created QR code to the current record
-                record.qr_code_id = qr_code_record.id
-                record.qr_code_image = qr_code_record.qr_code  # Store the generated image from qr.code
+            record.qr_code_image = record.qr_code_id.qr_code
 
     def action_view_qr_code(self):
         """Open QR Code image in a new window."""
         if self.qr_code_image:
             return {
                 'type': 'ir.actions.act_url',
-                'url': f'/web/content/{self._name}/{self.id}/qr_code_image',
+                'url': f'/web/content/qr.code/{self.qr_code_id.id}/qr_code',
                 'target': 'new',
             }
         else:
@@ -1,7 +1,15 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, exceptions, _
 import qrcode
 from io import BytesIO
 import base64
+import hashlib
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Number of QR images rendered per transaction by the render cron
+QR_RENDER_BATCH = 200
+
 
 class ILOQRCode(models.Model):
     _name = 'qr.code'
@@ -13,32 +21,95 @@ class ILOQRCode(models.Model):
     # Data to encode in the QR code
     data = fields.Text(string='Data', required=True)
 
-    # Field to store the QR code image
+    # SHA-256 of the data, used to share one QR code between identical payloads
+    data_hash = fields.Char(string='Data Hash', compute='_compute_data_hash', store=True, index=True)
+
+    # Field to store the QR code image, rendered by the cron or on first view
     qr_code = fields.Binary(string='QR Code Image', attachment=True)
 
     # Field to store the image filename
     qr_code_filename = fields.Char(string='QR Code Filename')
 
+    @api.depends('data')
+    def _compute_data_hash(self):
+        for record in self:
+            record.data_hash = self._hash_data(record.data) if record.data else False
+
     @api.model
-    def create(self, vals):
-        """Override create method to generate QR code and set a dynamic filename."""
-        if vals.get('data'):
-            # Generate the QR code image
-            vals['qr_code'] = self._generate_qr_code(vals['data'])
-            
-            # Set a dynamic filename based on the record's name or other context
-            name_part = vals.get('name', 'qr_code').replace(' ', '_')  # Replace spaces for filename compatibility
-            timestamp = fields.Datetime.now().strftime('%Y%m%d_%H%M%S')  # Add a timestamp
-            vals['qr_code_filename'] = f"{name_part}_{timestamp}.png"
-        
-        return super(ILOQRCode, self).create(vals)
+    def _hash_data(self, data):
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create method to set a dynamic filename and queue the QR code rendering."""
+        timestamp = fields.Datetime.now().strftime('%Y%m%d_%H%M%S')  # Add a timestamp
+        for vals in vals_list:
+            if vals.get('data') and not vals.get('qr_code_filename'):
+                # Set a dynamic filename based on the record's name or other context
+                name_part = vals.get('name', 'qr_code').replace(' ', '_')  # Replace spaces for filename compatibility
+                vals['qr_code_filename'] = f"{name_part}_{timestamp}.png"
+        records = super(ILOQRCode, self).create(vals_list)
+        if any(not vals.get('qr_code') for vals in vals_list):
+            self._trigger_render()
+        return records
 
     def write(self, vals):
-        """Override write method to regenerate QR code if data is updated."""
+        """Override write method to render the QR code again if data is updated."""
         if vals.get('data'):
-            vals['qr_code'] = self._generate_qr_code(vals['data'])
-            vals['qr_code_filename'] = 'qrcode.png'
-        return super(ILOQRCode, self).write(vals)
+            # Identical payloads share one QR code: changing it would change the QR
+            # of every other record; the caller must link a new one with _get_or_create
+            shared = self.filtered(lambda record: record._get_reference_count() > 1)
+            if shared:
+                raise exceptions.UserError(_(
+                    "The data of QR code %s cannot be changed: it is shared by several records.",
+                    ', '.join(shared.mapped('name'))))
+            vals['qr_code'] = False
+            vals.setdefault('qr_code_filename', 'qrcode.png')
+        res = super(ILOQRCode, self).write(vals)
+        if vals.get('data'):
+            self._trigger_render()
+        return res
+
+    def _get_reference_count(self):
+        """Number of ownership codes and lines using this QR code."""
+        self.ensure_one()
+        return sum(self.env[model].sudo().search_count([('qr_code_id', '=', self.id)])
+                   for model in ('ownership.code', 'ownership.line'))
+
+    @api.model
+    def _trigger_render(self):
+        """Wake the render cron up, unless it is already due to run."""
+        cron = self.env.ref('grt_farming.cron_render_qr_codes', raise_if_not_found=False)
+        if not cron:
+            return
+        cron = cron.sudo()
+        pending = self.env['ir.cron.trigger'].sudo().search([
+            ('cron_id', '=', cron.id),
+            ('call_at', '<=', fields.Datetime.now()),
+        ], limit=1)
+        if not pending:
+            cron._trigger()
+
+    @api.model
+    def _get_or_create(self, vals_list):
+        """Return one qr.code per vals (name, data), in the same order.
+
+        Identical payloads share the same record, whether it already exists or
+        appears several times in vals_list, so the image is rendered and stored once.
+        """
+        hashes = [self._hash_data(vals['data']) for vals in vals_list]
+        existing = self.search([('data_hash', 'in', list(set(hashes)))])
+        by_hash = {record.data_hash: record for record in existing}
+
+        to_create = {}
+        for data_hash, vals in zip(hashes, vals_list):
+            if data_hash not in by_hash:
+                to_create.setdefault(data_hash, vals)
+        if to_create:
+            created = self.create(list(to_create.values()))
+            by_hash.update(zip(to_create, created))
+
+        return [by_hash[data_hash] for data_hash in hashes]
 
     def _generate_qr_code(self, data):
         qr = qrcode.QRCode(version=1, box_size=10, border=4)
@@ -54,11 +125,20 @@ class ILOQRCode(models.Model):
         qr_code_image = base64.b64encode(img_io.getvalue()).decode('utf-8')  # Added decode
         return qr_code_image
 
+    def _render_pending(self):
+        """Render the QR code image of the records that do not have one yet."""
+        for record in self.sudo().filtered(lambda r: r.data and not r.qr_code):
+            record.qr_code = self._generate_qr_code(record.data)
 
-    @api.depends('data')
-    def _compute_qr_code(self):
-        """Compute QR code for existing records based on the data."""
-        for record in self:
-            if record.data:
-                record.qr_code = self._generate_qr_code(record.data)
-                record.qr_code_filename = 'qrcode.png'
+    @api.model
+    def _cron_render_qr_codes(self, limit=QR_RENDER_BATCH):
+        """Render the queued QR codes in batches, committing after each batch."""
+        while True:
+            records = self.sudo().search([('qr_code', '=', False), ('data', '!=', False)], limit=limit)
+            if not records:
+                break
+            records._render_pending()
+            _logger.info("Rendered %s QR codes", len(records))
+            if self.env.registry.in_test_mode():
+                break
+            self.env.cr.commit()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import base64
+
+from odoo import exceptions
+from odoo.tests.common import TransactionCase
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class TestQRCode(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.QRCode = cls.env['qr.code']
+        cls.cron = cls.env.ref('grt_farming.cron_render_qr_codes')
+        cls.partner = cls.env['res.partner'].create({'name': 'QR Buyer'})
+
+    def _trigger_count(self):
+        return self.env['ir.cron.trigger'].search_count([('cron_id', '=', self.cron.id)])
+
+    def test_get_or_create_deduplicates_payloads(self):
+        codes = self.QRCode._get_or_create([
+            {'name': 'QR A', 'data': 'payload A'},
+            {'name': 'QR B', 'data': 'payload B'},
+            {'name': 'QR A again', 'data': 'payload A'},
+        ])
+        self.assertEqual(codes[0], codes[2])
+        self.assertNotEqual(codes[0], codes[1])
+        self.assertEqual(self.QRCode.search_count([('data', 'in', ['payload A', 'payload B'])]), 2)
+
+        again = self.QRCode._get_or_create([{'name': 'QR A later', 'data': 'payload A'}])
+        self.assertEqual(again[0], codes[0])
+
+    def test_render_lazily(self):
+        code = self.QRCode._get_or_create([{'name': 'QR lazy', 'data': 'payload lazy'}])[0]
+        self.assertFalse(code.qr_code, "QR codes are not rendered when they are created")
+
+        code._render_pending()
+        self.assertEqual(base64.b64decode(code.qr_code)[:8], PNG_SIGNATURE)
+
+        pending = self.QRCode._get_or_create([{'name': 'QR cron', 'data': 'payload cron'}])[0]
+        self.QRCode._cron_render_qr_codes()
+        self.assertEqual(base64.b64decode(pending.qr_code)[:8], PNG_SIGNATURE)
+
+    def test_render_cron_triggered_once(self):
+        triggers = self._trigger_count()
+        for index in range(5):
+            self.QRCode._get_or_create([{'name': 'QR %s' % index, 'data': 'payload %s' % index}])
+        self.assertLessEqual(self._trigger_count() - triggers, 1)
+
+    def test_shared_data_cannot_change(self):
+        code = self.QRCode._get_or_create([{'name': 'QR shared', 'data': 'payload shared'}])[0]
+        ownership_codes = self.env['ownership.code'].create([
+            {'destination_actor': self.partner.id, 'qr_code_id': code.id} for dummy in range(2)])
+        with self.assertRaises(exceptions.UserError):
+            code.write({'data': 'payload changed'})
+
+        ownership_codes[1].qr_code_id = False
+        code._render_pending()
+        code.write({'data': 'payload changed'})
+        self.assertFalse(code.qr_code, "The QR code is rendered again for the new data")
@@ -0,0 +1,122 @@
+import logging
+
+import psycopg2
+
+from odoo.exceptions import MissingError, UserError
+from odoo.http import request, Stream
+from odoo.tools.image import image_process
+
+from ..models.ir_attachment import THUMBNAIL_RES_FIELD_PREFIX
+
+_logger = logging.getLogger(__name__)
+
+# Seconds the mobile app / browser keeps a file before revalidating it with its ETag
+CACHE_MAX_AGE = 600
+# Thumbnail sizes generated on demand; a requested size is rounded up to one of them
+THUMBNAIL_SIZES = (128, 256, 512, 1024)
+# Image fields exposed by the public routes for which thumbnails may be generated
+# (image_1920 fields use the image_<size> variants of image.mixin instead)
+THUMBNAIL_FIELDS = {
+    ('ilo.assets', 'asset_image'),
+    ('ilo.production.harvesting', 'production_harvesting_image'),
+    ('ilo.production_planting', 'production_planting_image'),
+    ('ownership.code', 'product_transaction_image_ownership_code'),
+    ('ownership.line', 'product_transaction_image_ownership_line'),
+}
+
+
+def empty_response(mimetype):
+    """Empty answer for missing records or files, as the endpoints always returned."""
+    headers = [('Content-Type', mimetype), ('Content-Length', '0')]
+    return request.make_response(b'', headers=headers)
+
+
+def _thumbnail_size(width, height):
+    try:
+        requested = max(int(width or 0), int(height or 0))
+    except ValueError:
+        return 0
+    for size in THUMBNAIL_SIZES:
+        if 0 < requested <= size:
+            return size
+    # no size or bigger than the largest thumbnail: the original is served
+    return 0
+
+
+def _get_thumbnail(record, field_name, size):
+    """Stream of a resized copy of an image field, generated once and kept as an
+    attachment with its own res_field, so it stays out of the record's attachments.
+    The checksum of the original is kept as name: a new image replaces the thumbnail."""
+    attachments = request.env['ir.attachment'].sudo()
+    source = attachments.search([
+        ('res_model', '=', record._name),
+        ('res_id', '=', record.id),
+        ('res_field', '=', field_name),
+    ], limit=1)
+    if not source or not (source.mimetype or '').startswith('image/'):
+        return None
+    res_field = '%s%s_%s' % (THUMBNAIL_RES_FIELD_PREFIX, field_name, size)
+    thumbnail = attachments.search([
+        ('res_model', '=', record._name),
+        ('res_id', '=', record.id),
+        ('res_field', '=', res_field),
+    ], limit=1)
+    ir_binary = request.env['ir.binary']
+    if thumbnail.name == source.checksum:
+        return ir_binary._record_to_stream(thumbnail, 'raw')
+    try:
+        data = image_process(source.raw, size=(size, size))
+    except UserError:
+        _logger.info("%s,%s %s is not an image, no thumbnail", record._name, record.id, field_name)
+        return None
+    try:
+        # the unique index makes a concurrent first request fail here instead of
+        # creating a second thumbnail
+        with request.env.cr.savepoint():
+            if thumbnail:
+                thumbnail.write({'name': source.checksum, 'raw': data})
+            else:
+                thumbnail = attachments.create({
+                    'name': source.checksum,
+                    'res_model': record._name,
+                    'res_id': record.id,
+                    'res_field': res_field,
+                    'raw': data,
+                })
+        return ir_binary._record_to_stream(thumbnail, 'raw')
+    except psycopg2.Error:
+        _logger.info("Thumbnail of %s,%s %s is generated by another request", record._name, record.id, field_name)
+        return Stream(type='data', data=data, mimetype=source.mimetype, size=len(data),
+                      etag='%s-%s' % (source.checksum, size), last_modified=source.write_date)
+
+
+def serve_field(model, record_id, field_name, mimetype=None, default_mimetype='image/png',
+                filename=None, as_attachment=False, width=0, height=0):
+    """Serve a Binary field of a record straight from the filestore.
+
+    The response carries Content-Length, an ETag (the attachment checksum),
+    Last-Modified and Cache-Control; conditional and Range requests are answered by
+    werkzeug (304 / 206). With `width` / `height` an image is served as a cached
+    thumbnail instead of the full size file.
+    """
+    record = request.env[model].sudo().browse(record_id).exists()
+    # bin_size: only check the field is set, without reading the file
+    if not record or not record.with_context(bin_size=True)[field_name]:
+        return empty_response(mimetype or default_mimetype)
+    ir_binary = request.env['ir.binary']
+    try:
+        size = _thumbnail_size(width, height)
+        if size and field_name == 'image_1920' and 'image_%s' % size in record._fields:
+            # image.mixin already keeps resized variants of the image
+            field_name, size = 'image_%s' % size, 0
+        stream = None
+        if size and (model, field_name) in THUMBNAIL_FIELDS:
+            stream = _get_thumbnail(record, field_name, size)
+        if not stream:
+            stream = ir_binary._get_stream_from(record, field_name, filename=filename, mimetype=mimetype,
+                                                default_mimetype=default_mimetype)
+    except MissingError:
+        _logger.warning("File of %s,%s %s is missing", model, record_id, field_name)
+        return empty_response(mimetype or default_mimetype)
+    stream.max_age = CACHE_MAX_AGE
+    return stream.get_response(as_attachment=as_attachment)
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
 from . import res_partner
+from . import ir_attachment
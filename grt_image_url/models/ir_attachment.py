@@ -0,0 +1,18 @@
+from odoo import models
+
+# res_field of the thumbnails generated by the image routes (see controllers/file_stream.py)
+THUMBNAIL_RES_FIELD_PREFIX = 'grt_thumbnail_'
+
+
+class IrAttachment(models.Model):
+    _inherit = 'ir.attachment'
+
+    def init(self):
+        super().init()
+        # One thumbnail per record, field and size: concurrent first requests
+        # cannot create duplicates
+        self._cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ir_attachment_grt_thumbnail_uniq
+                ON ir_attachment (res_model, res_id, res_field)
+             WHERE res_field LIKE 'grt\\_thumbnail\\_%'
+        """)
@@ -2,12 +2,19 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import calendar
+import logging
+import time
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
-from odoo.tools import float_compare, float_is_zero
+from odoo.tools import float_compare, float_is_zero, split_every
+
+_logger = logging.getLogger(__name__)
+
+# Number of depreciation moves created, posted and committed together by the bulk engine
+DEPRECIATION_BATCH_SIZE = 500
 
 
 class AccountAssetCategory(models.Model):
@@ -194,18 +201,24 @@ class AccountAssetAsset(models.Model):
 
     @api.model
     def _cron_generate_entries(self):
-        self.compute_generated_entries(datetime.today())
+        self.compute_generated_entries(datetime.today(), bulk=True)
 
     @api.model
-    def compute_generated_entries(self, date, asset_type=None):
+    def compute_generated_entries(self, date, asset_type=None, bulk=False):
         # Entries generated : one by grouped category and one by asset from ungrouped category
+        # With bulk=True the ungrouped entries are created, posted and committed in chunks
+        # (see AccountAssetDepreciationLine.create_move_bulk), so an interrupted run resumes
+        # with the depreciation lines that are still unlinked.
         created_move_ids = []
         type_domain = []
         if asset_type:
             type_domain = [('type', '=', asset_type)]
 
         ungrouped_assets = self.env['account.asset.asset'].search(type_domain + [('state', '=', 'open'), ('category_id.group_entries', '=', False)])
-        created_move_ids += ungrouped_assets._compute_entries(date, group_entries=False)
+        if bulk:
+            created_move_ids += ungrouped_assets._compute_entries_bulk(date)
+        else:
+            created_move_ids += ungrouped_assets._compute_entries(date, group_entries=False)
 
         for grouped_category in self.env['account.asset.category'].search(type_domain + [('group_entries', '=', True)]):
             assets = self.env['account.asset.asset'].search([('state', '=', 'open'), ('category_id', '=', grouped_category.id)])
@@ -490,6 +503,12 @@ class AccountAssetAsset(models.Model):
             return depreciation_ids.create_grouped_move()
         return depreciation_ids.create_move()
 
+    def _compute_entries_bulk(self, date, batch_size=None):
+        depreciation_ids = self.env['account.asset.depreciation.line'].search([
+            ('asset_id', 'in', self.ids), ('depreciation_date', '<=', date),
+            ('move_check', '=', False)], order='asset_id, sequence')
+        return depreciation_ids.create_move_bulk(batch_size=batch_size, commit=True)
+
     @api.model_create_multi
     def create(self, vals_list):
         assets = super(AccountAssetAsset, self.with_context(mail_create_nolog=True)).create(vals_list)
@@ -571,6 +590,63 @@ class AccountAssetDepreciationLine(models.Model):
             created_moves.filtered(lambda m: any(m.asset_depreciation_ids.mapped('asset_id.category_id.open_asset'))).action_post()
         return [x.id for x in created_moves]
 
+    @api.model
+    def _get_depreciation_batch_size(self):
+        batch_size = self.env['ir.config_parameter'].sudo().get_param(
+            'om_account_asset.depreciation_batch_size', DEPRECIATION_BATCH_SIZE)
+        try:
+            return max(int(batch_size), 1)
+        except (TypeError, ValueError):
+            return DEPRECIATION_BATCH_SIZE
+
+    def _create_move_batch(self, post_move=True):
+        """ Create the moves of the depreciation lines in self with a single create() call,
+        link them to their line and post the ones whose category posts automatically. """
+        lines = self.filtered(lambda l: not l.move_id)
+        if not lines:
+            return self.env['account.move']
+        moves = self.env['account.move'].create([self._prepare_move(line) for line in lines])
+        for line, move in zip(lines, moves):
+            line.move_id = move
+        if post_move:
+            to_post = self.env['account.move'].concat(*(
+                move for line, move in zip(lines, moves)
+                if line.asset_id.category_id.open_asset))
+            to_post.action_post()
+        return moves
+
+    def create_move_bulk(self, post_move=True, batch_size=None, commit=False):
+        """ Bulk version of create_move() for large month-end runs.
+
+        The depreciation lines are processed in chunks of batch_size (by default the
+        'om_account_asset.depreciation_batch_size' parameter): the move values of a chunk are
+        built in memory, created with one multi-create, posted together and, when commit is
+        set, committed before the next chunk starts. Lines already linked to a move are
+        skipped, so calling it again after a crash only processes the remaining lines.
+        """
+        batch_size = batch_size or self._get_depreciation_batch_size()
+        commit = commit and not self.env.registry.in_test_mode()
+        created_move_ids = []
+        start = time.time()
+        for line_ids in split_every(batch_size, self.ids):
+            chunk_start = time.time()
+            moves = self.browse(line_ids)._create_move_batch(post_move=post_move)
+            created_move_ids += moves.ids
+            if commit:
+                self.env.cr.commit()
+            # the committed records are no longer needed in the cache
+            self.env.invalidate_all()
+            elapsed = time.time() - chunk_start
+            _logger.info("Depreciation entries: %d moves in %.2fs (%.1f moves/s), %d/%d lines done",
+                         len(moves), elapsed, len(moves) / elapsed if elapsed else 0.0,
+                         len(created_move_ids), len(self))
+        elapsed = time.time() - start
+        if created_move_ids:
+            _logger.info("Depreciation entries done: %d moves in %.2fs (%.1f moves/s)",
+                         len(created_move_ids), elapsed,
+                         len(created_move_ids) / elapsed if elapsed else 0.0)
+        return created_move_ids
+
     def _prepare_move(self, line):
         category_id = line.asset_id.category_id
         account_analytic_id = line.asset_id.account_analytic_id
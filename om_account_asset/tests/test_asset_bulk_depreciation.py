@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import date
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestAssetBulkDepreciation(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.category = cls.env['account.asset.category'].create({
+            'name': 'Bulk Vehicles',
+            'type': 'purchase',
+            'account_asset_id': cls.company_data['default_account_assets'].id,
+            'account_depreciation_id': cls.company_data['default_account_assets'].id,
+            'account_depreciation_expense_id': cls.company_data['default_account_expense'].id,
+            'journal_id': cls.company_data['default_journal_misc'].id,
+            'method_number': 6,
+            'method_period': 1,
+            'open_asset': True,
+        })
+        cls.assets = cls.env['account.asset.asset'].create([{
+            'name': 'Bulk Asset %s' % index,
+            'category_id': cls.category.id,
+            'value': 600.0,
+            'date': date(2024, 1, 1),
+            'method_number': 6,
+            'method_period': 1,
+        } for index in range(7)])
+        cls.assets.validate()
+        cls.env['ir.config_parameter'].sudo().set_param('om_account_asset.depreciation_batch_size', 4)
+
+    def _due_lines(self, until):
+        return self.assets.depreciation_line_ids.filtered(lambda l: l.depreciation_date <= until)
+
+    def test_bulk_entries_match_single_entries(self):
+        until = date(2024, 3, 31)
+        due_lines = self._due_lines(until)
+        self.assertEqual(len(due_lines), 21)
+
+        move_ids = self.env['account.asset.asset'].compute_generated_entries(until, bulk=True)
+        moves = self.env['account.move'].browse(move_ids)
+        self.assertEqual(len(moves), len(due_lines))
+        self.assertTrue(all(line.move_check and line.move_posted_check for line in due_lines))
+        self.assertEqual(set(moves.mapped('state')), {'posted'})
+        for line in due_lines:
+            self.assertEqual(line.move_id.date, line.depreciation_date)
+            self.assertAlmostEqual(line.move_id.amount_total, line.amount)
+        self.assertFalse((self.assets.depreciation_line_ids - due_lines).move_id)
+
+    def test_bulk_entries_resume_after_interruption(self):
+        until = date(2024, 3, 31)
+        due_lines = self._due_lines(until)
+        # lines of a previously committed chunk are already linked to their move
+        already_done = due_lines[:5]
+        already_done.create_move()
+
+        move_ids = self.env['account.asset.asset'].compute_generated_entries(until, bulk=True)
+        self.assertEqual(len(move_ids), len(due_lines) - len(already_done))
+        self.assertTrue(all(due_lines.mapped('move_check')))
+        self.assertFalse(self.env['account.asset.asset'].compute_generated_entries(until, bulk=True))
@@ -5,19 +5,27 @@ import base64
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 from odoo.addons.base.models.res_bank import sanitize_account_number
+from odoo.tools import split_every
 import io
 import logging
-import tempfile
-import binascii
 from datetime import datetime
 
 _logger = logging.getLogger(__name__)
 
+# Rows (and unique import ids) handled per partner/currency lookup and duplicate check
+IMPORT_CHUNK_SIZE = 1000
+
 try:
     import csv
 except ImportError:
     _logger.debug('Cannot `import csv`.')
 
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+    _logger.debug('Cannot `import openpyxl`.')
+
 try:
     import xlrd
 except ImportError:
@@ -43,99 +51,102 @@ class AccountBankStatementImport(models.TransientModel):
                                       help='Get you bank statements in electronic format from your bank and'
                                            ' select them here.')
 
-    def get_partner(self, value):
-        partner = self.env['res.partner'].search([('name', '=', value)])
-        return partner.id if partner else False
-
-    def get_currency(self, value):
-        currency = self.env['res.currency'].search([('name', '=', value)])
-        return currency.id if currency else False
+    def _resolve_names(self, model, names, cache):
+        """ Fill cache {name: id} for the names not resolved yet with one search_read.
+            The cache lives for one import, so each distinct value is only looked up once. """
+        missing = {name for name in names if name and name not in cache}
+        if missing:
+            for record in self.env[model].search_read([('name', 'in', list(missing))], ['name'], order='id'):
+                cache.setdefault(record['name'], record['id'])
+            for name in missing:
+                cache.setdefault(name, False)
+        return cache
 
     def create_statement(self, values):
         statement = self.env['account.bank.statement'].create(values)
         return statement
 
+    def _read_csv_rows(self, content):
+        """ Rows of a CSV file, decoded lazily while iterating. """
+        return csv.reader(io.TextIOWrapper(io.BytesIO(content), encoding='utf-8', newline=''), delimiter=',')
+
+    def _read_xlsx_rows(self, content):
+        """ Rows of the first sheet of a XLSX file, read from memory without a temporary file.
+            openpyxl in read-only mode streams the rows; xlrd is kept as fallback. """
+        if openpyxl:
+            workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+            return self._iter_workbook_rows(workbook)
+        workbook = xlrd.open_workbook(file_contents=content)
+        sheet = workbook.sheet_by_index(0)
+        return (sheet.row_values(row_no) for row_no in range(sheet.nrows))
+
+    @staticmethod
+    def _iter_workbook_rows(workbook):
+        """ Rows of the first sheet; read-only workbooks keep their archive open until closed. """
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _cell_value(value):
+        if value is None:
+            return ''
+        if isinstance(value, bytes):
+            return value.decode('utf-8')
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, (int, float)):
+            return value
+        return str(value)
+
+    def _prepare_statement_lines(self, rows):
+        """ Statement line values from the rows of an import file (header row skipped):
+            date, payment reference, reference, partner, amount, currency.
+            Rows are consumed in chunks; partners and currencies are resolved once per
+            distinct name for the whole import. """
+        partner_cache = {}
+        currency_cache = {}
+        vals_list = []
+        rows = iter(rows)
+        next(rows, None)
+        for chunk in split_every(IMPORT_CHUNK_SIZE, rows):
+            lines = [[self._cell_value(cell) for cell in row] for row in chunk if row and any(row)]
+            self._resolve_names('res.partner', {str(line[3]) for line in lines}, partner_cache)
+            self._resolve_names('res.currency', {str(line[5]) for line in lines}, currency_cache)
+            for line in lines:
+                vals_list.append((0, 0, {
+                    'date': line[0],
+                    'payment_ref': str(line[1]),
+                    'ref': str(line[2]),
+                    'partner_id': partner_cache.get(str(line[3]), False),
+                    'amount': line[4],
+                    'currency_id': currency_cache.get(str(line[5]), False),
+                }))
+        return vals_list
+
     def import_file(self):
         for data_file in self.attachment_ids:
-            file_name = data_file.name.lower()
+            file_name = data_file.name.lower().strip()
             try:
-                if file_name.strip().endswith('.csv') or file_name.strip().endswith('.xlsx'):
+                if file_name.endswith('.csv') or file_name.endswith('.xlsx'):
                     statement = False
-                    if file_name.strip().endswith('.csv'):
-                        keys = ['date', 'payment_ref', 'partner_id', 'amount', 'currency_id']
-                        try:
-                            csv_data = base64.b64decode(data_file.datas)
-                            data_file = io.StringIO(csv_data.decode("utf-8"))
-                            data_file.seek(0)
-                            file_reader = []
-                            values = {}
-                            csv_reader = csv.reader(data_file, delimiter=',')
-                            file_reader.extend(csv_reader)
-                        except:
-                            raise UserError(_("Invalid file!"))
-                        vals_list = []
-                        date = False
-                        for i in range(len(file_reader)):
-                            field = list(map(str, file_reader[i]))
-                            values = dict(zip(keys, field))
-                            if values:
-                                if i == 0:
-                                    continue
-                                else:
-                                    if not date:
-                                        date = field[0]
-                                    values.update({
-                                        'date': field[0],
-                                        'payment_ref': field[1],
-                                        'ref': field[2],
-                                        'partner_id': self.get_partner(field[3]),
-                                        'amount': field[4],
-                                        'currency_id':  self.get_currency(field[5])
-                                    })
-                                    vals_list.append((0, 0, values))
-                        statement_vals = {
-                            'name': 'Statement Of ' + str(datetime.today().date()),
-                            'journal_id': self.env.context.get('active_id'),
-                            'line_ids': vals_list
-                        }
-                        if len(vals_list) != 0:
-                            statement = self.create_statement(statement_vals)
-                    elif file_name.strip().endswith('.xlsx'):
-                        try:
-                            fp = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-                            fp.write(binascii.a2b_base64(data_file.datas))
-                            fp.seek(0)
-                            values = {}
-                            workbook = xlrd.open_workbook(fp.name)
-                            sheet = workbook.sheet_by_index(0)
-                        except:
-                            raise UserError(_("Invalid file!"))
-                        vals_list = []
-                        for row_no in range(sheet.nrows):
-                            val = {}
-                            values = {}
-                            if row_no <= 0:
-                                fields = map(lambda row: row.value.encode('utf-8'), sheet.row(row_no))
-                            else:
-                                line = list(map(
-                                    lambda row: isinstance(row.value, bytes) and row.value.encode('utf-8') or str(
-                                        row.value), sheet.row(row_no)))
-                                values.update({
-                                    'date': line[0],
-                                    'payment_ref': line[1],
-                                    'ref': line[2],
-                                    'partner_id': self.get_partner(line[3]),
-                                    'amount': line[4],
-                                    'currency_id': self.get_currency(line[5])
-                                })
-                                vals_list.append((0, 0, values))
-                        statement_vals = {
-                            'name': 'Statement Of ' + str(datetime.today().date()),
-                            'journal_id': self.env.context.get('active_id'),
-                            'line_ids': vals_list
-                        }
-                        if len(vals_list) != 0:
-                            statement = self.create_statement(statement_vals)
+                    try:
+                        content = base64.b64decode(data_file.datas)
+                        if file_name.endswith('.csv'):
+                            rows = self._read_csv_rows(content)
+                        else:
+                            rows = self._read_xlsx_rows(content)
+                    except:
+                        raise UserError(_("Invalid file!"))
+                    vals_list = self._prepare_statement_lines(rows)
+                    statement_vals = {
+                        'name': 'Statement Of ' + str(datetime.today().date()),
+                        'journal_id': self.env.context.get('active_id'),
+                        'line_ids': vals_list
+                    }
+                    if len(vals_list) != 0:
+                        statement = self.create_statement(statement_vals)
                     if statement:
                         return {
                             'type': 'ir.actions.act_window',
@@ -310,6 +321,16 @@ class AccountBankStatementImport(models.TransientModel):
                             line_vals['partner_id'] = partner_bank.partner_id.id
         return stmts_vals
 
+    def _get_imported_ids(self, unique_import_ids):
+        """ Subset of unique_import_ids already used by statement lines, one IN query per chunk. """
+        BankStatementLine = self.env['account.bank.statement.line'].sudo()
+        imported_ids = set()
+        for chunk in split_every(IMPORT_CHUNK_SIZE, {uid for uid in unique_import_ids if uid}):
+            imported_ids.update(
+                line['unique_import_id']
+                for line in BankStatementLine.search_read([('unique_import_id', 'in', list(chunk))], ['unique_import_id']))
+        return imported_ids
+
     def _create_bank_statements(self, stmts_vals):
         """ Create new bank statements from imported values, filtering out already imported transactions, and returns data used by the reconciliation widget """
         BankStatement = self.env['account.bank.statement']
@@ -318,12 +339,13 @@ class AccountBankStatementImport(models.TransientModel):
         # Filter out already imported transactions and create statements
         statement_line_ids = []
         ignored_statement_lines_import_ids = []
+        imported_ids = self._get_imported_ids([
+            line_vals.get('unique_import_id')
+            for st_vals in stmts_vals for line_vals in st_vals['transactions']])
         for st_vals in stmts_vals:
             filtered_st_lines = []
             for line_vals in st_vals['transactions']:
-                if 'unique_import_id' not in line_vals \
-                   or not line_vals['unique_import_id'] \
-                   or not bool(BankStatementLine.sudo().search([('unique_import_id', '=', line_vals['unique_import_id'])], limit=1)):
+                if not line_vals.get('unique_import_id') or line_vals['unique_import_id'] not in imported_ids:
                     filtered_st_lines.append(line_vals)
                 else:
                     ignored_statement_lines_import_ids.append(line_vals['unique_import_id'])
@@ -108,10 +108,24 @@ class CrossoveredBudgetLines(models.Model):
         # overrides the default read_group in order to compute the computed fields manually for the group
         fields_list = {'practical_amount', 'theoritical_amount', 'percentage'}
         fields = {field.split(':', 1)[0] if field.split(':', 1)[0] in fields_list else field for field in fields}
+        compute_group_fields = any(x in fields for x in fields_list)
+        if compute_group_fields:
+            # ids of each group come with the grouped query, no search per group
+            fields.add('budget_line_ids:array_agg(id)')
         result = super(CrossoveredBudgetLines, self).read_group(domain, fields, groupby, offset=offset, limit=limit,
                                                                 orderby=orderby, lazy=lazy)
-        if any(x in fields for x in fields_list):
+        if compute_group_fields:
+            all_line_ids = set()
             for group_line in result:
+                all_line_ids.update(group_line.get('budget_line_ids') or [])
+            # practical/theoretical amounts of all lines of all groups in one batch
+            budget_lines = self.browse(all_line_ids)
+            amounts = {
+                line.id: (line.practical_amount, line.theoritical_amount)
+                for line in budget_lines
+            }
+            for group_line in result:
+                line_ids = group_line.pop('budget_line_ids', None) or []
 
                 # initialise fields to compute to 0 if they are requested
                 if 'practical_amount' in fields:
@@ -123,22 +137,19 @@ class CrossoveredBudgetLines(models.Model):
                     group_line['practical_amount'] = 0
                     group_line['theoritical_amount'] = 0
 
-                if group_line.get('__domain'):
-                    all_budget_lines_that_compose_group = self.search(group_line['__domain'])
-                else:
-                    all_budget_lines_that_compose_group = self.search([])
-                for budget_line_of_group in all_budget_lines_that_compose_group:
+                for line_id in line_ids:
+                    practical_amount, theoritical_amount = amounts[line_id]
                     if 'practical_amount' in fields or 'percentage' in fields:
-                        group_line['practical_amount'] += budget_line_of_group.practical_amount
+                        group_line['practical_amount'] += practical_amount
 
                     if 'theoritical_amount' in fields or 'percentage' in fields:
-                        group_line['theoritical_amount'] += budget_line_of_group.theoritical_amount
+                        group_line['theoritical_amount'] += theoritical_amount
 
-                    if 'percentage' in fields:
-                        if group_line['theoritical_amount']:
-                            # use a weighted average
-                            group_line['percentage'] = float(
-                                (group_line['practical_amount'] or 0.0) / group_line['theoritical_amount']) * 100
+                if 'percentage' in fields:
+                    if group_line['theoritical_amount']:
+                        # use a weighted average
+                        group_line['percentage'] = float(
+                            (group_line['practical_amount'] or 0.0) / group_line['theoritical_amount']) * 100
 
         return result
 
@@ -160,38 +171,73 @@ class CrossoveredBudgetLines(models.Model):
             line.name = computed_name
 
     def _compute_practical_amount(self):
+        # One grouped query per source (analytic lines / journal items) for the whole recordset,
+        # the budget lines being joined on their own date range and budgetary position.
+        analytic_lines = self.filtered(lambda line: line.analytic_account_id)
+        general_lines = self - analytic_lines
+        amounts = {}
+        if analytic_lines:
+            amounts.update(analytic_lines._get_practical_amounts(analytic=True))
+        if general_lines:
+            amounts.update(general_lines._get_practical_amounts(analytic=False))
         for line in self:
-            acc_ids = line.general_budget_id.account_ids.ids
-            date_to = line.date_to
-            date_from = line.date_from
-            if line.analytic_account_id.id:
-                analytic_line_obj = self.env['account.analytic.line']
-                domain = [('account_id', '=', line.analytic_account_id.id),
-                          ('date', '>=', date_from),
-                          ('date', '<=', date_to),
-                          ]
-                if acc_ids:
-                    domain += [('general_account_id', 'in', acc_ids)]
-
-                where_query = analytic_line_obj._where_calc(domain)
-                analytic_line_obj._apply_ir_rules(where_query, 'read')
-                from_clause, where_clause, where_clause_params = where_query.get_sql()
-                select = "SELECT SUM(amount) from " + from_clause + " where " + where_clause
-
-            else:
-                aml_obj = self.env['account.move.line']
-                domain = [('account_id', 'in',
-                           line.general_budget_id.account_ids.ids),
-                          ('date', '>=', date_from),
-                          ('date', '<=', date_to)
-                          ]
-                where_query = aml_obj._where_calc(domain)
-                aml_obj._apply_ir_rules(where_query, 'read')
-                from_clause, where_clause, where_clause_params = where_query.get_sql()
-                select = "SELECT sum(credit)-sum(debit) from " + from_clause + " where " + where_clause
-
-            self.env.cr.execute(select, where_clause_params)
-            line.practical_amount = self.env.cr.fetchone()[0] or 0.0
+            line.practical_amount = amounts.get(line.id, 0.0)
+
+    def _get_practical_amounts(self, analytic):
+        """Return {budget_line_id: practical amount} with a single query.
+
+        Analytic lines sum account.analytic.line amounts of the line analytic
+        account (restricted to the budgetary position accounts if any), the
+        others sum credit - debit of the journal items on those accounts.
+        """
+        lines = self.filtered('id')
+        if not lines:
+            return {}
+        self.env['account.budget.post'].flush_model(['account_ids'])
+        if analytic:
+            source = self.env['account.analytic.line']
+            source.flush_model(['account_id', 'general_account_id', 'date', 'amount'])
+            table = source._table
+            select = "SUM(%s.amount)" % table
+            condition = """%(t)s.account_id = bl.analytic_id
+                AND (bl.post_id IS NULL
+                     OR NOT EXISTS (SELECT 1 FROM account_budget_rel r WHERE r.budget_id = bl.post_id)
+                     OR %(t)s.general_account_id IN (
+                        SELECT r.account_id FROM account_budget_rel r WHERE r.budget_id = bl.post_id))""" % {'t': table}
+        else:
+            source = self.env['account.move.line']
+            source.flush_model(['account_id', 'date', 'debit', 'credit'])
+            table = source._table
+            select = "SUM(%(t)s.credit) - SUM(%(t)s.debit)" % {'t': table}
+            condition = """%s.account_id IN (
+                SELECT r.account_id FROM account_budget_rel r WHERE r.budget_id = bl.post_id)""" % table
+
+        where_query = source._where_calc([
+            ('date', '>=', min(lines.mapped('date_from'))),
+            ('date', '<=', max(lines.mapped('date_to'))),
+        ])
+        source._apply_ir_rules(where_query, 'read')
+        from_clause, where_clause, where_clause_params = where_query.get_sql()
+        query = """
+            SELECT bl.line_id, {select}
+              FROM unnest(%s::int[], %s::int[], %s::int[], %s::date[], %s::date[])
+                   AS bl(line_id, analytic_id, post_id, date_from, date_to),
+                   {from_clause}
+             WHERE {condition}
+               AND {table}.date BETWEEN bl.date_from AND bl.date_to
+               AND {where_clause}
+          GROUP BY bl.line_id
+        """.format(select=select, from_clause=from_clause, condition=condition,
+                   table=table, where_clause=where_clause)
+        params = [
+            lines.ids,
+            [line.analytic_account_id.id or None for line in lines],
+            [line.general_budget_id.id or None for line in lines],
+            [line.date_from for line in lines],
+            [line.date_to for line in lines],
+        ] + list(where_clause_params)
+        self.env.cr.execute(query, params)
+        return {line_id: amount or 0.0 for line_id, amount in self.env.cr.fetchall()}
 
     def _compute_theoritical_amount(self):
         # beware: 'today' variable is mocked in the python tests and thus, its implementation matter
@@ -23,3 +23,4 @@ from . import res_config_settings
 from . import pos_session
 from . import pos_config
 from . import product_template
+from . import stock_move_line
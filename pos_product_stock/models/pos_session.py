@@ -19,7 +19,13 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import api, models
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+# Overlap applied to the sync marker so that moves committed by
+# transactions still running at sync time are picked up next refresh.
+STOCK_SYNC_OVERLAP = timedelta(minutes=5)
 
 
 class PosSession(models.Model):
@@ -29,13 +35,12 @@ class PosSession(models.Model):
     @api.model
     def _pos_ui_models_to_load(self):
         """ we use super function inorder to extend the _pos_ui_models
-        _to_load function and added  res.config.settings ,
-        stock.quant,stock.move.line"""
+        _to_load function and added  res.config.settings and the
+        aggregated stock of the pos stock location (pos.product.stock)"""
         result = super()._pos_ui_models_to_load()
         result += [
             'res.config.settings',
-            'stock.quant',
-            'stock.move.line',
+            'pos.product.stock',
         ]
         return result
 
@@ -50,25 +55,9 @@ class PosSession(models.Model):
         result['search_params']['fields'].append('detailed_type')
         return result
 
-    def _loader_params_stock_quant(self):
-        """load  some fields with certain domain of stock.quant in session"""
-        location_id = self.config_id.pos_stock_location_id
-        return {
-            'search_params': {
-                'domain': ['|', ('location_id', '=', location_id.id),
-                           ('location_id', 'in', location_id.child_ids.ids)],
-                'fields': ['product_id', 'available_quantity', ''
-                                                               'quantity', 'location_id'],
-            },
-        }
-
-    def _loader_params_stock_move_line(self):
-        """load some fields of stock.move.line in session"""
-        return {
-            'search_params': {
-                'fields': ['product_id', 'location_dest_id', 'qty_done', 'location_id'],
-            },
-        }
+    def _loader_params_pos_product_stock(self):
+        """no search params: the stock map is aggregated in SQL"""
+        return {'since': False}
 
     def _loader_params_res_config_settings(self):
         """load  some fields of base settings in session"""
@@ -90,14 +79,83 @@ class PosSession(models.Model):
             last_config_setting = False
             return last_config_setting
 
-    def _get_pos_ui_stock_quant(self, params):
-        """this function should use the search_read method
-        to search and read records from the  stock.quant"""
-        return self.env['stock.quant']. \
-            search_read(**params['search_params'])
-
-    def _get_pos_ui_stock_move_line(self, params):
-        """this function should use the search_read'method to
-        search and read records from the stock.move.line'"""
-        return self.env['stock.move.line'] \
-            .search_read(**params['search_params'])
+    def _get_pos_ui_pos_product_stock(self, params):
+        """compact stock map of the pos stock location, see get_pos_product_stock"""
+        return self.get_pos_product_stock(params['since'])
+
+    def _get_pos_stock_location_ids(self):
+        """pos stock location and all of its children"""
+        location = self.config_id.pos_stock_location_id
+        if not location:
+            return []
+        return self.env['stock.location'].search([('id', 'child_of', location.id)]).ids
+
+    def _get_pos_stock_touched_product_ids(self, location_ids, since):
+        """products with quants or move lines in the locations changed after since"""
+        self.env.cr.execute("""
+            SELECT product_id FROM stock_quant
+             WHERE location_id IN %(location_ids)s AND write_date > %(since)s
+            UNION
+            SELECT product_id FROM stock_move_line
+             WHERE write_date > %(since)s
+               AND (location_id IN %(location_ids)s OR location_dest_id IN %(location_ids)s)
+        """, {'location_ids': tuple(location_ids), 'since': since})
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def get_pos_product_stock(self, since=False):
+        """Aggregated stock of the pos stock location and its children.
+
+        Returns {'sync_date': str, 'products': {product_id: [on_hand,
+        available, incoming, outgoing]}}. When since is given only the
+        products touched after it are returned, with their full values,
+        so the client can merge the result into its map.
+        """
+        self.ensure_one()
+        sync_date = fields.Datetime.to_string(self.env.cr.now() - STOCK_SYNC_OVERLAP)
+        location_ids = self._get_pos_stock_location_ids()
+        if not location_ids:
+            return {'sync_date': sync_date, 'products': {}}
+        self.env['stock.quant'].flush_model()
+        self.env['stock.move.line'].flush_model()
+        params = {'location_ids': tuple(location_ids)}
+        product_clause = ''
+        if since:
+            product_ids = self._get_pos_stock_touched_product_ids(location_ids, since)
+            if not product_ids:
+                return {'sync_date': sync_date, 'products': {}}
+            params['product_ids'] = tuple(product_ids)
+            product_clause = 'AND product_id IN %(product_ids)s'
+
+        products = {}
+        self.env.cr.execute("""
+            SELECT product_id, SUM(quantity), SUM(quantity - reserved_quantity)
+              FROM stock_quant
+             WHERE location_id IN %(location_ids)s {products}
+          GROUP BY product_id
+        """.format(products=product_clause), params)
+        for product_id, on_hand, available in self.env.cr.fetchall():
+            products[product_id] = [on_hand or 0.0, available or 0.0, 0.0, 0.0]
+
+        # moves between two locations of the scope are neither incoming nor outgoing
+        self.env.cr.execute("""
+            SELECT product_id,
+                   SUM(qty_done) FILTER (WHERE location_dest_id IN %(location_ids)s
+                                           AND location_id NOT IN %(location_ids)s),
+                   SUM(qty_done) FILTER (WHERE location_id IN %(location_ids)s
+                                           AND location_dest_id NOT IN %(location_ids)s)
+              FROM stock_move_line
+             WHERE state != 'cancel'
+               AND (location_id IN %(location_ids)s OR location_dest_id IN %(location_ids)s)
+               {products}
+          GROUP BY product_id
+        """.format(products=product_clause), params)
+        for product_id, incoming, outgoing in self.env.cr.fetchall():
+            values = products.setdefault(product_id, [0.0, 0.0, 0.0, 0.0])
+            values[2] = incoming or 0.0
+            values[3] = outgoing or 0.0
+
+        if since:
+            # touched products without any stock left are reset on the client
+            for product_id in params['product_ids']:
+                products.setdefault(product_id, [0.0, 0.0, 0.0, 0.0])
+        return {'sync_date': sync_date, 'products': products}
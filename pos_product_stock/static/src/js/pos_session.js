@@ -1,14 +1,48 @@
 /** @odoo-module */
 import {PosGlobalState} from 'point_of_sale.models';
 import Registries from 'point_of_sale.Registries';
+// Interval (ms) between two delta refreshes of the pos stock map.
+const STOCK_REFRESH_INTERVAL = 60000;
 const NewPosGlobalState = (PosGlobalState) =>
     class NewPosGlobalState extends PosGlobalState { // Define a new class that extends the PosGlobalState model.
         // Then, add a new method called '_processData'.
         async _processData(loadedData) {
             await super._processData(...arguments); //used to call the original _processData
             this.res_setting = loadedData['res.config.settings'];
-            this.stock_quant = loadedData['stock.quant'];
-            this.move_line = loadedData['stock.move.line'];
+            // compact map {product_id: [on_hand, available, incoming, outgoing]}
+            const product_stock = loadedData['pos.product.stock'] || {};
+            this.stock_sync_date = product_stock.sync_date;
+            this.product_stock = {};
+            this._applyProductStock(product_stock.products || {});
+            if (this.res_setting && this.res_setting.display_stock) {
+                setInterval(() => this._refreshProductStock(), STOCK_REFRESH_INTERVAL);
+            }
+        }
+        _applyProductStock(products) {
+            // merge a (full or delta) stock map and expose it on the products
+            for (const [product_id, values] of Object.entries(products)) {
+                this.product_stock[product_id] = values;
+                const product = this.db.get_product_by_id(parseInt(product_id));
+                if (product) {
+                    product.on_hand = values[0];
+                    product.available = values[1];
+                    product.incoming_loc = values[2];
+                    product.outgoing = values[3];
+                }
+            }
+        }
+        async _refreshProductStock() {
+            try {
+                const result = await this.env.services.rpc({
+                    model: 'pos.session',
+                    method: 'get_pos_product_stock',
+                    args: [[this.pos_session.id], this.stock_sync_date],
+                });
+                this.stock_sync_date = result.sync_date;
+                this._applyProductStock(result.products);
+            } catch (_error) {
+                // offline: keep the current map and retry on the next tick
+            }
         }
     }
 Registries.Model.extend(PosGlobalState, NewPosGlobalState);
@@ -22,7 +22,7 @@
 
 {
     'name': "Sales History Of Products",
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.0.1',
     'summary': """Sales history of products from Sales Order Line""",
     'description': """Sales history of products from Sales Order Line""",
     'author': "Cybrosys Techno Solutions",
@@ -33,8 +33,6 @@
     'depends': ['base', 'sale_management'],
     'license': 'AGPL-3',
     'data': [
-        'security/ir.model.access.csv',
-        'wizard/sales_order_history_wizard_view.xml',
         'views/view.xml',
     ],
     'images': ['static/description/banner.png'],
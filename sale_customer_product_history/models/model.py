@@ -20,37 +20,41 @@
 #
 #############################################################################
 
-from odoo import api, models, fields
+from odoo import models, fields, _
+from odoo.tools import create_index
 
 
 class SaleOrderLine(models.Model):
     _inherit = 'sale.order.line'
 
-    def get_product_history_data(self):
-        values = []
-        customer_id = self.order_id.partner_id
-        customer_order = self.env['sale.order'].search(
-            [('partner_id', '=', customer_id.id), ('state', 'in', ('sale', 'done'))])
-        for order in customer_order:
-            for line in order.order_line:
-                if line.product_id == self.product_id:
-                    values.append((0, 0, {'sale_order_id': order.id,
-                                          'history_price': line.price_unit,
-                                          'history_qty': line.product_uom_qty,
-                                          'history_total': order.amount_total
-                                          }))
-        history_id = self.env['product.sale.order.history'].create({
-            'product_id': self.product_id.id,
-            'product_sale_history': values
-        })
+    order_amount_total = fields.Monetary(related='order_id.amount_total',
+                                         string='Order Total')
+
+    def init(self):
+        super().init()
+        # history lookups filter on customer + product and page by id
+        create_index(self.env.cr, 'sale_order_line_partner_product_index',
+                     self._table, ['order_partner_id', 'product_id', 'id'])
+
+    def _get_product_history_domain(self):
+        self.ensure_one()
+        return [('order_partner_id', '=', self.order_id.partner_id.id),
+                ('product_id', '=', self.product_id.id),
+                ('state', 'in', ('sale', 'done'))]
 
+    def get_product_history_data(self):
+        """Open the confirmed order lines of this customer for the same
+        product, read page by page from the indexed sale_order_line."""
+        self.ensure_one()
+        history_view = self.env.ref(
+            'sale_customer_product_history.sale_order_line_product_history_tree')
         return {
-            'name': 'Customer Product Sales History',
-            'view_mode': 'form',
-            'res_model': 'product.sale.order.history',
+            'name': _('Customer Product Sales History'),
+            'view_mode': 'tree',
+            'res_model': 'sale.order.line',
             'type': 'ir.actions.act_window',
             'target': 'new',
-            'res_id': history_id.id
+            'views': [(history_view.id, 'tree')],
+            'domain': self._get_product_history_domain(),
+            'context': {'create': False, 'edit': False, 'delete': False},
         }
-
-